@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+SGBench - End-to-end throughput benchmark for SGSpider.
+
+Runs the spider against a local SiteSimulator (see sgsim.py) with humanized
+delays scaled down and reports albums/min, MB/s, peak RSS of the whole
+process tree (Python, Playwright driver and Chromium) and time per phase.
+Results can be saved as JSON and compared against a previous run.
+
+With --replay-har the spider instead runs offline against a recorded session
+(see `sgspider.py --record-har`), giving repeatable timings for the feed
+scrolling and album extraction hot paths.
+
+With --startup it instead times launch-to-first-navigation for each browser
+launch profile: full Chromium, the headless shell, and attaching to a
+pre-warmed spare as a restart with spare_browser does.
+"""
+
+import os
+import sys
+import time
+import json
+import argparse
+import tempfile
+import threading
+import contextlib
+from pathlib import Path
+
+from sgsim import SiteSimulator, DEFAULT_ALBUMS, DEFAULT_IMAGES_PER_ALBUM, DEFAULT_IMAGE_SIZE
+from sgspider import SGSpider, SpareBrowser, BROWSER_ARGS, DEFAULT_BASE_URL, process_tree_rss
+
+
+class RSSSampler:
+    """Background thread tracking the peak RSS of this process tree."""
+
+    def __init__(self, interval: float = 0.5):
+        self.interval = interval
+        self.peak = 0
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self.sample, daemon=True)
+
+    def sample(self):
+        pid = os.getpid()
+        while not self.stop_event.is_set():
+            self.peak = max(self.peak, process_tree_rss(pid))
+            self.stop_event.wait(self.interval)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self) -> int:
+        self.stop_event.set()
+        self.thread.join()
+        return self.peak
+
+
+def write_config(path: Path, base_url: str, workdir: Path, args) -> Path:
+    """Write a spider config pointing at the simulator or recorded site."""
+    path.write_text(
+        "[main]\n"
+        "username = bench\n"
+        "password = bench\n"
+        "\n"
+        "[settings]\n"
+        f"headless = {str(not args.headed).lower()}\n"
+        f"base_url = {base_url}\n"
+        f"download_dir = {workdir / 'downloads'}\n"
+        f"delay_scale = {args.delay_scale}\n"
+        "max_retries = 2\n"
+        "retry_base_delay = 0\n"
+        "browser_restart_interval = 0\n"
+        f"metrics_log = {workdir / 'metrics.jsonl'}\n"
+    )
+    return path
+
+
+def run_benchmark(args) -> dict:
+    """
+    Run the spider once against a fresh simulator (or a replayed HAR).
+
+    Returns:
+        Dict of results (see print_results for the fields)
+    """
+    if args.replay_har:
+        sim = None
+        base_url = args.base_url or DEFAULT_BASE_URL
+    else:
+        sim = SiteSimulator(
+            albums=args.albums, images_per_album=args.images_per_album,
+            image_size=args.image_size, image_latency=args.image_latency,
+            page_latency=args.page_latency, error_rate=args.error_rate,
+        ).start()
+        base_url = sim.base_url
+
+    with tempfile.TemporaryDirectory(prefix="sgbench-") as tmp:
+        workdir = Path(tmp)
+        spider = SGSpider()
+        spider.config_file = str(write_config(workdir / "sgspider.ini", base_url, workdir, args))
+        spider.state_file = workdir / "state.json"
+        spider.seen_file = workdir / "seen.json"
+        spider.feed_file = workdir / "feed.json"
+        spider.image_index_file = workdir / "images.sqlite3"
+        spider.replay_har = args.replay_har
+
+        sampler = RSSSampler().start()
+        start = time.monotonic()
+        try:
+            with open(os.devnull, "w") as devnull, \
+                    contextlib.redirect_stdout(sys.stdout if args.verbose else devnull):
+                spider.run()
+        finally:
+            elapsed = time.monotonic() - start
+            peak_rss = sampler.stop()
+            if sim:
+                sim.stop()
+
+    metrics = spider.metrics
+    downloaded_bytes = metrics.get("bytes_downloaded_total")
+    albums = metrics.get("albums_processed_total")
+
+    return {
+        "timestamp": time.time(),
+        "params": {
+            "replay_har": args.replay_har,
+            "albums": args.albums,
+            "images_per_album": args.images_per_album,
+            "image_size": args.image_size,
+            "image_latency": args.image_latency,
+            "page_latency": args.page_latency,
+            "error_rate": args.error_rate,
+            "delay_scale": args.delay_scale,
+        },
+        "elapsed_seconds": elapsed,
+        "albums": albums,
+        "images": metrics.get("images_downloaded_total"),
+        "bytes": downloaded_bytes,
+        "albums_per_minute": albums / elapsed * 60 if elapsed else 0,
+        "mb_per_second": downloaded_bytes / elapsed / 1024 / 1024 if elapsed else 0,
+        "peak_rss_mb": peak_rss / 1024 / 1024,
+        "requests": dict(sim.stats) if sim else {},
+        "phases": {
+            phase: {"seconds": hist["sum"], "calls": hist["count"]}
+            for phase, hist in metrics.histograms.items()
+        },
+    }
+
+
+STARTUP_PROFILES = ("full", "headless-shell", "spare")
+
+
+def run_startup_benchmark(args) -> dict:
+    """
+    Time browser start plus the first navigation, per launch profile.
+
+    Each run starts a browser the way SGSpider.start_browser does (context,
+    init script, page) and loads the simulator's front page. For "spare" the
+    Chromium process is launched and allowed to finish booting first, as it
+    would while the previous browser was still working.
+
+    Returns:
+        Dict of per-profile timings in seconds
+    """
+    # Imported here so `--help` works without Playwright installed
+    from playwright.sync_api import sync_playwright
+
+    sim = SiteSimulator(albums=1).start()
+    profiles = {}
+    try:
+        with sync_playwright() as playwright, open(os.devnull, "w") as devnull:
+            for profile in STARTUP_PROFILES:
+                timings = []
+                executable = None
+                for _ in range(args.startup_runs):
+                    spider = SGSpider()
+                    spider.base_url = sim.base_url
+                    spider.headless = not args.headed
+                    spider.launch_profile = "full" if profile == "spare" else profile
+                    with contextlib.redirect_stdout(sys.stdout if args.verbose else devnull):
+                        executable = spider.browser_executable(playwright) or playwright.chromium.executable_path
+                        spare = None
+                        if profile == "spare":
+                            spare = SpareBrowser(executable, BROWSER_ARGS, spider.headless)
+                            spare.endpoint()
+                        start = time.monotonic()
+                        spider.start_browser(playwright, spare=spare)
+                        spider.navigate(sim.base_url)
+                        timings.append(time.monotonic() - start)
+                        spider.stop_browser()
+                profiles[profile] = {
+                    "executable": executable,
+                    "runs": timings,
+                    "mean_seconds": sum(timings) / len(timings),
+                    "min_seconds": min(timings),
+                    "max_seconds": max(timings),
+                }
+    finally:
+        sim.stop()
+
+    return {"timestamp": time.time(), "startup": profiles}
+
+
+def print_startup_results(results: dict, baseline: dict = None):
+    """Print launch-to-first-navigation times, with the baseline's means if given."""
+    print("=" * 60)
+    print("SGBench startup: launch to first navigation")
+    print("=" * 60)
+    for profile, values in results["startup"].items():
+        line = (f"  {profile:<16} mean {values['mean_seconds']:6.2f}s  "
+                f"min {values['min_seconds']:6.2f}s  max {values['max_seconds']:6.2f}s")
+        previous = (baseline or {}).get("startup", {}).get(profile)
+        if previous:
+            line += f"  (was {previous['mean_seconds']:.2f}s)"
+        print(line)
+        print(f"  {'':<16} {values['executable']}")
+
+
+def print_results(results: dict, baseline: dict = None):
+    """Print a benchmark report, with deltas against a baseline if given."""
+    def delta(key, higher_is_better=True):
+        if not baseline or not baseline.get(key):
+            return ""
+        change = (results[key] - baseline[key]) / baseline[key] * 100
+        better = change > 0 if higher_is_better else change < 0
+        return f"  ({change:+.1f}% {'better' if better else 'worse'})"
+
+    print("=" * 60)
+    print("SGBench results")
+    print("=" * 60)
+    print(f"Elapsed:        {results['elapsed_seconds']:.1f}s{delta('elapsed_seconds', False)}")
+    print(f"Albums:         {results['albums']}  Images: {results['images']}")
+    if baseline and (results["albums"], results["images"]) != (baseline["albums"], baseline["images"]):
+        # With a replayed HAR the counts are deterministic, so a change means extraction broke
+        print(f"WARNING: baseline had {baseline['albums']} albums / {baseline['images']} images")
+    print(f"Albums/min:     {results['albums_per_minute']:.1f}{delta('albums_per_minute')}")
+    print(f"MB/s:           {results['mb_per_second']:.2f}{delta('mb_per_second')}")
+    print(f"Peak RSS:       {results['peak_rss_mb']:.0f} MB{delta('peak_rss_mb', False)}")
+    print(f"Requests:       {results['requests']}")
+    print("\nTime per phase:")
+    for phase, values in sorted(results["phases"].items(), key=lambda item: -item[1]["seconds"]):
+        line = f"  {phase:<32} {values['seconds']:9.2f}s  {values['calls']:6d} calls"
+        if baseline and phase in baseline.get("phases", {}):
+            line += f"  (was {baseline['phases'][phase]['seconds']:.2f}s)"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark SGSpider against a local site simulator.")
+    parser.add_argument("--albums", type=int, default=DEFAULT_ALBUMS)
+    parser.add_argument("--images-per-album", type=int, default=DEFAULT_IMAGES_PER_ALBUM)
+    parser.add_argument("--image-size", type=int, default=DEFAULT_IMAGE_SIZE, help="Bytes per image")
+    parser.add_argument("--image-latency", type=float, default=0.0, help="Seconds per image response")
+    parser.add_argument("--page-latency", type=float, default=0.0, help="Seconds per page response")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of image requests failing")
+    parser.add_argument("--delay-scale", type=float, default=0.0, help="Humanized delay multiplier (default 0)")
+    parser.add_argument("--replay-har", help="Run offline against a HAR recorded with sgspider.py --record-har")
+    parser.add_argument("--base-url", help="Site the HAR was recorded from (default: the real site)")
+    parser.add_argument("--startup", action="store_true",
+                        help="Time launch-to-first-navigation per browser launch profile instead")
+    parser.add_argument("--startup-runs", type=int, default=5, help="Launches per profile with --startup")
+    parser.add_argument("--headed", action="store_true", help="Show the browser window")
+    parser.add_argument("--verbose", action="store_true", help="Show the spider's output")
+    parser.add_argument("--output", help="Save results as JSON to this file")
+    parser.add_argument("--baseline", help="Compare against results saved by a previous run")
+    args = parser.parse_args()
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    if args.startup:
+        results = run_startup_benchmark(args)
+        print_startup_results(results, baseline)
+    else:
+        results = run_benchmark(args)
+        print_results(results, baseline)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,610 @@
+#!/usr/bin/env python3
+"""
+SGSim - A local stand-in for the parts of the site SGSpider relies on.
+
+Serves the login form, the recent-albums feed with its load-more button,
+per-model album listings, the member's followed-models list, album pages
+with CDN-style signed image links, image responses with configurable
+size/latency/error rate (with ETag/Last-Modified and If-None-Match
+support), and the unauthenticated placeholder.
+Point SGSpider at it with `base_url` in the [settings] section.
+
+ObjectStoreSimulator is an in-memory S3-compatible endpoint (PUT/HEAD/GET,
+ListObjectsV2 and multipart uploads, optionally verifying Signature V4) for
+exercising `storage = s3` locally.
+"""
+
+import sys
+import time
+import random
+import argparse
+import re
+import hashlib
+import hmac
+import html
+import secrets
+import threading
+from email.utils import formatdate
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs, quote, unquote
+from xml.sax.saxutils import escape
+
+from sgspider import fake_jpeg
+
+# Default simulator values (can be overridden on the command line)
+DEFAULT_ALBUMS = 50
+DEFAULT_IMAGES_PER_ALBUM = 12
+DEFAULT_MODELS = 10
+DEFAULT_FOLLOWED = 3  # Models on the member's following list (model0, model1, ...)
+DEFAULT_PAGE_SIZE = 12  # Albums per feed page
+DEFAULT_IMAGE_SIZE = 250000  # Bytes per image
+DEFAULT_IMAGE_LATENCY = 0.0  # Seconds before an image response
+DEFAULT_PAGE_LATENCY = 0.0  # Seconds before a page response
+DEFAULT_ERROR_RATE = 0.0  # Fraction of image requests answered with HTTP 503
+DEFAULT_URL_TTL = 3600  # Lifetime of signed image URLs in seconds
+PLACEHOLDER_SIZE = 2048
+
+SESSION_COOKIE = "sgsession"
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+<title>{title}</title>
+<style>
+  body {{ font-family: sans-serif; margin: 0; padding: 20px; }}
+  .album {{ height: 240px; margin: 10px 0; border: 1px solid #ccc; }}
+</style>
+</head>
+<body>
+<nav>{nav}</nav>
+{body}
+</body>
+</html>
+"""
+
+LOGGED_OUT_NAV = """<a id="login" href="#" onclick="document.getElementById('login-form').style.display='block'; return false;">Login</a>
+<form id="login-form" method="post" action="/login" style="display: none">
+  <input type="text" name="username">
+  <input type="password" name="password">
+  <button type="submit">Sign in</button>
+</form>"""
+
+LOGGED_IN_NAV = """<a href="/member/{username}/">{username}</a>
+<a href="/logout">Logout</a>"""
+
+LOAD_MORE_SCRIPT = """<button id="load-more" data-next="{next}">Load more</button>
+<script>
+  document.getElementById('load-more').addEventListener('click', async (event) => {{
+    const button = event.target;
+    if (!button.dataset.next) return;
+    button.disabled = true;
+    const response = await fetch(button.dataset.next + '&partial=1');
+    document.getElementById('albums').insertAdjacentHTML('beforeend', await response.text());
+    const next = response.headers.get('X-Next-Page');
+    if (next) {{
+      button.dataset.next = next;
+      button.disabled = false;
+    }} else {{
+      button.style.display = 'none';
+    }}
+  }});
+</script>"""
+
+
+class SiteSimulator:
+    """Threaded HTTP server mimicking the site pages, CDN and login flow."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0,
+                 albums: int = DEFAULT_ALBUMS,
+                 images_per_album: int = DEFAULT_IMAGES_PER_ALBUM,
+                 models: int = DEFAULT_MODELS,
+                 followed: int = DEFAULT_FOLLOWED,
+                 page_size: int = DEFAULT_PAGE_SIZE,
+                 image_size: int = DEFAULT_IMAGE_SIZE,
+                 image_latency: float = DEFAULT_IMAGE_LATENCY,
+                 page_latency: float = DEFAULT_PAGE_LATENCY,
+                 error_rate: float = DEFAULT_ERROR_RATE,
+                 url_ttl: int = DEFAULT_URL_TTL,
+                 seed: int = 0):
+        self.host = host
+        self.port = port
+        self.images_per_album = images_per_album
+        self.models = models
+        self.followed = followed
+        self.page_size = page_size
+        self.image_size = image_size
+        self.image_latency = image_latency
+        self.page_latency = page_latency
+        self.error_rate = error_rate
+        self.url_ttl = url_ttl
+        self.random = random.Random(seed)
+        self.secret = secrets.token_bytes(16)
+
+        self.album_count = albums
+        self.sessions = {}  # session token -> username
+        self.placeholder = fake_jpeg("placeholder", PLACEHOLDER_SIZE)
+        self.lock = threading.Lock()
+        self.stats = {}  # request kind -> count
+        self.versions = {}  # image path -> revision, bumped by replace_image
+        self.started = time.time()
+        self.server = None
+        self.thread = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def start(self):
+        """Start serving in a background thread. Returns self."""
+        simulator = self
+
+        class Handler(SimHandler):
+            sim = simulator
+
+        self.server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self.server.daemon_threads = True
+        self.port = self.server.server_address[1]
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def replace_image(self, path: str):
+        """Give an image new content (and so a new ETag and Last-Modified)."""
+        with self.lock:
+            self.versions[path] = self.versions.get(path, 0) + 1
+
+    def stop(self):
+        """Shut the server down."""
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+    def add_albums(self, count: int):
+        """Publish new albums at the top of the feed."""
+        with self.lock:
+            self.album_count += count
+
+    def count(self, kind: str):
+        with self.lock:
+            self.stats[kind] = self.stats.get(kind, 0) + 1
+
+    def album(self, album_id: int) -> tuple:
+        """Return (girl, slug) for an album ID."""
+        return f"model{album_id % self.models}", f"set-{album_id}"
+
+    def album_path(self, album_id: int) -> str:
+        girl, slug = self.album(album_id)
+        return f"/girls/{girl}/album/{album_id}/{slug}/"
+
+    def feed_album_ids(self) -> list:
+        """Album IDs newest first."""
+        return list(range(self.album_count, 0, -1))
+
+    def model_album_ids(self, girl: str) -> list:
+        """A model's album IDs newest first."""
+        return [album_id for album_id in self.feed_album_ids() if self.album(album_id)[0] == girl]
+
+    def sign(self, path: str, expires: int) -> str:
+        return hmac.new(self.secret, f"{path}:{expires}".encode(), hashlib.sha256).hexdigest()[:32]
+
+    def image_url(self, album_id: int, index: int) -> str:
+        """Signed CDN-style URL for an image (the path contains 'cloudfront')."""
+        path = f"/cloudfront/{album_id}/image{index:03d}.jpg"
+        expires = int(time.time()) + self.url_ttl
+        return f"{self.base_url}{path}?Expires={expires}&Signature={self.sign(path, expires)}&Key-Pair-Id=SIMKEY"
+
+
+class SimHandler(BaseHTTPRequestHandler):
+    """Request handler; `sim` is bound to the owning SiteSimulator."""
+
+    sim = None
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def session_user(self) -> str:
+        cookies = self.headers.get("Cookie", "")
+        for part in cookies.split(";"):
+            name, _, value = part.strip().partition("=")
+            if name == SESSION_COOKIE:
+                return self.sim.sessions.get(value)
+        return None
+
+    def send_body(self, status: int, body: bytes, content_type: str = "text/html; charset=utf-8", headers: dict = None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def redirect(self, location: str, headers: dict = None):
+        self.send_body(303, b"", headers={"Location": location, **(headers or {})})
+
+    def render(self, title: str, body: str):
+        user = self.session_user()
+        nav = LOGGED_IN_NAV.format(username=html.escape(user)) if user else LOGGED_OUT_NAV
+        self.send_body(200, PAGE_TEMPLATE.format(title=title, nav=nav, body=body).encode())
+
+    def do_HEAD(self):
+        self.do_GET()
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        path = parsed.path
+        query = parse_qs(parsed.query)
+        parts = [p for p in path.split("/") if p]
+
+        if parts and parts[0] == "cloudfront":
+            return self.serve_image(path, query)
+
+        if self.sim.page_latency:
+            time.sleep(self.sim.page_latency)
+
+        if path == "/":
+            self.sim.count("home")
+            return self.render("Home", "<h1>Welcome</h1>")
+        if path == "/logout":
+            return self.redirect("/", {"Set-Cookie": f"{SESSION_COOKIE}=; Path=/; Max-Age=0"})
+        if path.startswith("/join"):
+            return self.render("Join", "<h1>Join now</h1>")
+        if path == "/photos/sg/recent/all/":
+            self.sim.count("feed")
+            return self.serve_listing("Recent albums", path, self.sim.feed_album_ids(), query)
+        if len(parts) == 3 and parts[0] == "girls" and parts[2] == "photos":
+            self.sim.count("model_listing")
+            return self.serve_listing(f"{parts[1]} albums", path, self.sim.model_album_ids(parts[1]), query)
+        if len(parts) == 3 and parts[0] == "member" and parts[2] == "following":
+            return self.serve_following()
+        if len(parts) >= 5 and parts[0] == "girls" and parts[2] == "album":
+            return self.serve_album(parts)
+        if parts and parts[0] == "member":
+            return self.render("Member", "<h1>Your account</h1>")
+
+        self.send_body(404, b"Not found")
+
+    def do_POST(self):
+        if urlparse(self.path).path != "/login":
+            return self.send_body(404, b"Not found")
+
+        length = int(self.headers.get("Content-Length", 0))
+        form = parse_qs(self.rfile.read(length).decode())
+        username = form.get("username", [""])[0]
+        password = form.get("password", [""])[0]
+        self.sim.count("login")
+
+        if not username or not password:
+            return self.redirect("/?error=login")
+
+        token = secrets.token_hex(16)
+        self.sim.sessions[token] = username
+        self.redirect("/", {"Set-Cookie": f"{SESSION_COOKIE}={token}; Path=/"})
+
+    def serve_listing(self, title: str, path: str, ids: list, query: dict):
+        """Serve a paginated album listing (the feed or a model's albums)."""
+        page = int(query.get("page", ["1"])[0])
+        size = self.sim.page_size
+        page_ids = ids[(page - 1) * size:page * size]
+        has_more = page * size < len(ids)
+        next_url = f"{path}?page={page + 1}" if has_more else ""
+
+        items = "\n".join(
+            f'<div class="album"><a href="{self.sim.base_url}{self.sim.album_path(album_id)}">'
+            f'{html.escape("/".join(self.sim.album(album_id)))}</a></div>'
+            for album_id in page_ids
+        )
+
+        if "partial" in query:
+            return self.send_body(200, items.encode(), headers={"X-Next-Page": next_url} if next_url else None)
+
+        more = LOAD_MORE_SCRIPT.format(next=next_url) if has_more else ""
+        self.render(title, f'<div id="albums">\n{items}\n</div>\n{more}')
+
+    def serve_following(self):
+        """The logged-in member's followed models, linking to their profiles."""
+        if not self.session_user():
+            return self.redirect("/join/")
+        self.sim.count("following")
+        items = "\n".join(
+            f'<div class="model"><a href="/girls/model{i}/">model{i}</a></div>'
+            for i in range(min(self.sim.followed, self.sim.models))
+        )
+        self.render("Following", f'<div id="following">\n{items}\n</div>')
+
+    def serve_album(self, parts: list):
+        self.sim.count("album")
+        if not self.session_user():
+            return self.redirect("/join/")
+
+        try:
+            album_id = int(parts[3])
+        except ValueError:
+            return self.send_body(404, b"Not found")
+        if not 1 <= album_id <= self.sim.album_count:
+            return self.send_body(404, b"Not found")
+
+        photos = "\n".join(
+            f'<li class="photo-container"><a href="{html.escape(self.sim.image_url(album_id, i))}">'
+            f'<img alt="photo {i}"></a></li>'
+            for i in range(1, self.sim.images_per_album + 1)
+        )
+        girl, slug = self.sim.album(album_id)
+        self.render(f"{girl} - {slug}", f"<h1>{slug}</h1>\n<ul>\n{photos}\n</ul>")
+
+    def serve_image(self, path: str, query: dict):
+        expires = query.get("Expires", [""])[0]
+        signature = query.get("Signature", [""])[0]
+
+        # No valid signature: the CDN serves the placeholder, like an unauthenticated request
+        if not expires.isdigit() or not hmac.compare_digest(signature, self.sim.sign(path, int(expires))):
+            self.sim.count("placeholder")
+            return self.send_body(200, self.sim.placeholder, "image/jpeg")
+
+        if int(expires) < time.time():
+            self.sim.count("expired")
+            body = b"<Error><Code>AccessDenied</Code><Message>Request has expired</Message></Error>"
+            return self.send_body(403, body, "application/xml")
+
+        if self.sim.image_latency:
+            time.sleep(self.sim.image_latency)
+
+        with self.sim.lock:
+            failed = self.sim.random.random() < self.sim.error_rate
+        if failed:
+            self.sim.count("error")
+            return self.send_body(503, b"Service unavailable", "text/plain")
+
+        version = self.sim.versions.get(path, 0)
+        body = fake_jpeg(f"{path}#{version}" if version else path, self.sim.image_size)
+        headers = {
+            "ETag": '"' + hashlib.md5(body).hexdigest() + '"',
+            "Last-Modified": formatdate(self.sim.started + version, usegmt=True),
+        }
+        if self.headers.get("If-None-Match") == headers["ETag"]:
+            self.sim.count("not_modified")
+            return self.send_body(304, b"", "image/jpeg", headers)
+        self.sim.count("image")
+        self.send_body(200, body, "image/jpeg", headers)
+
+
+class ObjectStoreSimulator:
+    """
+    In-memory S3-compatible object store with path-style addressing.
+
+    Objects live in `objects` as {(bucket, key): bytes}; `stats` counts
+    requests by kind. Given `credentials` ({access key: secret key}), every
+    request must carry a valid AWS Signature V4 and a matching payload hash,
+    or it is answered 403; otherwise signatures are not checked.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, credentials: dict = None):
+        self.host = host
+        self.port = port
+        self.credentials = credentials
+        self.objects = {}
+        self.uploads = {}  # upload ID -> {"bucket", "key", "parts": {number: bytes}}
+        self.lock = threading.Lock()
+        self.stats = {}
+        self.server = None
+
+    @property
+    def endpoint(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def start(self):
+        """Start serving in a background thread. Returns self."""
+        store = self
+
+        class Handler(ObjectStoreHandler):
+            sim = store
+
+        self.server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self.server.daemon_threads = True
+        self.port = self.server.server_address[1]
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        """Shut the server down."""
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+    def count(self, kind: str):
+        with self.lock:
+            self.stats[kind] = self.stats.get(kind, 0) + 1
+
+
+class ObjectStoreHandler(BaseHTTPRequestHandler):
+    """Request handler; `sim` is bound to the owning ObjectStoreSimulator."""
+
+    sim = None
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_body(self, status: int, body: bytes = b"", headers: dict = None):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/xml")
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def target(self) -> tuple:
+        """Return (bucket, key, query) for the request path."""
+        parsed = urlparse(self.path)
+        bucket, _, key = unquote(parsed.path).lstrip("/").partition("/")
+        return bucket, key, {k: v[0] for k, v in parse_qs(parsed.query, keep_blank_values=True).items()}
+
+    def read_body(self) -> bytes:
+        return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+    def authorized(self, body: bytes = b"") -> bool:
+        """Check the request's Signature V4 (if the simulator has credentials); answer 403 if bad."""
+        if self.sim.credentials is None:
+            return True
+        match = re.fullmatch(
+            r"AWS4-HMAC-SHA256 Credential=([^/]+)/(\d{8})/([^/]+)/s3/aws4_request, "
+            r"SignedHeaders=([^,]+), Signature=([0-9a-f]{64})",
+            self.headers.get("Authorization", ""),
+        )
+        payload_hash = self.headers.get("x-amz-content-sha256", "")
+        secret = self.sim.credentials.get(match.group(1)) if match else None
+        if secret is None or payload_hash != hashlib.sha256(body).hexdigest():
+            self.sim.count("denied")
+            self.send_body(403, b"<Error><Code>AccessDenied</Code></Error>")
+            return False
+
+        access_key, datestamp, region, signed_headers, signature = match.groups()
+        path, _, raw_query = self.path.partition("?")
+        query = sorted(parse_qs(raw_query, keep_blank_values=True).items())
+        canonical_request = "\n".join([
+            self.command,
+            path,
+            "&".join(f"{quote(k, safe='-_.~')}={quote(v[0], safe='-_.~')}" for k, v in query),
+            "".join(f"{name}:{' '.join(self.headers.get(name, '').split())}\n" for name in signed_headers.split(";")),
+            signed_headers,
+            payload_hash,
+        ])
+        scope = f"{datestamp}/{region}/s3/aws4_request"
+        string_to_sign = "\n".join([
+            "AWS4-HMAC-SHA256", self.headers.get("x-amz-date", ""), scope,
+            hashlib.sha256(canonical_request.encode()).hexdigest(),
+        ])
+        signing_key = ("AWS4" + secret).encode()
+        for part in (datestamp, region, "s3", "aws4_request"):
+            signing_key = hmac.new(signing_key, part.encode(), hashlib.sha256).digest()
+        expected = hmac.new(signing_key, string_to_sign.encode(), hashlib.sha256).hexdigest()
+        if not hmac.compare_digest(expected, signature):
+            self.sim.count("denied")
+            self.send_body(403, b"<Error><Code>SignatureDoesNotMatch</Code></Error>")
+            return False
+        return True
+
+    def do_PUT(self):
+        bucket, key, query = self.target()
+        body = self.read_body()
+        if not self.authorized(body):
+            return
+        etag = '"' + hashlib.md5(body).hexdigest() + '"'
+        with self.sim.lock:
+            if "uploadId" in query:
+                upload = self.sim.uploads.get(query["uploadId"])
+                if upload is None:
+                    return self.send_body(404, b"<Error><Code>NoSuchUpload</Code></Error>")
+                upload["parts"][int(query["partNumber"])] = body
+            else:
+                self.sim.objects[(bucket, key)] = body
+        self.sim.count("part" if "uploadId" in query else "put")
+        self.send_body(200, headers={"ETag": etag})
+
+    def do_POST(self):
+        bucket, key, query = self.target()
+        if not self.authorized(self.read_body()):
+            return
+        if "uploads" in query:
+            upload_id = secrets.token_hex(8)
+            with self.sim.lock:
+                self.sim.uploads[upload_id] = {"bucket": bucket, "key": key, "parts": {}}
+            self.sim.count("initiate")
+            return self.send_body(200, (
+                "<InitiateMultipartUploadResult><Bucket>{}</Bucket><Key>{}</Key>"
+                "<UploadId>{}</UploadId></InitiateMultipartUploadResult>"
+            ).format(escape(bucket), escape(key), upload_id).encode())
+
+        with self.sim.lock:
+            upload = self.sim.uploads.pop(query.get("uploadId"), None)
+            if upload is None:
+                return self.send_body(404, b"<Error><Code>NoSuchUpload</Code></Error>")
+            parts = upload["parts"]
+            self.sim.objects[(bucket, key)] = b"".join(parts[n] for n in sorted(parts))
+        self.sim.count("complete")
+        self.send_body(200, b"<CompleteMultipartUploadResult></CompleteMultipartUploadResult>")
+
+    def do_DELETE(self):
+        bucket, key, query = self.target()
+        if not self.authorized():
+            return
+        with self.sim.lock:
+            if "uploadId" in query:
+                self.sim.uploads.pop(query["uploadId"], None)
+            else:
+                self.sim.objects.pop((bucket, key), None)
+        self.sim.count("delete")
+        self.send_body(204)
+
+    def do_HEAD(self):
+        self.do_GET()
+
+    def do_GET(self):
+        bucket, key, query = self.target()
+        if not self.authorized():
+            return
+        with self.sim.lock:
+            if key:
+                body = self.sim.objects.get((bucket, key))
+            else:
+                prefix = query.get("prefix", "")
+                listing = sorted(
+                    (k, len(v)) for (b, k), v in self.sim.objects.items() if b == bucket and k.startswith(prefix)
+                )
+        if key:
+            self.sim.count("get")
+            if body is None:
+                return self.send_body(404, b"<Error><Code>NoSuchKey</Code></Error>")
+            return self.send_body(200, body, {"ETag": '"' + hashlib.md5(body).hexdigest() + '"'})
+
+        self.sim.count("list")
+        contents = "".join(
+            f"<Contents><Key>{escape(k)}</Key><Size>{size}</Size></Contents>" for k, size in listing
+        )
+        self.send_body(200, (
+            '<ListBucketResult xmlns="http://s3.amazonaws.com/doc/2006-03-01/">'
+            f"<Name>{escape(bucket)}</Name><IsTruncated>false</IsTruncated>{contents}</ListBucketResult>"
+        ).encode())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a local stand-in of the site for SGSpider.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--albums", type=int, default=DEFAULT_ALBUMS)
+    parser.add_argument("--images-per-album", type=int, default=DEFAULT_IMAGES_PER_ALBUM)
+    parser.add_argument("--models", type=int, default=DEFAULT_MODELS)
+    parser.add_argument("--followed", type=int, default=DEFAULT_FOLLOWED, help="Models on the following list")
+    parser.add_argument("--page-size", type=int, default=DEFAULT_PAGE_SIZE)
+    parser.add_argument("--image-size", type=int, default=DEFAULT_IMAGE_SIZE, help="Bytes per image")
+    parser.add_argument("--image-latency", type=float, default=DEFAULT_IMAGE_LATENCY, help="Seconds")
+    parser.add_argument("--page-latency", type=float, default=DEFAULT_PAGE_LATENCY, help="Seconds")
+    parser.add_argument("--error-rate", type=float, default=DEFAULT_ERROR_RATE, help="Fraction of image requests failing")
+    parser.add_argument("--url-ttl", type=int, default=DEFAULT_URL_TTL, help="Signed URL lifetime in seconds")
+    args = parser.parse_args()
+
+    sim = SiteSimulator(
+        host=args.host, port=args.port, albums=args.albums,
+        images_per_album=args.images_per_album, models=args.models, followed=args.followed,
+        page_size=args.page_size, image_size=args.image_size,
+        image_latency=args.image_latency, page_latency=args.page_latency,
+        error_rate=args.error_rate, url_ttl=args.url_ttl,
+    ).start()
+    print(f"Simulator serving at {sim.base_url} (set base_url = {sim.base_url} in [settings])")
+
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        sim.stop()
+        sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,10 +2,21 @@
 """
 SGSpider - A web scraper for SuicideGirls using Playwright.
 Uses a single browser instance for all requests to maintain consistent fingerprinting.
+
+Can be embedded in a pipeline: SGSpider.download() yields typed events
+(AlbumDiscovered, ImageSaved, ImageSkipped, ImageFailed, AlbumFinished) as work
+happens, e.g.
+
+    for event in SGSpider().download():
+        if isinstance(event, ImageSaved):
+            ingest(event.location, event.sha256)
 """
 
 import sys
 import time
+import signal
+import argparse
+import threading
 import re
 import random
 import gc
@@ -16,9 +27,29 @@ import configparser
 import platform
 import hashlib
 import base64
+import hmac
+import functools
+import itertools
+import os
+import errno
+import shutil
+import sqlite3
+import mmap
+import multiprocessing
+import tarfile
+import zlib
+import queue
+import subprocess
+import tempfile
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait as futures_wait
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from datetime import datetime, timezone
+from http.client import HTTPConnection, HTTPSConnection, HTTPException
 from pathlib import Path
-from urllib.parse import urlparse
-from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeout
+from urllib.parse import urlparse, parse_qs, quote, urlencode, urljoin
+from xml.etree import ElementTree
 
 # Default configuration values (can be overridden by config file)
 DEFAULT_HEADLESS = True
@@ -28,6 +59,2262 @@ DEFAULT_DOWNLOAD_TIMEOUT = 30000  # 30 seconds for image downloads
 DEFAULT_PAGE_LOAD_TIMEOUT = 60000  # 60 seconds for page loads
 DEFAULT_MAX_ALBUM_PAGES = 0  # Limit album loading iterations (0 = unlimited)
 DEFAULT_BROWSER_RESTART_INTERVAL = 50  # Restart browser every N albums to manage memory
+DEFAULT_SIGNED_URL_MARGIN = 60  # Treat signed URLs as expired this many seconds early
+DEFAULT_WATCH_INTERVAL = 900  # Seconds between feed polls in watch mode
+DEFAULT_WATCH_JITTER = 0.2  # Random +/- fraction applied to the poll interval
+DEFAULT_WATCH_MAX_PAGES = 10  # Scroll iteration limit for an incremental feed poll
+DEFAULT_SOURCE_PAGES = 4  # Model album listings crawled at once in targeted mode
+DEFAULT_FOLLOWING_PATH = "/member/{username}/following/"  # Member's followed-models list
+DEFAULT_BASE_URL = "https://www.suicidegirls.com"
+DEFAULT_DOWNLOAD_DIR = "suicidegirls"
+DEFAULT_DELAY_SCALE = 1.0  # Multiplier for humanized delays (0 disables them, e.g. for local benchmarks)
+DEFAULT_SYNTHETIC_IMAGE_SIZE = 250000  # Bytes per image served in HAR replay mode
+DEFAULT_RESOURCE_TOP_ALLOCATORS = 10  # Fastest-growing allocation sites kept per resource sample
+DEFAULT_RESOURCE_MIN_SAMPLES = 5  # Albums a series needs before the leak report judges it
+
+# Query parameters and headers carrying credentials or signatures, scrubbed from recorded HARs
+HAR_SECRET_PARAMS = (
+    "Signature", "Key-Pair-Id", "Policy",
+    "X-Amz-Signature", "X-Amz-Credential", "X-Amz-Security-Token",
+)
+HAR_SECRET_HEADERS = ("cookie", "set-cookie", "authorization", "proxy-authorization")
+HAR_FAR_FUTURE_EXPIRY = "4102444800"  # 2100-01-01, replaces Expires= so replayed URLs never expire
+DEFAULT_CONTENT_STORE_LINK = "hardlink"  # How album files reference blobs: hardlink, reflink or copy
+DEFAULT_STORAGE_MODE = "files"  # "files" (one file per image) or "archive" (one tar per album)
+DEFAULT_VALIDATE_IMAGES = True  # Structurally check downloads in the background and re-fetch broken ones
+DEFAULT_VALIDATE_WORKERS = 2  # Validator processes
+DEFAULT_STORAGE = "local"  # Where images go: "local" (download_dir) or "s3" ([s3] section)
+DEFAULT_S3_REGION = "us-east-1"
+DEFAULT_S3_PART_SIZE = 8 * 1024 * 1024  # Multipart chunk size; larger bodies upload in parallel parts
+DEFAULT_S3_CONCURRENCY = 4  # Upload threads shared by all in-flight objects and parts
+DEFAULT_S3_MAX_BUFFER = 64 * 1024 * 1024  # Bytes held for upload before downloads block
+DEFAULT_BANDWIDTH_LIMIT = "0"  # Bytes/s with K/M/G suffix when no schedule window applies (0 = unlimited)
+DEFAULT_PAGE_HOST_CONCURRENCY = 0  # Page navigations in flight per host across all sessions (0 = unlimited)
+DEFAULT_IMAGE_HOST_CONCURRENCY = 4  # Image requests in flight per host (0 = unlimited)
+DEFAULT_LAUNCH_PROFILE = "full"  # "full" Chromium or the lighter "headless-shell" build
+DEFAULT_SPARE_BROWSER = False  # Keep a pre-launched Chromium ready so restarts are a swap
+DEFAULT_RESTART_KEEP_SESSION = False  # Seed a restarted browser with the old cookies instead of logging in
+DEFAULT_CONTEXTS_PER_ACCOUNT = 1  # Pool sessions logged in with each account of the sessions setting
+DEFAULT_DOWNLOAD_WORKERS = 0  # Threads draining a shared HTTP image queue (0 = one album at a time in the browser)
+MAX_IMAGE_URL_REFRESHES = 3  # Re-extracted signed URLs a queued image is retried with
+DEFAULT_REFRESH_CONCURRENCY = 16  # Parallel conditional requests in refresh mode
+DEFAULT_REFRESH_MIN_AGE = 24  # Hours before a revalidated album is checked again
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".gif", ".webp")
+
+FICLONE = 0x40049409  # Linux ioctl cloning a file's extents (reflink) on btrfs/XFS
+
+# Switches chromium.launch() puts ahead of BROWSER_ARGS (Playwright 1.64's
+# chromiumSwitches, then the headless ones), so a spare browser started by
+# hand runs with the same flags as a launched one
+PLAYWRIGHT_CHROMIUM_ARGS = [
+    "--disable-field-trial-config",
+    "--disable-background-networking",
+    "--disable-background-timer-throttling",
+    "--disable-backgrounding-occluded-windows",
+    "--disable-back-forward-cache",
+    "--disable-breakpad",
+    "--disable-client-side-phishing-detection",
+    "--disable-component-extensions-with-background-pages",
+    "--disable-component-update",
+    "--no-default-browser-check",
+    "--disable-default-apps",
+    "--disable-dev-shm-usage",
+    "--disable-edgeupdater",
+    "--disable-extensions",
+    "--disable-features=AvoidUnnecessaryBeforeUnloadCheckSync,DestroyProfileOnBrowserClose,"
+    "DialMediaRouteProvider,GlobalMediaControls,HttpsUpgrades,LensOverlay,MediaRouter,PaintHolding,"
+    "ThirdPartyStoragePartitioning,BlockOriginHeaderModificationOnRedirect,"
+    "AvoidCorsURLLoaderRestartOnRedirect,Translate,AutoDeElevate,OptimizationHints,"
+    "NetworkTimeServiceQuerying,AimEnabled,msForceBrowserSignIn,msEdgeUpdateLaunchServicesPreferredVersion",
+    "--enable-features=CDPScreenshotNewSurface",
+    "--allow-pre-commit-input",
+    "--disable-hang-monitor",
+    "--disable-ipc-flooding-protection",
+    "--disable-popup-blocking",
+    "--disable-prompt-on-repost",
+    "--disable-renderer-backgrounding",
+    "--disable-updater-scheduler",
+    "--force-color-profile=srgb",
+    "--metrics-recording-only",
+    "--no-first-run",
+    "--password-store=basic",
+    "--use-mock-keychain",
+    "--no-service-autorun",
+    "--export-tagged-pdf",
+    "--disable-search-engine-choice-screen",
+    "--unsafely-disable-devtools-self-xss-warnings",
+    "--edge-skip-compat-layer-relaunch",
+    "--disable-infobars",
+    "--disable-search-engine-choice-screen",
+    "--disable-sync",
+    "--enable-unsafe-swiftshader",
+]
+PLAYWRIGHT_HEADLESS_ARGS = [
+    "--headless",
+    "--hide-scrollbars",
+    "--mute-audio",
+    "--blink-settings=primaryHoverType=2,availableHoverTypes=2,primaryPointerType=4,availablePointerTypes=4",
+]
+
+# Chromium flags shared by every launch profile
+BROWSER_ARGS = [
+    "--no-sandbox",
+    "--disable-dev-shm-usage",
+    # Comprehensive GPU disabling
+    "--disable-gpu",
+    "--disable-gpu-compositing",
+    "--disable-gpu-sandbox",
+    "--disable-software-rasterizer",
+    "--disable-accelerated-2d-canvas",
+    "--disable-accelerated-video-decode",
+    "--disable-accelerated-video-encode",
+    "--disable-webgl",
+    "--disable-webgl2",
+    "--use-gl=swiftshader",
+    "--disable-features=VizDisplayCompositor,UseSkiaRenderer,Vulkan",
+    # Anti-detection
+    "--disable-blink-features=AutomationControlled",
+    "--disable-infobars",
+    "--disable-extensions",
+    "--disable-default-apps",
+    "--no-first-run",
+    "--disable-background-networking",
+    "--disable-background-timer-throttling",
+    "--disable-renderer-backgrounding",
+    "--disable-backgrounding-occluded-windows",
+    "--disable-client-side-phishing-detection",
+    "--disable-crash-reporter",
+    "--disable-oopr-debug-crash-dump",
+    "--no-crash-upload",
+    "--disable-low-res-tiling",
+    "--ignore-certificate-errors",
+    "--ignore-ssl-errors",
+    "--ignore-certificate-errors-spki-list",
+    "--allow-running-insecure-content",
+    "--disable-web-security",
+]
+
+
+class ContentStore:
+    """
+    Content-addressed blob store with an index of URLs already downloaded.
+
+    Blobs live under <root>/<aa>/<bb>/<sha256> and album files are hardlinks
+    (or reflinks/copies) to them, so identical photos in several albums are
+    stored once. URLs are indexed without their query string, since signed
+    tokens change on every page load.
+    """
+
+    def __init__(self, root: Path, link_mode: str = DEFAULT_CONTENT_STORE_LINK):
+        self.root = root
+        self.link_mode = link_mode
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(str(self.root / "index.sqlite3"), check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("CREATE TABLE IF NOT EXISTS urls (url TEXT PRIMARY KEY, sha256 TEXT NOT NULL)")
+        self.db.commit()
+
+    @staticmethod
+    def url_key(url: str) -> str:
+        parsed = urlparse(url)
+        return f"{parsed.netloc}{parsed.path}"
+
+    def blob_path(self, digest: str) -> Path:
+        return self.root / digest[:2] / digest[2:4] / digest
+
+    def lookup(self, url: str) -> str:
+        """Return the SHA-256 of a known URL whose blob is present, else None."""
+        with self.lock:
+            row = self.db.execute("SELECT sha256 FROM urls WHERE url = ?", (self.url_key(url),)).fetchone()
+        if row and self.blob_path(row[0]).exists():
+            return row[0]
+        return None
+
+    def put(self, body: bytes, digest: str, url: str) -> bool:
+        """
+        Store a downloaded body and index its URL.
+
+        Args:
+            body: Downloaded bytes
+            digest: SHA-256 hex digest of body
+            url: URL it was downloaded from
+
+        Returns:
+            True if the blob was new, False if identical content was already stored
+        """
+        blob = self.blob_path(digest)
+        is_new = not blob.exists()
+        if is_new:
+            blob.parent.mkdir(parents=True, exist_ok=True)
+            tmp_blob = blob.with_name(f"{digest}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp_blob.write_bytes(body)
+            tmp_blob.replace(blob)
+
+        with self.lock:
+            self.db.execute(
+                "INSERT OR REPLACE INTO urls (url, sha256) VALUES (?, ?)", (self.url_key(url), digest)
+            )
+            self.db.commit()
+        return is_new
+
+    def link(self, digest: str, dest: Path):
+        """Make dest reference a blob, replacing any existing file."""
+        blob = self.blob_path(digest)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        tmp_dest = dest.with_name(f".{dest.name}.tmp")
+        if tmp_dest.exists():
+            tmp_dest.unlink()
+
+        modes = {"hardlink": ("hardlink", "reflink", "copy"), "reflink": ("reflink", "copy")}
+        for mode in modes.get(self.link_mode, ("copy",)):
+            try:
+                if mode == "hardlink":
+                    os.link(blob, tmp_dest)
+                elif mode == "reflink":
+                    with open(blob, "rb") as src, open(tmp_dest, "wb") as dst:
+                        fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+                else:
+                    shutil.copyfile(blob, tmp_dest)
+                break
+            except OSError as e:
+                if tmp_dest.exists():
+                    tmp_dest.unlink()
+                # Cross-device, unsupported filesystem or link limit: try the next mode
+                if e.errno not in (errno.EXDEV, errno.EPERM, errno.EMLINK, errno.EOPNOTSUPP,
+                                   errno.ENOTTY, errno.EINVAL):
+                    raise
+        tmp_dest.replace(dest)
+
+    def close(self):
+        with self.lock:
+            self.db.close()
+
+
+class ImageIndex:
+    """
+    SQLite record of where each stored image came from and its HTTP validators.
+
+    Keyed by storage key, it keeps the album page, the last signed URL, the
+    ETag, Last-Modified and Content-Length the CDN sent, the SHA-256 of the
+    stored body and when the image was fetched and last revalidated, so a
+    refresh pass can ask "has this changed?" instead of downloading it again.
+    """
+
+    COLUMNS = ("key", "album_url", "url", "etag", "last_modified", "content_length",
+               "sha256", "fetched_at", "checked_at")
+
+    def __init__(self, path: Path):
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(str(path), check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS images (key TEXT PRIMARY KEY, album_url TEXT NOT NULL, "
+            "url TEXT NOT NULL, etag TEXT, last_modified TEXT, content_length INTEGER, "
+            "sha256 TEXT NOT NULL, fetched_at REAL NOT NULL, checked_at REAL NOT NULL)"
+        )
+        self.db.execute("CREATE INDEX IF NOT EXISTS images_album ON images (album_url)")
+        self.db.commit()
+
+    def record(self, key: str, album_url: str, url: str, headers: dict, size: int, digest: str):
+        """
+        Store a freshly downloaded image's validators.
+
+        Args:
+            key: Storage key of the image
+            album_url: Album page the image was found on
+            url: Signed URL it was downloaded from
+            headers: Response headers (lowercase names)
+            size: Body size in bytes
+            digest: SHA-256 hex digest of the body
+        """
+        now = time.time()
+        with self.lock:
+            self.db.execute(
+                "INSERT OR REPLACE INTO images VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, album_url, url, headers.get("etag"), headers.get("last-modified"),
+                 int(headers.get("content-length") or size), digest, now, now),
+            )
+            self.db.commit()
+
+    def mark_checked(self, key: str, url: str):
+        """Record that an image was revalidated unchanged (via a possibly newer URL)."""
+        with self.lock:
+            self.db.execute("UPDATE images SET url = ?, checked_at = ? WHERE key = ?", (url, time.time(), key))
+            self.db.commit()
+
+    def invalidate(self, key: str):
+        """Drop an image's validators and digest so the next refresh downloads it unconditionally."""
+        with self.lock:
+            self.db.execute(
+                "UPDATE images SET etag = NULL, last_modified = NULL, sha256 = '', checked_at = 0 WHERE key = ?",
+                (key,),
+            )
+            self.db.commit()
+
+    def albums_due(self, checked_before: float) -> list:
+        """Album URLs with an image last checked before a Unix time, least recently checked first."""
+        with self.lock:
+            rows = self.db.execute(
+                "SELECT album_url FROM images GROUP BY album_url HAVING MIN(checked_at) < ? "
+                "ORDER BY MIN(checked_at)", (checked_before,)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def album_images(self, album_url: str) -> list:
+        """Rows of an album's images as dicts keyed by column name."""
+        with self.lock:
+            rows = self.db.execute(
+                f"SELECT {', '.join(self.COLUMNS)} FROM images WHERE album_url = ? ORDER BY key", (album_url,)
+            ).fetchall()
+        return [dict(zip(self.COLUMNS, row)) for row in rows]
+
+    def count(self) -> int:
+        with self.lock:
+            return self.db.execute("SELECT COUNT(*) FROM images").fetchone()[0]
+
+    def close(self):
+        with self.lock:
+            self.db.close()
+
+
+class AlbumArchive:
+    """
+    A completed album packed into one uncompressed tar with a JSON side index.
+
+    <girl>/<album>.tar holds the images back to back and <album>.tar.idx maps
+    each member name to its data offset, size and SHA-256, so members can be
+    checked and read in place through mmap without scanning the tar.
+    """
+
+    def __init__(self, album_dir: Path):
+        self.album_dir = album_dir
+        self.tar_path = album_dir.with_name(album_dir.name + ".tar")
+        self.index_path = album_dir.with_name(album_dir.name + ".tar.idx")
+        self.index = self.load_index()
+
+    def load_index(self) -> dict:
+        if not self.index_path.exists():
+            return {}
+        try:
+            with open(self.index_path, "r") as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"Warning: Could not load archive index {self.index_path}: {e}")
+            return {}
+
+    def save_index(self):
+        tmp_path = self.index_path.with_name(self.index_path.name + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(self.index, f)
+        tmp_path.replace(self.index_path)
+
+    def has(self, name: str) -> bool:
+        return name in self.index
+
+    @contextmanager
+    def open_member(self, name: str):
+        """Yield a zero-copy memoryview of a member, mapped from the tar."""
+        entry = self.index[name]
+        with open(self.tar_path, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                view = memoryview(mapped)[entry["offset"]:entry["offset"] + entry["size"]]
+                try:
+                    yield view
+                finally:
+                    view.release()
+
+    def read(self, name: str) -> bytes:
+        """Return a copy of a member's bytes."""
+        with self.open_member(name) as view:
+            return bytes(view)
+
+    def pack_directory(self) -> int:
+        """
+        Append the album directory's images to the archive and remove them.
+
+        Files are only deleted after the rebuilt index confirms their size, and
+        the directory is removed once empty. A member added again (a re-fetched
+        image) supersedes the earlier copy in the index.
+
+        Returns:
+            Number of files packed
+        """
+        if not self.album_dir.is_dir():
+            return 0
+
+        files = sorted(
+            p for p in self.album_dir.iterdir()
+            if p.is_file() and p.suffix.lower() in IMAGE_EXTENSIONS
+        )
+        if not files:
+            return 0
+
+        with tarfile.open(self.tar_path, "a") as tar:
+            for path in files:
+                tar.add(str(path), arcname=path.name, recursive=False)
+
+        # Rebuild the index from the tar headers; later duplicates win
+        index = {}
+        with tarfile.open(self.tar_path, "r") as tar:
+            for member in tar:
+                if member.isfile():
+                    index[member.name] = {"offset": member.offset_data, "size": member.size}
+        for name, entry in index.items():
+            previous = self.index.get(name)
+            if previous and previous["offset"] == entry["offset"]:
+                entry["sha256"] = previous.get("sha256")
+        self.index = index
+
+        for path in files:
+            entry = self.index.get(path.name)
+            if entry and not entry.get("sha256"):
+                entry["sha256"] = hashlib.sha256(self.read(path.name)).hexdigest()
+        self.save_index()
+
+        packed = 0
+        for path in files:
+            entry = self.index.get(path.name)
+            if entry and entry["size"] == path.stat().st_size:
+                path.unlink()
+                packed += 1
+
+        try:
+            self.album_dir.rmdir()
+        except OSError:
+            pass  # Not empty (non-image files or failed members)
+
+        return packed
+
+
+class StorageSink:
+    """
+    Destination for downloaded images, addressed by "<girl>/<album>/<filename>" keys.
+
+    iter_images calls begin_album, then exists/is_valid/write per image, then
+    finish_album. Subclasses implement the backend.
+    """
+
+    def begin_album(self, girl: str, album: str):
+        """Prepare for an album's images (e.g. load its index or listing)."""
+
+    def exists(self, key: str) -> bool:
+        raise NotImplementedError
+
+    def is_valid(self, key: str) -> bool:
+        """Check a stored image; False means it should be re-downloaded."""
+        raise NotImplementedError
+
+    def delete(self, key: str):
+        """Remove an invalid image before it is re-downloaded."""
+
+    def link_known(self, key: str, url: str) -> bool:
+        """Store an image whose content is already known without fetching it."""
+        return False
+
+    def write(self, key: str, body: bytes, digest: str, url: str):
+        """Store a downloaded image body."""
+        raise NotImplementedError
+
+    def finish_album(self, girl: str, album: str, complete: bool) -> list:
+        """
+        Flush an album's pending work. complete is False if it was abandoned.
+
+        Returns:
+            Keys reported written whose storage then failed
+        """
+        return []
+
+    def location(self, key: str) -> str:
+        """Human-readable location of a key for logs."""
+        return key
+
+    def close(self):
+        """Flush and release backend resources."""
+
+
+class LocalStorage(StorageSink):
+    """
+    Images as files under download_dir, optionally deduplicated through the
+    content store and packed into per-album archives (storage_mode = archive).
+    """
+
+    def __init__(self, spider):
+        self.spider = spider
+        self.archives = {}  # "<girl>/<album>" -> AlbumArchive in archive mode
+
+    def path(self, key: str) -> Path:
+        return self.spider.download_dir / key
+
+    def archive_for(self, key: str) -> AlbumArchive:
+        return self.archives.get(key.rsplit("/", 1)[0])
+
+    def begin_album(self, girl: str, album: str):
+        if self.spider.storage_mode == "archive":
+            self.archives[f"{girl}/{album}"] = AlbumArchive(self.spider.download_dir / girl / album)
+
+    def exists(self, key: str) -> bool:
+        archive = self.archive_for(key)
+        return self.path(key).exists() or bool(archive and archive.has(key.rsplit("/", 1)[1]))
+
+    def is_valid(self, key: str) -> bool:
+        path = self.path(key)
+        if path.exists():
+            return self.spider.is_valid_existing_file(path)
+        # Archive mode: the side index replaces the filesystem check
+        archive = self.archive_for(key)
+        if archive and archive.has(path.name):
+            return self.spider.is_valid_archived_file(archive, path.name)
+        return False
+
+    def delete(self, key: str):
+        # Archived members can't be removed in place; a re-download supersedes them
+        path = self.path(key)
+        if path.exists():
+            path.unlink()
+
+    def link_known(self, key: str, url: str) -> bool:
+        content_store = self.spider.content_store
+        if not content_store:
+            return False
+        digest = content_store.lookup(url)
+        if not digest:
+            return False
+        path = self.path(key)
+        content_store.link(digest, path)
+        if self.spider.is_valid_existing_file(path):
+            return True
+        path.unlink()
+        return False
+
+    def write(self, key: str, body: bytes, digest: str, url: str):
+        path = self.path(key)
+        content_store = self.spider.content_store
+        if content_store:
+            if not content_store.put(body, digest, url):
+                self.spider.metrics.inc("bytes_deduplicated_total", len(body))
+            content_store.link(digest, path)
+        else:
+            # Written beside and renamed over, so a refresh never leaves a half-replaced file
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f".{path.name}.tmp")
+            tmp_path.write_bytes(body)
+            tmp_path.replace(path)
+
+    def finish_album(self, girl: str, album: str, complete: bool) -> list:
+        archive = self.archives.pop(f"{girl}/{album}", None)
+        if archive and complete:
+            with self.spider.profiler.span("pack_archive", "local"):
+                packed = archive.pack_directory()
+            if packed:
+                print(f"  Packed {packed} images into {archive.tar_path.name}")
+        return []
+
+    def location(self, key: str) -> str:
+        return str(self.path(key))
+
+
+class S3Storage(StorageSink):
+    """
+    Images as objects in an S3-compatible bucket (AWS S3, MinIO, ...).
+
+    Each body is handed to a pool of upload threads as soon as it is downloaded;
+    bodies larger than part_size go up as concurrent multipart uploads of
+    memoryview slices. The bytes buffered for upload are bounded by max_buffer,
+    so downloads block instead of growing memory when uploads fall behind.
+    finish_album waits for the album's uploads so saved state never runs ahead
+    of what is actually stored, and returns the keys whose upload failed. Requests are signed with AWS Signature V4.
+    """
+
+    def __init__(self, spider, endpoint: str, bucket: str, prefix: str = "",
+                 region: str = DEFAULT_S3_REGION, access_key: str = "", secret_key: str = "",
+                 part_size: int = DEFAULT_S3_PART_SIZE, concurrency: int = DEFAULT_S3_CONCURRENCY,
+                 max_buffer: int = DEFAULT_S3_MAX_BUFFER):
+        self.spider = spider
+        self.endpoint = urlparse(endpoint)
+        self.bucket = bucket
+        self.prefix = prefix.strip("/")
+        self.region = region
+        self.access_key = access_key
+        self.secret_key = secret_key
+        self.part_size = max(part_size, 5 * 1024 * 1024)  # S3 minimum for all but the last part
+        self.max_buffer = max(max_buffer, self.part_size)
+        self.pool = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="s3-upload")
+        self.connections = threading.local()
+
+        self.lock = threading.Condition()
+        self.buffered = 0  # Body bytes waiting for or in upload
+        self.pending = {}  # key -> parts still uploading
+        self.listings = {}  # "<girl>/<album>" -> {key: size} of objects known to exist
+        self.failures = {}  # "<girl>/<album>" -> keys whose upload failed
+
+    def object_key(self, key: str) -> str:
+        return f"{self.prefix}/{key}" if self.prefix else key
+
+    def location(self, key: str) -> str:
+        return f"s3://{self.bucket}/{self.object_key(key)}"
+
+    # -- HTTP + Signature V4 -------------------------------------------------
+
+    def connection(self):
+        conn = getattr(self.connections, "conn", None)
+        if conn is None:
+            conn_class = HTTPSConnection if self.endpoint.scheme == "https" else HTTPConnection
+            conn = conn_class(self.endpoint.netloc, timeout=120)
+            self.connections.conn = conn
+        return conn
+
+    def sign(self, method: str, path: str, query: dict, headers: dict, payload_hash: str) -> dict:
+        """Return headers with an AWS Signature V4 Authorization added."""
+        now = datetime.now(timezone.utc)
+        amz_date = now.strftime("%Y%m%dT%H%M%SZ")
+        datestamp = now.strftime("%Y%m%d")
+        headers = {
+            **{k.lower(): str(v) for k, v in headers.items()},
+            "host": self.endpoint.netloc,
+            "x-amz-date": amz_date,
+            "x-amz-content-sha256": payload_hash,
+        }
+
+        canonical_query = "&".join(
+            f"{quote(k, safe='-_.~')}={quote(str(v), safe='-_.~')}" for k, v in sorted(query.items())
+        )
+        signed_headers = ";".join(sorted(headers))
+        canonical_headers = "".join(f"{k}:{' '.join(headers[k].split())}\n" for k in sorted(headers))
+        canonical_request = "\n".join(
+            [method, path, canonical_query, canonical_headers, signed_headers, payload_hash]
+        )
+
+        scope = f"{datestamp}/{self.region}/s3/aws4_request"
+        string_to_sign = "\n".join(
+            ["AWS4-HMAC-SHA256", amz_date, scope, hashlib.sha256(canonical_request.encode()).hexdigest()]
+        )
+        key = ("AWS4" + self.secret_key).encode()
+        for part in (datestamp, self.region, "s3", "aws4_request"):
+            key = hmac.new(key, part.encode(), hashlib.sha256).digest()
+        signature = hmac.new(key, string_to_sign.encode(), hashlib.sha256).hexdigest()
+
+        headers["authorization"] = (
+            f"AWS4-HMAC-SHA256 Credential={self.access_key}/{scope}, "
+            f"SignedHeaders={signed_headers}, Signature={signature}"
+        )
+        return headers
+
+    def request(self, method: str, key: str = "", query: dict = None, body=b"", headers: dict = None) -> tuple:
+        """
+        Send a signed request, retrying on connection errors and 5xx responses.
+
+        Returns:
+            Tuple of (status, response headers, response body)
+        """
+        query = query or {}
+        path = quote(f"{self.endpoint.path.rstrip('/')}/{self.bucket}" + (f"/{key}" if key else ""), safe="/-_.~")
+        payload_hash = hashlib.sha256(body).hexdigest()
+        url = path + ("?" + urlencode(sorted(query.items()), quote_via=quote) if query else "")
+
+        last_error = None
+        for attempt in range(self.spider.max_retries):
+            signed = self.sign(method, path, query, headers or {}, payload_hash)
+            if body:
+                # Uploads count against the same bandwidth cap as downloads
+                self.spider.bandwidth.consume(len(body))
+            try:
+                conn = self.connection()
+                conn.request(method, url, body=body, headers=signed)
+                response = conn.getresponse()
+                data = response.read()
+                if response.status < 500:
+                    return response.status, response.headers, data
+                last_error = Exception(f"HTTP {response.status}")
+            except (OSError, HTTPException) as e:
+                last_error = e
+                self.connections.conn = None
+            time.sleep(self.spider.retry_base_delay * (2 ** attempt) * 0.1)
+        raise Exception(f"S3 {method} {key or self.bucket} failed: {last_error}")
+
+    # -- StorageSink ---------------------------------------------------------
+
+    def begin_album(self, girl: str, album: str):
+        """List the album's prefix once instead of a HEAD per image."""
+        album_prefix = self.object_key(f"{girl}/{album}") + "/"
+        listing = {}
+        token = None
+        while True:
+            query = {"list-type": "2", "prefix": album_prefix}
+            if token:
+                query["continuation-token"] = token
+            status, _, data = self.request("GET", query=query)
+            if status != 200:
+                print(f"  Warning: Could not list {album_prefix}: HTTP {status}")
+                break
+            root = ElementTree.fromstring(data)
+            namespace = root.tag.split("}")[0] + "}" if root.tag.startswith("{") else ""
+            for item in root.iter(f"{namespace}Contents"):
+                object_key = item.findtext(f"{namespace}Key")
+                listing[object_key[len(album_prefix):]] = int(item.findtext(f"{namespace}Size") or 0)
+            token = root.findtext(f"{namespace}NextContinuationToken")
+            if root.findtext(f"{namespace}IsTruncated") != "true" or not token:
+                break
+        self.listings[f"{girl}/{album}"] = listing
+
+    def listing_size(self, key: str):
+        album, name = key.rsplit("/", 1)
+        listing = self.listings.get(album)
+        if listing is None:
+            status, headers, _ = self.request("HEAD", self.object_key(key))
+            return int(headers.get("Content-Length", 0)) if status == 200 else None
+        return listing.get(name)
+
+    def exists(self, key: str) -> bool:
+        return self.listing_size(key) is not None
+
+    def is_valid(self, key: str) -> bool:
+        # Placeholders and short error bodies are rejected before upload, so size suffices
+        size = self.listing_size(key)
+        return size is not None and size >= 10000
+
+    def delete(self, key: str):
+        self.request("DELETE", self.object_key(key))
+
+    def reserve(self, size: int):
+        """Block until size bytes fit in the upload buffer."""
+        with self.lock:
+            while self.buffered and self.buffered + size > self.max_buffer:
+                self.lock.wait()
+            self.buffered += size
+
+    def release(self, size: int):
+        with self.lock:
+            self.buffered -= size
+            self.lock.notify_all()
+
+    def write(self, key: str, body: bytes, digest: str, url: str):
+        self.reserve(len(body))
+        with self.lock:
+            self.pending[key] = self.pending.get(key, 0) + 1
+
+        if len(body) <= self.part_size:
+            self.pool.submit(self.upload_single, key, body, digest)
+        else:
+            self.pool.submit(self.upload_multipart, key, body, digest)
+
+    def upload_single(self, key: str, body: bytes, digest: str):
+        try:
+            with self.spider.metrics.phase("s3_upload"):
+                status, _, data = self.request(
+                    "PUT", self.object_key(key), body=body,
+                    headers={"content-type": "image/jpeg", "x-amz-meta-sha256": digest},
+                )
+            if status != 200:
+                raise Exception(f"HTTP {status}: {data[:200]!r}")
+            self.uploaded(key, len(body))
+        except Exception as e:
+            self.failed(key, e)
+        finally:
+            self.release(len(body))
+            self.done(key)
+
+    def upload_multipart(self, key: str, body: bytes, digest: str):
+        """Initiate a multipart upload and fan its parts out to the pool."""
+        object_key = self.object_key(key)
+        try:
+            status, _, data = self.request(
+                "POST", object_key, query={"uploads": ""},
+                headers={"content-type": "image/jpeg", "x-amz-meta-sha256": digest},
+            )
+            if status != 200:
+                raise Exception(f"initiate: HTTP {status}")
+            upload_id = ElementTree.fromstring(data).findtext("{*}UploadId")
+        except Exception as e:
+            self.failed(key, e)
+            self.release(len(body))
+            self.done(key)
+            return
+
+        view = memoryview(body)
+        parts = [view[i:i + self.part_size] for i in range(0, len(body), self.part_size)]
+        upload = {"id": upload_id, "etags": [None] * len(parts), "remaining": len(parts), "error": None}
+        for number, part in enumerate(parts, start=1):
+            self.pool.submit(self.upload_part, key, upload, number, part, len(body))
+
+    def upload_part(self, key: str, upload: dict, number: int, part: memoryview, total_size: int):
+        object_key = self.object_key(key)
+        try:
+            if upload["error"] is None:
+                with self.spider.metrics.phase("s3_upload_part"):
+                    status, headers, _ = self.request(
+                        "PUT", object_key, query={"partNumber": str(number), "uploadId": upload["id"]},
+                        body=bytes(part),
+                    )
+                if status != 200:
+                    raise Exception(f"part {number}: HTTP {status}")
+                upload["etags"][number - 1] = headers.get("ETag")
+        except Exception as e:
+            upload["error"] = e
+        finally:
+            self.release(len(part))
+
+        with self.lock:
+            upload["remaining"] -= 1
+            last = upload["remaining"] == 0
+        if not last:
+            return
+
+        # The last part to finish completes (or aborts) the upload
+        try:
+            if upload["error"] is not None:
+                raise upload["error"]
+            parts_xml = "".join(
+                f"<Part><PartNumber>{n}</PartNumber><ETag>{etag}</ETag></Part>"
+                for n, etag in enumerate(upload["etags"], start=1)
+            )
+            status, _, data = self.request(
+                "POST", object_key, query={"uploadId": upload["id"]},
+                body=f"<CompleteMultipartUpload>{parts_xml}</CompleteMultipartUpload>".encode(),
+            )
+            if status != 200 or b"<Error>" in data:
+                raise Exception(f"complete: HTTP {status}")
+            self.uploaded(key, total_size)
+        except Exception as e:
+            self.failed(key, e)
+            try:
+                self.request("DELETE", object_key, query={"uploadId": upload["id"]})
+            except Exception:
+                pass
+        finally:
+            self.done(key)
+
+    def uploaded(self, key: str, size: int):
+        self.spider.metrics.inc("bytes_uploaded_total", size)
+        album, name = key.rsplit("/", 1)
+        listing = self.listings.get(album)
+        if listing is not None:
+            listing[name] = size
+
+    def failed(self, key: str, error: Exception):
+        self.spider.metrics.inc("upload_failures_total")
+        print(f"    Upload failed: {self.location(key)}: {error}")
+        with self.lock:
+            self.failures.setdefault(key.rsplit("/", 1)[0], set()).add(key)
+
+    def done(self, key: str):
+        with self.lock:
+            self.pending[key] -= 1
+            if not self.pending[key]:
+                del self.pending[key]
+            self.lock.notify_all()
+
+    def finish_album(self, girl: str, album: str, complete: bool) -> list:
+        album_key = f"{girl}/{album}/"
+        with self.lock:
+            while any(key.startswith(album_key) for key in self.pending):
+                self.lock.wait()
+            failed = self.failures.pop(f"{girl}/{album}", set())
+        self.listings.pop(f"{girl}/{album}", None)
+        return sorted(failed)
+
+    def close(self):
+        self.pool.shutdown(wait=True)
+
+
+def parse_rate(text: str) -> int:
+    """Parse a rate such as "512K" or "2.5M" (bytes per second, 1024-based) into bytes/s."""
+    text = text.strip().upper().removesuffix("B/S").removesuffix("/S").removesuffix("B")
+    multiplier = {"K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}.get(text[-1:], 1)
+    if multiplier > 1:
+        text = text[:-1]
+    try:
+        return int(float(text) * multiplier)
+    except ValueError:
+        raise ValueError(f"Invalid rate: {text!r}") from None
+
+
+def format_rate(rate: float) -> str:
+    if rate >= 1024 ** 2:
+        return f"{rate / 1024 ** 2:.1f} MB/s"
+    return f"{rate / 1024:.0f} KB/s"
+
+
+class BandwidthLimiter:
+    """
+    Token bucket capping the bytes per second the spider transfers.
+
+    The rate follows a time-of-day schedule of "HH:MM-HH:MM RATE" windows
+    (a window may wrap past midnight), falling back to a default rate
+    outside them; a rate of 0 means unlimited. Callers report bytes as they
+    move them and are put to sleep when the bucket runs dry, so concurrent
+    transfers share the cap. The bucket holds at most one second of tokens.
+    A rolling window of transferred bytes gives the current rate.
+    """
+
+    WINDOW = 10  # Seconds the current rate is averaged over
+
+    def __init__(self, default_rate: int = 0, schedule: list = None):
+        self.default_rate = default_rate
+        self.schedule = schedule or []  # (start minute, end minute, bytes/s)
+        self.lock = threading.Lock()
+        self.tokens = 0.0
+        self.updated = time.monotonic()
+        self.samples = []  # (monotonic time, bytes) within WINDOW
+
+    @staticmethod
+    def parse_schedule(text: str) -> list:
+        """Parse "08:00-18:00 1M, 18:00-23:00 4M" into (start, end, rate) minute windows."""
+        schedule = []
+        for entry in filter(None, (part.strip() for part in text.split(","))):
+            match = re.fullmatch(r"(\d{1,2}):(\d{2})\s*-\s*(\d{1,2}):(\d{2})\s+(\S+)", entry)
+            if not match:
+                raise ValueError(f"Invalid bandwidth_schedule entry: {entry!r}")
+            start_h, start_m, end_h, end_m, rate = match.groups()
+            schedule.append((int(start_h) * 60 + int(start_m), int(end_h) * 60 + int(end_m), parse_rate(rate)))
+        return schedule
+
+    def limit(self, now: datetime = None) -> int:
+        """Rate in force at a local time (default now), in bytes/s (0 = unlimited)."""
+        now = now or datetime.now()
+        minute = now.hour * 60 + now.minute
+        for start, end, rate in self.schedule:
+            if start <= minute < end or (end < start and (minute >= start or minute < end)):
+                return rate
+        return self.default_rate
+
+    def consume(self, size: int):
+        """Account for size bytes transferred, sleeping while the bucket is in debt."""
+        rate = self.limit()
+        with self.lock:
+            now = time.monotonic()
+            self.samples.append((now, size))
+            if self.samples[0][0] < now - self.WINDOW:
+                self.samples = [sample for sample in self.samples if sample[0] >= now - self.WINDOW]
+            if not rate:
+                self.tokens = 0.0
+                self.updated = now
+                return
+            self.tokens = min(float(rate), self.tokens + (now - self.updated) * rate) - size
+            self.updated = now
+            debt = -self.tokens
+        if debt > 0:
+            time.sleep(debt / rate)
+
+    def current_rate(self) -> float:
+        """Bytes per second transferred over the last WINDOW seconds."""
+        with self.lock:
+            cutoff = time.monotonic() - self.WINDOW
+            return sum(size for when, size in self.samples if when >= cutoff) / self.WINDOW
+
+
+class HostLimiter:
+    """
+    Per-host caps on concurrent requests, kept separately for page
+    navigations and image fetches.
+
+    Limits come from the page/image defaults unless an override matches the
+    host exactly or as "*.domain". A limit of 0 leaves the host unlimited.
+    """
+
+    def __init__(self, page_limit: int = DEFAULT_PAGE_HOST_CONCURRENCY,
+                 image_limit: int = DEFAULT_IMAGE_HOST_CONCURRENCY, overrides: dict = None):
+        self.limits = {"page": page_limit, "image": image_limit}
+        self.overrides = overrides or {}  # host or "*.domain" -> limit
+        self.lock = threading.Lock()
+        self.semaphores = {}  # (kind, host) -> BoundedSemaphore
+
+    @staticmethod
+    def parse_overrides(text: str) -> dict:
+        """Parse "www.example.com=1, *.cloudfront.net=8" into a host -> limit dict."""
+        overrides = {}
+        for entry in filter(None, (part.strip() for part in text.split(","))):
+            host, _, limit = entry.partition("=")
+            if not limit.strip().isdigit():
+                raise ValueError(f"Invalid host_concurrency entry: {entry!r}")
+            overrides[host.strip().lower()] = int(limit)
+        return overrides
+
+    def limit(self, host: str, kind: str) -> int:
+        if host in self.overrides:
+            return self.overrides[host]
+        for pattern, limit in self.overrides.items():
+            if pattern.startswith("*.") and (host == pattern[2:] or host.endswith(pattern[1:])):
+                return limit
+        return self.limits[kind]
+
+    @contextmanager
+    def slot(self, url: str, kind: str):
+        """Hold one of the host's request slots for a page navigation or image fetch."""
+        host = (urlparse(url).hostname or "").lower()
+        limit = self.limit(host, kind)
+        if not limit:
+            yield
+            return
+        with self.lock:
+            semaphore = self.semaphores.get((kind, host))
+            if semaphore is None:
+                semaphore = self.semaphores[(kind, host)] = threading.BoundedSemaphore(limit)
+        with semaphore:
+            yield
+
+
+class HTTPFetcher:
+    """
+    Plain HTTP client for bulk image requests outside the browser.
+
+    Requests carry the browser context's cookies and user agent, so the CDN
+    sees the same session. Each thread keeps one keep-alive connection per
+    host; a dropped connection is retried once on a new one. Requests take an
+    image slot of the host limiter and bodies are read in chunks through the
+    bandwidth limiter.
+    """
+
+    CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, user_agent: str, cookies: list, timeout: float,
+                 bandwidth: BandwidthLimiter = None, hosts: HostLimiter = None):
+        self.user_agent = user_agent
+        self.cookies = cookies
+        self.timeout = timeout
+        self.bandwidth = bandwidth or BandwidthLimiter()
+        self.hosts = hosts or HostLimiter()
+        self.connections = threading.local()
+
+    def cookie_header(self, url) -> str:
+        """Cookie header value for a parsed URL, from the cookies whose domain and path match."""
+        host = url.hostname or ""
+        pairs = []
+        for cookie in self.cookies:
+            domain = cookie.get("domain", "").lstrip(".")
+            if host != domain and not host.endswith("." + domain):
+                continue
+            if not url.path.startswith(cookie.get("path") or "/"):
+                continue
+            if cookie.get("secure") and url.scheme != "https":
+                continue
+            pairs.append(f"{cookie['name']}={cookie['value']}")
+        return "; ".join(pairs)
+
+    def connection(self, url):
+        conns = getattr(self.connections, "by_host", None)
+        if conns is None:
+            conns = self.connections.by_host = {}
+        key = (url.scheme, url.netloc)
+        if key not in conns:
+            conn_class = HTTPSConnection if url.scheme == "https" else HTTPConnection
+            conns[key] = conn_class(url.netloc, timeout=self.timeout)
+        return conns[key]
+
+    def request(self, method: str, url: str, headers: dict = None) -> tuple:
+        """
+        Send a request and read the whole response.
+
+        Returns:
+            Tuple of (status, response headers with lowercase names, body)
+        """
+        parsed = urlparse(url)
+        headers = {"User-Agent": self.user_agent, **(headers or {})}
+        cookie = self.cookie_header(parsed)
+        if cookie:
+            headers["Cookie"] = cookie
+        target = parsed.path + (f"?{parsed.query}" if parsed.query else "")
+
+        for attempt in range(2):
+            conn = self.connection(parsed)
+            try:
+                with self.hosts.slot(url, "image"):
+                    conn.request(method, target, headers=headers)
+                    response = conn.getresponse()
+                    chunks = []
+                    while True:
+                        chunk = response.read(self.CHUNK_SIZE)
+                        if not chunk:
+                            break
+                        chunks.append(chunk)
+                        self.bandwidth.consume(len(chunk))
+                return response.status, {k.lower(): v for k, v in response.getheaders()}, b"".join(chunks)
+            except (OSError, HTTPException):
+                conn.close()
+                del self.connections.by_host[(parsed.scheme, parsed.netloc)]
+                if attempt:
+                    raise
+
+
+@dataclass
+class ImageJob:
+    """An image waiting in the shared download queue, tagged with its album."""
+    album_url: str
+    key: str
+    url: str
+    album_index: int = 0  # Position of the album in download_queued()'s list; one URL may appear twice
+    url_refreshes: int = 0  # Re-extracted signed URLs this image has been retried with
+    auth_retried: bool = False  # Already retried after a placeholder response
+
+
+class DownloadWorkers:
+    """
+    Fixed set of download threads draining one queue of album-tagged images.
+
+    Album pages are loaded in the browser on the caller's thread, which
+    queues each album's images as soon as they are extracted; the workers
+    fetch them over plain HTTP with the browser session's cookies and move on
+    to the next album's images while an album's stragglers finish. Results
+    come back on a second queue as (job, event or SignedURLExpired) pairs.
+    """
+
+    def __init__(self, spider, fetcher: HTTPFetcher, workers: int):
+        self.spider = spider
+        self.fetcher = fetcher
+        self.jobs = queue.PriorityQueue()  # (priority, sequence, job): retries ahead, else FIFO
+        self.sequence = itertools.count()
+        self.results = queue.Queue()
+        self.in_flight = 0  # Jobs submitted whose result has not been collected (caller's thread only)
+        self.threads = [
+            threading.Thread(target=self.work, name=f"download-{n}", daemon=True) for n in range(workers)
+        ]
+        for thread in self.threads:
+            thread.start()
+
+    def work(self):
+        while True:
+            job = self.jobs.get()[2]
+            if job is None:
+                return
+            try:
+                with self.spider.profiler.tagged(album=job.album_url):
+                    result = self.spider.download_image_via_http(self.fetcher, job.url, job.key, job.album_url)
+            except SignedURLExpired as e:
+                result = e
+            except Exception as e:
+                result = ImageFailed(job.album_url, job.key, str(e))
+            self.results.put((job, result))
+            # Small delay between downloads, per worker
+            self.spider.random_delay(0.5, 1.5)
+
+    def submit(self, job: ImageJob, front: bool = False):
+        """Queue a job; front=True puts it ahead of every job not yet picked up."""
+        self.in_flight += 1
+        self.jobs.put((0 if front else 1, next(self.sequence), job))
+
+    def queued(self) -> int:
+        """Jobs not yet picked up by a worker."""
+        return self.jobs.qsize()
+
+    def withdraw(self) -> list:
+        """Take back every job not yet picked up by a worker."""
+        jobs = []
+        while True:
+            try:
+                jobs.append(self.jobs.get_nowait()[2])
+            except queue.Empty:
+                self.in_flight -= len(jobs)
+                return jobs
+
+    def collect(self, timeout: float = 0) -> list:
+        """Finished (job, result) pairs, waiting up to timeout seconds for the first."""
+        results = []
+        try:
+            results.append(self.results.get(timeout=timeout) if timeout else self.results.get_nowait())
+            while True:
+                results.append(self.results.get_nowait())
+        except queue.Empty:
+            pass
+        self.in_flight -= len(results)
+        return results
+
+    def close(self):
+        """Drop queued jobs and wait for the workers to finish their current download."""
+        self.withdraw()
+        for _ in self.threads:
+            self.jobs.put((2, next(self.sequence), None))
+        for thread in self.threads:
+            thread.join()
+
+
+class SessionPool:
+    """
+    Extra logged-in sessions downloading albums from a shared queue.
+
+    Each member is an SGSpider with its own thread, Playwright instance,
+    browser context, login, placeholder detection and pacing; storage,
+    validation, the image index, metrics and the transfer limiters are shared
+    with the spider that owns the pool. An album goes to whichever member
+    asks first. A member whose session expires re-authenticates on its own
+    thread, out of rotation, while the others carry on; after
+    MAX_LOGIN_FAILURES failed logins in a row it retires. Events come back
+    as (member name, event) pairs.
+    """
+
+    MAX_LOGIN_FAILURES = 3
+
+    def __init__(self, members: dict):
+        self.members = members  # name -> SGSpider
+        self.status = {name: "starting" for name in members}
+        self.albums = []
+        self.condition = threading.Condition()
+        self.results = queue.Queue()
+        self.closing = False
+        self.threads = [
+            threading.Thread(target=self.work, args=(name, member), name=f"session-{name}", daemon=True)
+            for name, member in members.items()
+        ]
+        for thread in self.threads:
+            thread.start()
+
+    def set_status(self, name: str, status: str):
+        with self.condition:
+            if self.status[name] == status:
+                return
+            self.status[name] = status
+        if status in ("reauth", "retired"):
+            print(f"  [{name}] {'re-authenticating, out of rotation' if status == 'reauth' else 'retired'}")
+        elif status == "ready":
+            print(f"  [{name}] in rotation")
+
+    def active(self) -> int:
+        """Members not retired (including ones still starting or re-authenticating)."""
+        with self.condition:
+            return sum(status not in ("retired", "stopped") for status in self.status.values())
+
+    def put(self, album_url: str, front: bool = False):
+        with self.condition:
+            if front:
+                self.albums.insert(0, album_url)
+            else:
+                self.albums.append(album_url)
+            self.condition.notify()
+
+    def backlog(self) -> int:
+        """Albums queued and not yet taken by a member."""
+        with self.condition:
+            return len(self.albums)
+
+    def take(self) -> str:
+        """Next album for a member; None once the pool is closing."""
+        with self.condition:
+            while not self.albums and not self.closing:
+                self.condition.wait()
+            return None if self.closing else self.albums.pop(0)
+
+    def collect(self, timeout: float = 0) -> list:
+        """Finished (member name, event) pairs, waiting up to timeout seconds for the first."""
+        results = []
+        try:
+            results.append(self.results.get(timeout=timeout) if timeout else self.results.get_nowait())
+            while True:
+                results.append(self.results.get_nowait())
+        except queue.Empty:
+            pass
+        return results
+
+    def work(self, name: str, member):
+        albums_done = 0
+        album_url = None  # Album taken but not yet finished
+        try:
+            with member.browser_session():
+                self.set_status(name, "ready")
+                while True:
+                    album_url = self.take()
+                    if album_url is None:
+                        return
+                    if member.placeholder_hash is None and not member.replay_har:
+                        member.prepare_placeholder_detection(album_url)
+
+                    try:
+                        with member.profiler.tagged(album=album_url, session=name):
+                            for event in member.iter_images(album_url):
+                                self.results.put((name, event))
+                                if self.closing:
+                                    return
+                    except Exception as e:
+                        print(f"  [{name}] Error processing album: {e}")
+                        event = AlbumFinished(album_url, 0, 0, 0)
+                        self.results.put((name, event))
+                    album_url = None
+
+                    if event.auth_failure and not self.reauthenticate(name, member):
+                        return
+                    albums_done += 1
+                    if member.browser_restart_interval > 0 and albums_done % member.browser_restart_interval == 0:
+                        if not member.restart_browser() and not self.reauthenticate(name, member):
+                            return
+        except LoginFailed:
+            print(f"  [{name}] Could not log in")
+        except Exception as e:
+            print(f"  [{name}] Session failed: {e}")
+        finally:
+            if album_url and not self.closing:
+                # The browser died mid-album: let another session redo it
+                self.put(album_url, front=True)
+            self.set_status(name, "stopped" if self.closing else "retired")
+
+    def reauthenticate(self, name: str, member) -> bool:
+        """Log a member in again, backing off between attempts; False if it should retire."""
+        self.set_status(name, "reauth")
+        for attempt in range(self.MAX_LOGIN_FAILURES):
+            if self.closing:
+                return False
+            if member.login():
+                self.set_status(name, "ready")
+                return True
+            member.sleep(member.retry_base_delay * (2 ** attempt), "retry_backoff")
+        return False
+
+    def close(self):
+        """Stop handing out albums and wait for members to leave their current album."""
+        with self.condition:
+            self.closing = True
+            self.albums = []
+            self.condition.notify_all()
+        for thread in self.threads:
+            thread.join()
+
+
+def find_headless_shell(chromium_path: str) -> str:
+    """
+    Locate Playwright's chromium-headless-shell build next to its full Chromium.
+
+    Args:
+        chromium_path: Path of Playwright's Chromium executable
+
+    Returns:
+        Path of the newest headless shell binary, or None if not installed
+    """
+    for parent in Path(chromium_path).parents:
+        if parent.name.startswith("chromium-"):
+            candidates = [
+                path for pattern in ("chromium_headless_shell-*/*/headless_shell",
+                                     "chromium_headless_shell-*/*/chrome-headless-shell")
+                for path in parent.parent.glob(pattern)
+            ]
+            return str(max(candidates)) if candidates else None
+    return None
+
+
+class SpareBrowser:
+    """
+    A Chromium process started ahead of time with a DevTools port.
+
+    The process boots in the background while the current browser works;
+    start_browser() attaches to it with connect_over_cdp, which takes a
+    fraction of a cold launch. Its profile lives in a temporary directory
+    removed on close().
+
+    It gets the switches chromium.launch() would pass, in the same order.
+    Only the DevTools transport and startup page differ: a TCP port on
+    127.0.0.1 read back from DevToolsActivePort instead of
+    --remote-debugging-pipe, and an about:blank window where Playwright
+    passes --no-startup-window.
+    """
+
+    def __init__(self, executable: str, args: list, headless: bool = True):
+        self.user_data_dir = tempfile.mkdtemp(prefix="sgspider-chromium-")
+        self.process = subprocess.Popen(
+            self.command(executable, args, headless, self.user_data_dir),
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True,
+        )
+
+    @staticmethod
+    def command(executable: str, args: list, headless: bool, user_data_dir: str) -> list:
+        """Command line matching chromium.launch(headless=headless, args=args), attachable over CDP."""
+        launch_args = PLAYWRIGHT_CHROMIUM_ARGS + (PLAYWRIGHT_HEADLESS_ARGS if headless else []) + ["--no-sandbox"]
+        return [executable, *launch_args, *args, f"--user-data-dir={user_data_dir}",
+                "--remote-debugging-port=0", "about:blank"]
+
+    def endpoint(self, timeout: float = 30) -> str:
+        """
+        DevTools endpoint URL, waiting for the browser to finish starting.
+
+        Raises:
+            RuntimeError: If the browser exited or did not open its port in time
+        """
+        port_file = Path(self.user_data_dir) / "DevToolsActivePort"
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"spare browser exited with status {self.process.returncode}")
+            try:
+                port = port_file.read_text().split("\n", 1)[0].strip()
+                if port.isdigit():
+                    return f"http://127.0.0.1:{port}"
+            except OSError:
+                pass
+            time.sleep(0.05)
+        raise RuntimeError("spare browser did not open its DevTools port")
+
+    def close(self):
+        if self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+        shutil.rmtree(self.user_data_dir, ignore_errors=True)
+
+
+def check_image_structure(data: bytes) -> str:
+    """
+    Structurally check image data for truncation or corruption.
+
+    JPEGs must have intact segment headers up to the scan and end with an EOI
+    marker, PNG chunks must match their CRCs through IEND, and WebP/BMP files
+    must be as long as their headers declare. Runs in validator worker processes.
+
+    Args:
+        data: Complete image file contents
+
+    Returns:
+        Reason the image is broken, or "" if it looks intact
+    """
+    view = memoryview(data)
+    size = len(data)
+
+    if data[:2] == b"\xff\xd8":
+        pos = 2
+        while True:
+            if pos + 2 > size:
+                return "JPEG truncated in headers"
+            if data[pos] != 0xFF:
+                return f"JPEG bad marker at offset {pos}"
+            marker = data[pos + 1]
+            if marker == 0xFF:  # Fill byte
+                pos += 1
+                continue
+            if marker == 0xD9:
+                return ""
+            if marker == 0x01 or 0xD0 <= marker <= 0xD7:  # Standalone markers
+                pos += 2
+                continue
+            length = int.from_bytes(data[pos + 2:pos + 4], "big")
+            if pos + 4 > size or length < 2 or pos + 2 + length > size:
+                return f"JPEG segment {marker:02X} truncated"
+            pos += 2 + length
+            if marker == 0xDA:  # Start of scan: entropy-coded data runs to EOI
+                break
+        if not data.rstrip(b"\x00\r\n ").endswith(b"\xff\xd9"):
+            return "JPEG missing EOI marker (truncated)"
+        return ""
+
+    if data[:8] == b"\x89PNG\r\n\x1a\n":
+        pos = 8
+        while pos + 12 <= size:
+            length = int.from_bytes(data[pos:pos + 4], "big")
+            chunk_type = bytes(view[pos + 4:pos + 8])
+            end = pos + 12 + length
+            if end > size:
+                return f"PNG chunk {chunk_type!r} truncated"
+            if zlib.crc32(view[pos + 4:end - 4]) != int.from_bytes(data[end - 4:end], "big"):
+                return f"PNG chunk {chunk_type!r} CRC mismatch"
+            if chunk_type == b"IEND":
+                return ""
+            pos = end
+        return "PNG missing IEND chunk (truncated)"
+
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        declared = int.from_bytes(data[4:8], "little") + 8
+        if declared > size:
+            return f"WebP truncated ({size} of {declared} bytes)"
+        return ""
+
+    if data[:6] in (b"GIF87a", b"GIF89a"):
+        if not data.rstrip(b"\x00").endswith(b"\x3b"):
+            return "GIF missing trailer (truncated)"
+        return ""
+
+    if data[:2] == b"BM":
+        declared = int.from_bytes(data[2:6], "little")
+        if declared > size:
+            return f"BMP truncated ({size} of {declared} bytes)"
+        return ""
+
+    return "unrecognized image format"
+
+
+def check_image_file(path: Path) -> str:
+    """Run check_image_structure on a file (picklable for process pools)."""
+    try:
+        return check_image_structure(path.read_bytes())
+    except OSError as e:
+        return f"unreadable: {e}"
+
+
+class ImageValidator:
+    """
+    Background structural validation of downloaded images.
+
+    Bodies are checked with check_image_structure in a process pool so parsing
+    never blocks downloads; failures are collected by key with failures() and
+    re-fetched by the spider. The pool starts on the first submit.
+
+    Validation is best effort: a broken pool (a worker killed by the OOM
+    killer, or a script without a __main__ guard under the spawn start method)
+    is replaced up to MAX_POOL_RESTARTS times and validation is then switched
+    off. Images whose check could not run are never reported as failures.
+    """
+
+    MAX_POOL_RESTARTS = 2
+
+    def __init__(self, workers: int = DEFAULT_VALIDATE_WORKERS):
+        self.workers = workers
+        self.pool = None
+        self.pending = {}  # key -> Future
+        self.lock = threading.Lock()
+        self.restarts = 0
+        self.disabled = False
+
+    def submit(self, key: str, data: bytes):
+        """Queue an image body for validation (never raises)."""
+        with self.lock:
+            if self.disabled:
+                return
+            try:
+                if self.pool is None:
+                    # Spawned workers don't inherit the browser driver's threads and pipes
+                    self.pool = ProcessPoolExecutor(
+                        max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+                    )
+                self.pending[key] = self.pool.submit(check_image_structure, data)
+            except Exception as e:
+                self.pool_failed(e)
+
+    def pool_failed(self, error: Exception):
+        """Drop a broken pool; the next submit starts a new one unless out of restarts. Requires lock."""
+        if self.pool:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+            self.pool = None
+        if self.restarts >= self.MAX_POOL_RESTARTS:
+            self.disabled = True
+            self.pending.clear()
+            print(f"Warning: Image validation disabled, its worker pool keeps failing: {error}")
+            return
+        self.restarts += 1
+        print(f"Warning: Image validation pool failed, restarting it: {error}")
+
+    def failures(self, wait: bool = False) -> list:
+        """
+        Collect results of finished validations.
+
+        Args:
+            wait: Block until every queued validation has finished
+
+        Returns:
+            List of (key, reason) for images that failed
+        """
+        with self.lock:
+            pending = dict(self.pending)
+        if wait:
+            futures_wait(pending.values())
+
+        failed = []
+        unchecked = 0
+        error = None
+        for key, future in pending.items():
+            if not future.done():
+                continue
+            with self.lock:
+                if self.pending.get(key) is not future:
+                    continue  # Superseded by a re-download
+                del self.pending[key]
+            try:
+                if future.cancelled():
+                    raise RuntimeError("validation pool was shut down")
+                reason = future.result()
+            except Exception as e:
+                # The check never ran (a broken pool is replaced on the next submit);
+                # that says nothing about the image
+                unchecked += 1
+                error = e
+                continue
+            if reason:
+                failed.append((key, reason))
+        if unchecked:
+            print(f"Warning: {unchecked} images left unvalidated: {error!r}")
+        return failed
+
+    def close(self):
+        if self.pool:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+            self.pool = None
+
+
+class NonRetryableError(Exception):
+    """Raised by a retried operation to abort immediately instead of backing off."""
+
+
+class SignedURLExpired(NonRetryableError):
+    """Raised when a signed CDN URL has expired and must be re-extracted."""
+
+
+class LoginFailed(Exception):
+    """Raised by SGSpider.session() when the spider cannot log in."""
+
+
+# Events yielded by SGSpider.download() and iter_images()
+
+@dataclass
+class AlbumDiscovered:
+    """An album about to be processed."""
+    url: str
+    girl: str
+    album: str
+    index: int  # Position in the run's album list
+    total: int  # Albums known so far
+    crawling: bool = False  # More albums may still come from the feed
+
+
+@dataclass
+class ImageSaved:
+    """An image downloaded and handed to storage."""
+    album_url: str
+    key: str  # "<girl>/<album>/<filename>"
+    location: str  # Path or s3:// URL
+    url: str
+    size: int
+    sha256: str
+
+
+@dataclass
+class ImageSkipped:
+    """An image not downloaded because it is already stored."""
+    album_url: str
+    key: str
+    reason: str  # "exists" or "deduplicated"
+
+
+@dataclass
+class ImageFailed:
+    """An image that could not be downloaded."""
+    album_url: str
+    key: str
+    reason: str
+    placeholder: bool = False  # Got the unauthenticated placeholder (session lost)
+
+
+@dataclass
+class AlbumFinished:
+    """End of an album's images."""
+    url: str
+    downloaded: int
+    skipped: int
+    failed: int
+    auth_failure: bool = False  # Abandoned because the session expired
+
+
+# Prometheus metric types and help text, keyed by name without the sgspider_ prefix
+METRIC_HELP = {
+    "phase_duration_seconds": ("histogram", "Time spent in each spider phase."),
+    "phase_calls_total": ("counter", "Phase invocations by outcome."),
+    "albums_processed_total": ("counter", "Albums processed."),
+    "images_downloaded_total": ("counter", "Images downloaded and saved."),
+    "images_skipped_total": ("counter", "Images skipped because a valid file already exists."),
+    "images_failed_total": ("counter", "Images that failed to download."),
+    "images_deduplicated_total": ("counter", "Images linked from the content store without a fetch."),
+    "bytes_deduplicated_total": ("counter", "Downloaded bytes whose content was already stored."),
+    "bytes_downloaded_total": ("counter", "Image bytes downloaded."),
+    "retries_total": ("counter", "Retried attempts after a failed operation."),
+    "placeholder_hits_total": ("counter", "Downloads that returned the unauthenticated placeholder."),
+    "browser_restarts_total": ("counter", "Browser restarts."),
+    "signed_urls_expired_total": ("counter", "Signed image URLs found expired."),
+    "signed_url_refreshes_total": ("counter", "Album re-extractions triggered by expired URLs."),
+    "signed_url_failures_total": ("counter", "Images still failing after a signed URL refresh."),
+    "bytes_uploaded_total": ("counter", "Image bytes uploaded to the storage backend."),
+    "upload_failures_total": ("counter", "Images whose upload to the storage backend failed."),
+    "images_invalid_total": ("counter", "Downloaded images failing structural validation."),
+    "images_revalidated_total": ("counter", "Refresh-mode revalidations by result."),
+    "download_bytes_per_second": ("gauge", "Download throughput over time spent downloading."),
+    "transfer_bytes_per_second": ("gauge", "Bytes transferred per second over the last 10 seconds."),
+    "bandwidth_limit_bytes_per_second": ("gauge", "Bandwidth cap in force (0 = unlimited)."),
+    "process_resident_bytes": ("gauge", "Resident memory of the Python process and the browser side."),
+    "python_traced_bytes": ("gauge", "Python heap traced by tracemalloc."),
+    "open_file_descriptors": ("gauge", "File descriptors open in the spider process."),
+    "playwright_objects": ("gauge", "Live Playwright objects by class."),
+    "run_start_timestamp_seconds": ("gauge", "Unix time the run started."),
+    "last_update_timestamp_seconds": ("gauge", "Unix time the metrics were last written."),
+}
+
+# Histogram bucket upper bounds in seconds
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+
+class Metrics:
+    """
+    Run telemetry: counters, gauges and per-phase latency histograms.
+
+    Events are appended as JSON lines to log_path and the current values can be
+    written in Prometheus text format to textfile_path for node_exporter's
+    textfile collector. Both paths are optional; values are always kept in memory
+    for the run summary.
+    """
+
+    def __init__(self):
+        self.log_path = None
+        self.textfile_path = None
+        self.counters = {}  # (name, labels) -> value
+        self.gauges = {}  # (name, labels) -> value
+        self.histograms = {}  # phase -> {"buckets": [...], "sum": float, "count": int}
+        self.lock = threading.Lock()
+        self.log_fp = None
+        self.set_gauge("run_start_timestamp_seconds", time.time())
+
+    def inc(self, name: str, value: float = 1, **labels):
+        """Increment a counter."""
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def set_gauge(self, name: str, value: float, **labels):
+        """Set a gauge to an absolute value."""
+        with self.lock:
+            self.gauges[(name, tuple(sorted(labels.items())))] = value
+
+    def get(self, name: str, **labels) -> float:
+        """Current value of a counter (0 if never incremented)."""
+        return self.counters.get((name, tuple(sorted(labels.items()))), 0)
+
+    def observe(self, phase: str, seconds: float):
+        """Record a phase duration in its latency histogram."""
+        with self.lock:
+            hist = self.histograms.setdefault(
+                phase, {"buckets": [0] * len(LATENCY_BUCKETS), "sum": 0.0, "count": 0}
+            )
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if seconds <= bound:
+                    hist["buckets"][i] += 1
+            hist["sum"] += seconds
+            hist["count"] += 1
+
+    @contextmanager
+    def phase(self, name: str, **fields):
+        """Time a block as one invocation of a phase and log it."""
+        start = time.monotonic()
+        outcome = "ok"
+        try:
+            yield
+        except BaseException:
+            outcome = "error"
+            raise
+        finally:
+            duration = time.monotonic() - start
+            self.observe(name, duration)
+            self.inc("phase_calls_total", phase=name, outcome=outcome)
+            self.log("phase", phase=name, duration=round(duration, 4), outcome=outcome, **fields)
+
+    def log(self, event: str, **fields):
+        """Append a structured JSON log line (no-op without a log path)."""
+        if not self.log_path:
+            return
+        record = {"ts": round(time.time(), 3), "event": event, **fields}
+        try:
+            with self.lock:
+                if self.log_fp is None:
+                    self.log_fp = open(self.log_path, "a", buffering=1)
+                self.log_fp.write(json.dumps(record) + "\n")
+        except Exception as e:
+            print(f"Warning: Could not write metrics log: {e}")
+            self.log_path = None
+
+    def download_rate(self) -> float:
+        """Bytes per second over the time spent downloading (per stream when downloads overlap)."""
+        seconds = sum(
+            self.histograms[phase]["sum"]
+            for phase in ("download_image_via_navigation", "download_image_via_http")
+            if phase in self.histograms
+        )
+        if seconds <= 0:
+            return 0.0
+        return self.get("bytes_downloaded_total") / seconds
+
+    def render_prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        def fmt_labels(labels):
+            if not labels:
+                return ""
+            return "{" + ",".join(f'{k}="{v}"' for k, v in labels) + "}"
+
+        self.set_gauge("download_bytes_per_second", self.download_rate())
+        self.set_gauge("last_update_timestamp_seconds", time.time())
+
+        samples = {}  # name -> list of lines
+        with self.lock:
+            for (name, labels), value in sorted(list(self.counters.items()) + list(self.gauges.items())):
+                samples.setdefault(name, []).append(f"sgspider_{name}{fmt_labels(labels)} {value}")
+
+            for phase, hist in sorted(self.histograms.items()):
+                lines = samples.setdefault("phase_duration_seconds", [])
+                label = f'phase="{phase}"'
+                for bound, count in zip(LATENCY_BUCKETS, hist["buckets"]):
+                    lines.append(f'sgspider_phase_duration_seconds_bucket{{{label},le="{bound}"}} {count}')
+                lines.append(f'sgspider_phase_duration_seconds_bucket{{{label},le="+Inf"}} {hist["count"]}')
+                lines.append(f'sgspider_phase_duration_seconds_sum{{{label}}} {hist["sum"]:.6f}')
+                lines.append(f'sgspider_phase_duration_seconds_count{{{label}}} {hist["count"]}')
+
+        output = []
+        for name in sorted(samples):
+            metric_type, help_text = METRIC_HELP.get(name, ("untyped", name))
+            output.append(f"# HELP sgspider_{name} {help_text}")
+            output.append(f"# TYPE sgspider_{name} {metric_type}")
+            output.extend(samples[name])
+        return "\n".join(output) + "\n"
+
+    def write_textfile(self):
+        """Atomically write the Prometheus textfile (no-op without a path)."""
+        if not self.textfile_path:
+            return
+        path = Path(self.textfile_path)
+        tmp_path = path.with_name(path.name + ".tmp")
+        try:
+            tmp_path.write_text(self.render_prometheus())
+            tmp_path.replace(path)
+        except Exception as e:
+            print(f"Warning: Could not write metrics textfile: {e}")
+
+    def print_summary(self):
+        """Print where the run's time went, per phase."""
+        if not self.histograms:
+            return
+        print("\nTime per phase:")
+        for phase, hist in sorted(self.histograms.items(), key=lambda item: -item[1]["sum"]):
+            mean = hist["sum"] / hist["count"] if hist["count"] else 0
+            print(f"  {phase:<32} {hist['sum']:9.1f}s  {hist['count']:6d} calls  {mean:7.2f}s avg")
+        rate = self.download_rate()
+        if rate:
+            print(f"  Download throughput: {rate / 1024 / 1024:.2f} MB/s")
+
+    def close(self):
+        """Flush the textfile and close the JSON log."""
+        self.write_textfile()
+        with self.lock:
+            if self.log_fp:
+                self.log_fp.close()
+                self.log_fp = None
+
+
+# Profiler span categories and the wall time bucket each is attributed to
+PROFILE_CATEGORIES = {
+    "delay": "intentional delay",
+    "network": "network",
+    "browser": "browser",
+    "local": "local CPU/disk",
+}
+
+
+class Profiler:
+    """
+    Timeline of spans exported in Chrome trace-event format (open in Perfetto).
+
+    Leaf spans carry one of the PROFILE_CATEGORIES; "phase" spans group them
+    per spider phase. Every span is tagged with the current album and phase.
+    Recording is a no-op unless enabled.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.events = []
+        self.start = time.perf_counter()
+        self.tags = threading.local()
+
+    def enable(self):
+        self.enabled = True
+        self.events = []
+        self.start = time.perf_counter()
+
+    def current_tags(self) -> dict:
+        if not hasattr(self.tags, "stack"):
+            self.tags.stack = [{}]
+        return self.tags.stack[-1]
+
+    @contextmanager
+    def tagged(self, **tags):
+        """Tag spans recorded inside the block (e.g. album=..., phase=...)."""
+        if not self.enabled:
+            yield
+            return
+        merged = {**self.current_tags(), **tags}
+        self.tags.stack.append(merged)
+        try:
+            yield
+        finally:
+            self.tags.stack.pop()
+
+    @contextmanager
+    def span(self, name: str, category: str, **args):
+        """Record the block as a complete ("X") trace event."""
+        if not self.enabled:
+            yield
+            return
+        begin = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            self.events.append({
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": (begin - self.start) * 1e6,
+                "dur": (end - begin) * 1e6,
+                "pid": os.getpid(),
+                "tid": threading.get_ident(),
+                "args": {**self.current_tags(), **args},
+            })
+
+    def attribution(self) -> dict:
+        """Seconds of leaf-span time per PROFILE_CATEGORIES bucket."""
+        totals = {label: 0.0 for label in PROFILE_CATEGORIES.values()}
+        for event in self.events:
+            label = PROFILE_CATEGORIES.get(event["cat"])
+            if label:
+                totals[label] += event["dur"] / 1e6
+        return totals
+
+    def export(self, path: str):
+        """Write the trace as Chrome trace-event JSON and print the attribution."""
+        if not self.enabled:
+            return
+        wall = time.perf_counter() - self.start
+        totals = self.attribution()
+        totals["unattributed"] = max(0.0, wall - sum(totals.values()))
+
+        trace = {
+            "traceEvents": self.events,
+            "displayTimeUnit": "ms",
+            "otherData": {"wall_seconds": wall, "attribution_seconds": totals},
+        }
+        try:
+            with open(path, "w") as f:
+                json.dump(trace, f)
+            print(f"\nProfile trace written to {path} ({len(self.events)} spans)")
+        except Exception as e:
+            print(f"Warning: Could not write profile trace: {e}")
+
+        print(f"Wall time attribution ({wall:.1f}s):")
+        for label, seconds in totals.items():
+            share = seconds / wall * 100 if wall else 0
+            print(f"  {label:<20} {seconds:9.1f}s  {share:5.1f}%")
+
+
+def process_rss(pid: int) -> int:
+    """Resident set size of one process in bytes (0 where /proc is unavailable)."""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return 0
+
+
+def process_tree_rss(root_pid: int) -> int:
+    """
+    Sum the resident set size of a process and all its descendants.
+
+    Args:
+        root_pid: PID at the top of the tree
+
+    Returns:
+        Total RSS in bytes (0 where /proc is unavailable)
+    """
+    children = {}
+    try:
+        entries = os.listdir("/proc")
+    except OSError:
+        return 0
+    for entry in entries:
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # The command name may contain spaces; fields resume after the last ')'
+                fields = f.read().rsplit(")", 1)[1].split()
+            children.setdefault(int(fields[1]), []).append(int(entry))
+        except (OSError, IndexError):
+            continue
+
+    total = 0
+    pending = [root_pid]
+    while pending:
+        pid = pending.pop()
+        pending.extend(children.get(pid, []))
+        total += process_rss(pid)
+    return total
+
+
+def open_fd_count() -> int:
+    """Number of file descriptors this process has open (0 where they can't be listed)."""
+    for path in ("/proc/self/fd", "/dev/fd"):
+        try:
+            return len(os.listdir(path))
+        except OSError:
+            continue
+    return 0
+
+
+def playwright_object_counts() -> dict:
+    """
+    Count the Playwright objects alive on the Python side, by class.
+
+    Only objects mirroring something in the driver (pages, frames, requests,
+    responses, handles...) are counted: each pins memory in the driver and
+    often in Chromium until it is disposed or its owner closes.
+
+    Returns:
+        Dict of class name -> live instances
+    """
+    remote = {}  # class -> whether it is a ChannelOwner
+    counts = {}
+    for obj in gc.get_objects():
+        cls = type(obj)
+        if cls not in remote:
+            remote[cls] = cls.__module__.startswith("playwright._impl") and \
+                any(base.__name__ == "ChannelOwner" for base in cls.__mro__)
+        if remote[cls]:
+            counts[cls.__name__] = counts.get(cls.__name__, 0) + 1
+    return counts
+
+
+# Leak report thresholds: net growth below these is noise
+LEAK_MIN_BYTES = 1024 * 1024
+LEAK_MIN_OBJECTS = 2
+
+
+class ResourceMonitor:
+    """
+    Per-album resource samples (--resources) and a report of what keeps growing.
+
+    Each sample records the Python process RSS and traced heap, the RSS of the
+    browser side (the Playwright driver and every Chromium process under this
+    one, spares included), open file descriptors, live Playwright objects by
+    class, and the source lines whose traced allocations grew most since
+    sampling began. Browser and Playwright series are judged per browser
+    generation, since a restart resets them. Sampling is a no-op unless enabled.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.samples = []
+        self.baseline = None  # tracemalloc snapshot allocator growth is measured against
+
+    def enable(self):
+        self.enabled = True
+        self.samples = []
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self.baseline = self.snapshot()
+
+    @staticmethod
+    def snapshot():
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<unknown>"),
+        ))
+
+    def sample(self, album: str, generation: int) -> dict:
+        """
+        Record resource use after an album.
+
+        Args:
+            album: URL of the album just finished
+            generation: Browser restarts so far (browser series reset on each)
+
+        Returns:
+            The sample (empty if not enabled)
+        """
+        if not self.enabled:
+            return {}
+        pid = os.getpid()
+        python_rss = process_rss(pid)
+        growth = self.snapshot().compare_to(self.baseline, "lineno")
+        sample = {
+            "ts": round(time.time(), 3),
+            "album": album,
+            "generation": generation,
+            "python_rss": python_rss,
+            "python_traced": tracemalloc.get_traced_memory()[0],
+            "browser_rss": max(0, process_tree_rss(pid) - python_rss),
+            "open_fds": open_fd_count(),
+            "playwright_objects": playwright_object_counts(),
+            "allocators": {
+                str(stat.traceback[0]): stat.size_diff
+                for stat in growth[:DEFAULT_RESOURCE_TOP_ALLOCATORS] if stat.size_diff > 0
+            },
+        }
+        self.samples.append(sample)
+        return sample
+
+    def series(self) -> list:
+        """
+        Split the samples into the series the leak report judges.
+
+        Returns:
+            List of (stage, name, unit, segments); a segment is a list of values
+            over consecutive albums (one per browser generation for browser-side series)
+        """
+        def whole(values):
+            return [values]
+
+        def per_generation(values):
+            segments = {}
+            for sample, value in zip(self.samples, values):
+                segments.setdefault(sample["generation"], []).append(value)
+            return list(segments.values())
+
+        samples = self.samples
+        result = [
+            ("python", "RSS", "bytes", whole([s["python_rss"] for s in samples])),
+            ("python", "traced heap", "bytes", whole([s["python_traced"] for s in samples])),
+            ("browser", "RSS", "bytes", per_generation([s["browser_rss"] for s in samples])),
+            ("process", "open file descriptors", "objects", whole([s["open_fds"] for s in samples])),
+        ]
+        classes = sorted({name for s in samples for name in s["playwright_objects"]})
+        for name in classes:
+            values = [s["playwright_objects"].get(name, 0) for s in samples]
+            result.append(("playwright", f"{name} objects", "objects", per_generation(values)))
+        # Sites only in the top list of some samples count as no growth elsewhere
+        sites = sorted({site for s in samples for site in s["allocators"]})
+        for site in sites:
+            values = [s["allocators"].get(site, 0) for s in samples]
+            result.append(("allocations", site, "bytes", whole(values)))
+        return result
+
+    @staticmethod
+    def grows(values: list, unit: str) -> bool:
+        """True if values rise in at least half the steps and never fall back meaningfully."""
+        if len(values) < DEFAULT_RESOURCE_MIN_SAMPLES:
+            return False
+        steps = [after - before for before, after in zip(values, values[1:])]
+        # Allocators and RSS wobble a little as pages are freed and reused
+        tolerance = [max(before, 0) * 0.02 if unit == "bytes" else 0 for before in values]
+        if any(step < -slack for step, slack in zip(steps, tolerance)):
+            return False
+        floor = LEAK_MIN_BYTES if unit == "bytes" else LEAK_MIN_OBJECTS
+        return sum(step > 0 for step in steps) * 2 >= len(steps) and values[-1] - values[0] >= floor
+
+    def leaks(self) -> list:
+        """
+        Series growing monotonically over the run (or over most browser generations).
+
+        Returns:
+            List of dicts with stage, name, unit, albums (samples judged) and
+            per_album (mean growth per album over the growing segments)
+        """
+        found = []
+        for stage, name, unit, segments in self.series():
+            judged = [values for values in segments if len(values) >= DEFAULT_RESOURCE_MIN_SAMPLES]
+            growing = [values for values in judged if self.grows(values, unit)]
+            if not judged or len(growing) * 2 <= len(judged):
+                continue
+            albums = sum(len(values) - 1 for values in growing)
+            found.append({
+                "stage": stage,
+                "name": name,
+                "unit": unit,
+                "albums": sum(len(values) for values in judged),
+                "segments": f"{len(growing)}/{len(judged)}",
+                "per_album": sum(values[-1] - values[0] for values in growing) / albums,
+            })
+        return found
+
+    def export(self, path: str, restart_interval: int = 0):
+        """
+        Write the samples and leak report as JSON and print the report.
+
+        Args:
+            path: Output file
+            restart_interval: browser_restart_interval, to estimate browser growth between restarts
+        """
+        if not self.enabled or not self.samples:
+            return
+        leaks = self.leaks()
+        try:
+            with open(path, "w") as f:
+                json.dump({"samples": self.samples, "leaks": leaks}, f, indent=1)
+            print(f"\nResource samples written to {path} ({len(self.samples)} albums)")
+        except Exception as e:
+            print(f"Warning: Could not write resource samples: {e}")
+
+        def fmt(value, unit):
+            return f"{value / 1024 / 1024:.1f} MB" if unit == "bytes" else f"{value:.1f}"
+
+        first, last = self.samples[0], self.samples[-1]
+        peak = max(self.samples, key=lambda s: s["python_rss"] + s["browser_rss"])
+        print("Resource use (first album -> last album, peak):")
+        for name, key, unit in (("Python RSS", "python_rss", "bytes"), ("Python traced heap", "python_traced", "bytes"),
+                                ("Browser RSS", "browser_rss", "bytes"), ("Open file descriptors", "open_fds", "objects")):
+            print(f"  {name:<24} {fmt(first[key], unit):>10} -> {fmt(last[key], unit):>10}  "
+                  f"(peak {fmt(max(s[key] for s in self.samples), unit)})")
+        print(f"  Peak total RSS {fmt(peak['python_rss'] + peak['browser_rss'], 'bytes')} after {peak['album']}")
+
+        if not leaks:
+            print("No steady growth detected.")
+            return
+        print("Steady growth (possible leaks):")
+        for leak in leaks:
+            line = (f"  {leak['stage']:<12} {leak['name']:<40} +{fmt(leak['per_album'], leak['unit'])}/album"
+                    f"  ({leak['segments']} segments, {leak['albums']} albums)")
+            if leak["stage"] in ("browser", "playwright") and restart_interval:
+                line += f"; ~{fmt(leak['per_album'] * restart_interval, leak['unit'])} per restart interval"
+            print(line)
+
+
+def instrumented(phase: str):
+    """Decorator recording each call of an SGSpider method as a metrics phase."""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with self.metrics.phase(phase), self.profiler.span(phase, "phase"), self.profiler.tagged(phase=phase):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def fake_jpeg(seed: str, size: int) -> bytes:
+    """
+    Build a structurally valid JPEG of exactly `size` bytes.
+
+    The body is SOI, a JFIF APP0 segment, comment segments filled with bytes
+    derived from the seed (so every image hashes differently), and EOI.
+
+    Args:
+        seed: Value the filler bytes are derived from
+        size: Total size in bytes (minimum 24)
+
+    Returns:
+        The image bytes
+    """
+    header = b"\xff\xd8" + b"\xff\xe0\x00\x10JFIF\x00\x01\x01\x00\x00\x01\x00\x01\x00\x00"
+    trailer = b"\xff\xd9"
+    remaining = max(0, size - len(header) - len(trailer))
+
+    digest = hashlib.sha256(seed.encode()).digest()
+    segments = []
+    while remaining > 4:
+        length = min(remaining - 2, 65535)  # Segment length includes its 2 length bytes
+        filler = (digest * (length // len(digest) + 1))[:length - 2]
+        segments.append(b"\xff\xfe" + length.to_bytes(2, "big") + filler)
+        remaining -= length + 2
+    # Pad any leftover with fill bytes (0xFF is legal between markers)
+    segments.append(b"\xff" * remaining)
+
+    return header + b"".join(segments) + trailer
+
+
+class SyntheticResponse:
+    """Stand-in for a Playwright APIResponse serving a synthetic image in HAR replay mode.
+
+    context.request bypasses context routes, so replayed downloads never reach route_from_har.
+    """
+
+    def __init__(self, url: str):
+        self.url = url
+        self.status = 200
+        self.headers = {"content-type": "image/jpeg"}
+        self._body = fake_jpeg(urlparse(url).path, DEFAULT_SYNTHETIC_IMAGE_SIZE)
+
+    def body(self) -> bytes:
+        return self._body
+
+    def dispose(self):
+        pass
 
 
 class SGSpider:
@@ -38,10 +2325,15 @@ class SGSpider:
         self.context = None
         self.page = None
         self.credentials = None
-        self.base_url = "https://www.suicidegirls.com"
-        self.download_dir = Path("suicidegirls").absolute()
+        self.account = "main"  # Config section holding this spider's username/password
+        self.config_file = "sgspider.ini"
+        self.base_url = DEFAULT_BASE_URL
+        self.download_dir = Path(DEFAULT_DOWNLOAD_DIR).absolute()
         self.placeholder_hash = None  # Hash of the unauthenticated placeholder image
         self.state_file = Path(__file__).parent / ".sgspider.state.json"
+        self.seen_file = Path(__file__).parent / ".sgspider.seen.json"  # Watch mode history
+        self.feed_file = Path(__file__).parent / ".sgspider.feed.json"  # Feed crawl checkpoint
+        self.image_index_file = Path(__file__).parent / ".sgspider.images.sqlite3"  # Per-image validators
 
         # Settings loaded from config (with defaults)
         self.headless = DEFAULT_HEADLESS
@@ -51,15 +2343,97 @@ class SGSpider:
         self.page_load_timeout = DEFAULT_PAGE_LOAD_TIMEOUT
         self.max_album_pages = DEFAULT_MAX_ALBUM_PAGES
         self.browser_restart_interval = DEFAULT_BROWSER_RESTART_INTERVAL
+        self.signed_url_margin = DEFAULT_SIGNED_URL_MARGIN
+        self.watch_interval = DEFAULT_WATCH_INTERVAL
+        self.watch_jitter = DEFAULT_WATCH_JITTER
+        self.watch_max_pages = DEFAULT_WATCH_MAX_PAGES
+        self.source_pages = DEFAULT_SOURCE_PAGES
+        self.following_path = DEFAULT_FOLLOWING_PATH
+        self.download_workers = DEFAULT_DOWNLOAD_WORKERS
+        self.sessions = ["main"]  # Credential sections of the session pool
+        self.contexts_per_account = DEFAULT_CONTEXTS_PER_ACCOUNT
+        self.refresh_concurrency = DEFAULT_REFRESH_CONCURRENCY
+        self.refresh_min_age = DEFAULT_REFRESH_MIN_AGE
+        self.delay_scale = DEFAULT_DELAY_SCALE
+
+        # Bandwidth cap (bandwidth_limit/bandwidth_schedule) and per-host request
+        # limits (page_host_concurrency/image_host_concurrency/host_concurrency)
+        # applied to every request; replaceable to share them between spiders
+        self.bandwidth = BandwidthLimiter()
+        self.hosts = HostLimiter()
+
+        # Set by SIGTERM/SIGINT in watch mode to stop after the current album
+        self.stop_event = threading.Event()
+
+        # Counters, phase timings and exporters
+        self.metrics = Metrics()
+
+        # Timeline profiling (--profile); the trace is written to profile_path
+        self.profiler = Profiler()
+        self.profile_path = None
+
+        # Per-album resource sampling (--resources); samples and the leak report
+        # are written to resources_path
+        self.resources = ResourceMonitor()
+        self.resources_path = None
+
+        # Optional content-addressed storage (content_store setting)
+        self.content_store = None
+
+        # "archive" packs each completed album into <album>.tar (storage_mode setting)
+        self.storage_mode = DEFAULT_STORAGE_MODE
+
+        # Destination for downloaded images (storage setting), created by load_credentials
+        self.storage = None
+
+        # Background structural checks (validate_images setting); keys that failed
+        # are kept in invalid_images and the run state until re-fetched
+        self.validator = None
+        self.invalid_images = set()
+
+        # ETag/Last-Modified/size of every downloaded image, for refresh mode
+        self.image_index = None
 
         # Playwright instance reference (needed for browser restarts)
         self.playwright = None
 
-    def load_credentials(self) -> dict:
-        """Load credentials and settings from config file."""
-        print("Reading configuration...")
+        # This session's own browser restarts; pool members share the metrics
+        # counter, so generation tracking must not read that
+        self.browser_restarts = 0
+
+        # Launch profile (launch_profile/browser_path settings), the Chromium
+        # process of an attached browser and the pre-warmed spare (spare_browser)
+        self.launch_profile = DEFAULT_LAUNCH_PROFILE
+        self.browser_path = None
+        self.spare_browser = DEFAULT_SPARE_BROWSER
+        self.browser_process = None
+        self.spare = None
+
+        # Carry cookies and local storage across browser restarts (restart_keep_session setting)
+        self.restart_keep_session = DEFAULT_RESTART_KEEP_SESSION
+
+        # Targeted crawl: model names and/or the member's followed models instead
+        # of the site feed (set from the command line)
+        self.models = []
+        self.following = False
+
+        # HAR capture/replay of feed and album navigations (set from the command line)
+        self.record_har = None
+        self.replay_har = None
+
+    def load_settings(self) -> configparser.ConfigParser:
+        """
+        Read the config file and apply its settings, without creating anything.
+
+        Browser-free commands (plan, verify, pack) use this on its own; storage,
+        the content store, validation and the image index are only set up by
+        load_credentials().
+
+        Returns:
+            Parsed configuration
+        """
         config = configparser.ConfigParser(interpolation=None)
-        config.read("sgspider.ini")
+        config.read(self.config_file)
         self.credentials = config
 
         # Load settings if present
@@ -72,20 +2446,149 @@ class SGSpider:
             self.page_load_timeout = settings.getint("page_load_timeout", self.page_load_timeout)
             self.max_album_pages = settings.getint("max_album_pages", self.max_album_pages)
             self.browser_restart_interval = settings.getint("browser_restart_interval", self.browser_restart_interval)
+            self.signed_url_margin = settings.getint("signed_url_margin", self.signed_url_margin)
+            self.watch_interval = settings.getint("watch_interval", self.watch_interval)
+            self.watch_jitter = settings.getfloat("watch_jitter", self.watch_jitter)
+            self.watch_max_pages = settings.getint("watch_max_pages", self.watch_max_pages)
+            self.source_pages = max(1, settings.getint("source_pages", self.source_pages))
+            self.following_path = settings.get("following_path", self.following_path)
+            self.download_workers = max(0, settings.getint("download_workers", self.download_workers))
+            self.sessions = [name.strip() for name in settings.get("sessions", "main").split(",") if name.strip()]
+            self.contexts_per_account = max(1, settings.getint("contexts_per_account", self.contexts_per_account))
+            self.refresh_concurrency = max(1, settings.getint("refresh_concurrency", self.refresh_concurrency))
+            self.refresh_min_age = settings.getfloat("refresh_min_age", self.refresh_min_age)
+            self.delay_scale = settings.getfloat("delay_scale", self.delay_scale)
+            self.base_url = settings.get("base_url", self.base_url).rstrip("/")
+            self.download_dir = Path(settings.get("download_dir", str(self.download_dir))).absolute()
+            self.metrics.log_path = settings.get("metrics_log", "") or None
+            self.metrics.textfile_path = settings.get("metrics_textfile", "") or None
+
+            self.storage_mode = settings.get("storage_mode", self.storage_mode)
+            self.launch_profile = settings.get("launch_profile", self.launch_profile)
+            if self.launch_profile not in ("full", "headless-shell"):
+                raise ValueError(f"Unknown launch_profile: {self.launch_profile}")
+            self.browser_path = settings.get("browser_path", "") or None
+            self.spare_browser = settings.getboolean("spare_browser", self.spare_browser)
+            self.restart_keep_session = settings.getboolean("restart_keep_session", self.restart_keep_session)
+
+            self.bandwidth.default_rate = parse_rate(settings.get("bandwidth_limit", DEFAULT_BANDWIDTH_LIMIT))
+            self.bandwidth.schedule = BandwidthLimiter.parse_schedule(settings.get("bandwidth_schedule", ""))
+            self.hosts.limits = {
+                "page": settings.getint("page_host_concurrency", DEFAULT_PAGE_HOST_CONCURRENCY),
+                "image": settings.getint("image_host_concurrency", DEFAULT_IMAGE_HOST_CONCURRENCY),
+            }
+            self.hosts.overrides = HostLimiter.parse_overrides(settings.get("host_concurrency", ""))
+
+        return config
+
+    def load_credentials(self) -> configparser.ConfigParser:
+        """Load credentials and settings from config file and set up storage."""
+        print("Reading configuration...")
+        config = self.load_settings()
+
+        content_store = config.get("settings", "content_store", fallback="")
+        if content_store and not self.content_store:
+            self.content_store = ContentStore(
+                Path(content_store).absolute(),
+                config.get("settings", "content_store_link", fallback=DEFAULT_CONTENT_STORE_LINK),
+            )
+
+        if not self.storage:
+            self.storage = self.create_storage(config)
+
+        if config.getboolean("settings", "validate_images", fallback=DEFAULT_VALIDATE_IMAGES) and not self.validator:
+            self.validator = ImageValidator(
+                config.getint("settings", "validate_workers", fallback=DEFAULT_VALIDATE_WORKERS)
+            )
+
+        if not self.image_index:
+            self.image_index = ImageIndex(self.image_index_file)
 
         print("Configuration loaded.")
         return config
 
+    def create_storage(self, config: configparser.ConfigParser) -> StorageSink:
+        """
+        Create the storage backend selected by the storage setting.
+
+        Args:
+            config: Parsed configuration; s3 reads its options from the [s3] section
+
+        Returns:
+            StorageSink instance
+        """
+        backend = config.get("settings", "storage", fallback=DEFAULT_STORAGE)
+        if backend == "local":
+            return LocalStorage(self)
+        if backend != "s3":
+            raise ValueError(f"Unknown storage backend: {backend}")
+
+        if not config.has_section("s3"):
+            raise ValueError("storage = s3 requires an [s3] section")
+        s3 = config["s3"]
+        storage = S3Storage(
+            self,
+            endpoint=s3.get("endpoint", f"https://s3.{s3.get('region', DEFAULT_S3_REGION)}.amazonaws.com"),
+            bucket=s3["bucket"],
+            prefix=s3.get("prefix", ""),
+            region=s3.get("region", DEFAULT_S3_REGION),
+            access_key=s3.get("access_key", os.environ.get("AWS_ACCESS_KEY_ID", "")),
+            secret_key=s3.get("secret_key", os.environ.get("AWS_SECRET_ACCESS_KEY", "")),
+            part_size=s3.getint("part_size", DEFAULT_S3_PART_SIZE),
+            concurrency=s3.getint("concurrency", DEFAULT_S3_CONCURRENCY),
+            max_buffer=s3.getint("max_buffer", DEFAULT_S3_MAX_BUFFER),
+        )
+        print(f"Storing images in {storage.location('')}")
+        return storage
+
+    def navigate(self, url: str, page=None):
+        """
+        Navigate a page (default: the main page) to a URL; profiled as a browser navigation.
+
+        Holds a page slot of the host limiter for the navigation, and counts the
+        document's bytes against the bandwidth cap.
+        """
+        with self.profiler.span("navigate", "browser", url=url), self.hosts.slot(url, "page"):
+            response = (page or self.page).goto(url, wait_until="domcontentloaded")
+        if response and not self.replay_har:
+            try:
+                self.bandwidth.consume(response.request.sizes()["responseBodySize"])
+            except Exception:
+                pass
+        return response
+
+    def evaluate(self, script: str, page=None):
+        """Evaluate JavaScript in a page (default: the main page); profiled as browser time."""
+        with self.profiler.span("evaluate", "browser"):
+            return (page or self.page).evaluate(script)
+
+    def page_content(self, page=None) -> str:
+        """Return a page's HTML (default: the main page); profiled as browser time."""
+        with self.profiler.span("content", "browser"):
+            return (page or self.page).content()
+
+    def site_domain(self) -> str:
+        """Domain of base_url without a leading "www.", used to recognize site links."""
+        host = urlparse(self.base_url).netloc
+        return host[4:] if host.startswith("www.") else host
+
+    def sleep(self, seconds: float, reason: str = "delay"):
+        """Sleep deliberately; profiled as intentional delay."""
+        with self.profiler.span(reason, "delay"):
+            time.sleep(seconds)
+
     def random_delay(self, min_sec: float = 1.0, max_sec: float = 3.0):
         """Sleep for a random duration to appear more human-like."""
-        time.sleep(random.uniform(min_sec, max_sec))
+        self.sleep(random.uniform(min_sec, max_sec) * self.delay_scale, "random_delay")
 
     def human_type(self, element, text: str):
         """Type text with human-like delays."""
         for char in text:
-            element.type(char, delay=random.uniform(100, 400))
+            # Keystroke delays dominate, so typing counts as intentional delay
+            with self.profiler.span("human_type", "delay"):
+                element.type(char, delay=random.uniform(100, 400) * self.delay_scale)
             if random.random() < 0.1:
-                time.sleep(random.uniform(0.5, 1.5))
+                self.sleep(random.uniform(0.5, 1.5) * self.delay_scale, "human_type")
 
     def human_click(self, element):
         """Click an element with human-like behavior."""
@@ -94,9 +2597,9 @@ class SGSpider:
             if bbox:
                 offset_x = random.uniform(0.2, 0.8) * bbox["width"]
                 offset_y = random.uniform(0.2, 0.8) * bbox["height"]
-                element.click(position={"x": offset_x, "y": offset_y}, delay=random.uniform(100, 300))
+                element.click(position={"x": offset_x, "y": offset_y}, delay=random.uniform(100, 300) * self.delay_scale)
             else:
-                element.click(delay=random.uniform(100, 300))
+                element.click(delay=random.uniform(100, 300) * self.delay_scale)
         except Exception:
             element.click()
 
@@ -109,7 +2612,7 @@ class SGSpider:
                     x = random.randint(100, viewport["width"] - 100)
                     y = random.randint(100, viewport["height"] - 100)
                     self.page.mouse.move(x, y)
-                    time.sleep(random.uniform(0.2, 0.5))
+                    self.sleep(random.uniform(0.2, 0.5) * self.delay_scale, "mouse_movement")
         except Exception:
             pass
 
@@ -124,6 +2627,9 @@ class SGSpider:
 
         Returns:
             Result of the operation, or None if all retries failed
+
+        Raises:
+            NonRetryableError: Propagated immediately without further attempts
         """
         if max_retries is None:
             max_retries = self.max_retries
@@ -133,70 +2639,71 @@ class SGSpider:
         for attempt in range(max_retries):
             try:
                 return operation()
+            except NonRetryableError:
+                raise
             except Exception as e:
                 last_error = e
                 delay = self.retry_base_delay * (2 ** attempt) + random.uniform(0, 2)
 
                 if attempt < max_retries - 1:
+                    self.metrics.inc("retries_total")
                     print(f"  Attempt {attempt + 1}/{max_retries} failed for {description}: {e}")
                     print(f"  Retrying in {delay:.1f} seconds...")
-                    time.sleep(delay)
+                    self.sleep(delay, "retry_backoff")
                 else:
                     print(f"  All {max_retries} attempts failed for {description}: {last_error}")
 
         return None
 
-    def start_browser(self, playwright):
-        """Initialize the browser with anti-detection settings."""
+    def context_options(self) -> dict:
+        """Browser context settings shared by every context the spider creates."""
+        return {
+            "viewport": {"width": 1440, "height": 900},
+            "user_agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+        }
+
+    def start_browser(self, playwright, spare: "SpareBrowser" = None, storage_state: dict = None):
+        """
+        Initialize the browser with anti-detection settings.
+
+        Args:
+            playwright: Playwright instance
+            spare: Pre-launched Chromium to attach to instead of launching one
+            storage_state: Cookies and local storage to seed the context with
+        """
         self.playwright = playwright
         print(f"System architecture: {platform.machine()}")
-        print("Launching Playwright Chromium browser...")
-
-        self.browser = playwright.chromium.launch(
-            headless=self.headless,
-            args=[
-                "--no-sandbox",
-                "--disable-dev-shm-usage",
-                # Comprehensive GPU disabling
-                "--disable-gpu",
-                "--disable-gpu-compositing",
-                "--disable-gpu-sandbox",
-                "--disable-software-rasterizer",
-                "--disable-accelerated-2d-canvas",
-                "--disable-accelerated-video-decode",
-                "--disable-accelerated-video-encode",
-                "--disable-webgl",
-                "--disable-webgl2",
-                "--use-gl=swiftshader",
-                "--disable-features=VizDisplayCompositor,UseSkiaRenderer,Vulkan",
-                # Anti-detection
-                "--disable-blink-features=AutomationControlled",
-                "--disable-infobars",
-                "--disable-extensions",
-                "--disable-default-apps",
-                "--no-first-run",
-                "--disable-background-networking",
-                "--disable-background-timer-throttling",
-                "--disable-renderer-backgrounding",
-                "--disable-backgrounding-occluded-windows",
-                "--disable-client-side-phishing-detection",
-                "--disable-crash-reporter",
-                "--disable-oopr-debug-crash-dump",
-                "--no-crash-upload",
-                "--disable-low-res-tiling",
-                "--ignore-certificate-errors",
-                "--ignore-ssl-errors",
-                "--ignore-certificate-errors-spki-list",
-                "--allow-running-insecure-content",
-                "--disable-web-security",
-            ],
-        )
+
+        if spare:
+            print("Attaching to pre-warmed Chromium...")
+            with self.profiler.span("attach_browser", "browser"):
+                self.browser = playwright.chromium.connect_over_cdp(spare.endpoint(self.page_load_timeout / 1000))
+            self.browser_process = spare
+        else:
+            print(f"Launching Playwright Chromium browser ({self.launch_profile})...")
+            with self.profiler.span("launch_browser", "browser"):
+                self.browser = playwright.chromium.launch(
+                    headless=self.headless,
+                    executable_path=self.browser_executable(playwright),
+                    args=BROWSER_ARGS,
+                )
 
         # Create context with realistic settings
-        self.context = self.browser.new_context(
-            viewport={"width": 1440, "height": 900},
-            user_agent="Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-        )
+        context_options = self.context_options()
+        if storage_state:
+            context_options["storage_state"] = storage_state
+        if self.record_har:
+            # Only site pages and XHRs; CDN images are replayed with synthetic bodies
+            site_pattern = re.escape(self.site_domain())
+            context_options.update(
+                record_har_path=self.record_har,
+                record_har_content="embed",
+                record_har_url_filter=re.compile(rf"^(?!.*(cloudfront|amazonaws)).*{site_pattern}"),
+            )
+        self.context = self.browser.new_context(**context_options)
+
+        if self.replay_har:
+            self.setup_har_replay()
 
         # Add anti-detection scripts
         self.context.add_init_script("""
@@ -242,31 +2749,170 @@ class SGSpider:
 
         # Handle popup windows - close any unwanted new tabs/popups
         def handle_popup(popup):
+            if popup.opener() is None and popup.url == "about:blank":
+                return  # Opened by us with context.new_page() (e.g. the feed page)
             popup_url = popup.url
-            # Only allow pages from suicidegirls.com, close all others
-            if "suicidegirls.com" not in popup_url:
+            # Only allow pages from the site itself, close all others
+            if self.site_domain() not in popup_url:
                 print(f"  Closing unwanted popup: {popup_url}")
                 popup.close()
 
         self.context.on("page", handle_popup)
 
         print("Browser initialized successfully.")
+        self.launch_spare()
+
+    def browser_executable(self, playwright) -> str:
+        """
+        Chromium binary for the launch profile.
+
+        Args:
+            playwright: Playwright instance, used to locate its browser builds
+
+        Returns:
+            Path to the binary, or None for Playwright's default Chromium
+        """
+        if self.browser_path:
+            return self.browser_path
+        if self.launch_profile != "headless-shell":
+            return None
+        if not self.headless:
+            print("headless-shell cannot show a window; using full Chromium.")
+            return None
+        path = find_headless_shell(playwright.chromium.executable_path)
+        if not path:
+            print("Warning: chromium-headless-shell is not installed "
+                  "(playwright install chromium-headless-shell); using full Chromium.")
+        return path
+
+    def launch_spare(self):
+        """Start a spare Chromium in the background for the next browser restart (spare_browser setting)."""
+        if not self.spare_browser or self.spare or not self.playwright or not self.browser_restart_interval:
+            return
+        executable = self.browser_executable(self.playwright) or self.playwright.chromium.executable_path
+        try:
+            self.spare = SpareBrowser(executable, BROWSER_ARGS, self.headless)
+        except OSError as e:
+            print(f"Warning: Could not start a spare browser: {e}")
 
     def stop_browser(self):
-        """Clean up browser resources."""
+        """Clean up browser resources, including a spare browser."""
+        if self.record_har and self.context:
+            # The HAR is only written when its context closes
+            self.context.close()
+            self.scrub_har(Path(self.record_har))
         if self.browser:
             self.browser.close()
             print("Browser closed.")
+        # An attached browser only disconnects on close(); its process is ours to end
+        for process in (self.browser_process, self.spare):
+            if process:
+                process.close()
+        self.browser_process = None
+        self.spare = None
+
+    def setup_har_replay(self):
+        """Serve navigations from the replay HAR and CDN images from synthetic bodies."""
+        print(f"Replaying recorded session from {self.replay_har}")
+        self.context.route_from_har(self.replay_har, not_found="abort")
+
+        # Registered after route_from_har so it takes precedence for image requests
+        def synthetic_image(route):
+            body = fake_jpeg(urlparse(route.request.url).path, DEFAULT_SYNTHETIC_IMAGE_SIZE)
+            route.fulfill(status=200, content_type="image/jpeg", body=body)
+
+        self.context.route(re.compile(r"cloudfront|amazonaws"), synthetic_image)
+
+    def scrub_har(self, har_path: Path):
+        """
+        Remove credentials, cookies and URL signatures from a recorded HAR.
+
+        Signature parameters are replaced consistently in request URLs and page
+        bodies so replayed pages still match their recorded requests, and
+        Expires= is pushed far into the future so replayed URLs never expire.
+
+        Args:
+            har_path: HAR file written by the recording context
+        """
+        secrets = []
+        if self.credentials and self.credentials.has_section(self.account):
+            secrets = [value for value in (
+                self.credentials[self.account].get("username"),
+                self.credentials[self.account].get("password"),
+            ) if value and len(value) >= 4]  # Shorter values would mangle unrelated text
+
+        param_pattern = re.compile(r"\b(" + "|".join(re.escape(p) for p in HAR_SECRET_PARAMS) + r")=[^&\"'\s<>]+")
+        expires_pattern = re.compile(r"\bExpires=\d+")
+
+        def scrub_text(text):
+            text = param_pattern.sub(r"\1=SCRUBBED", text)
+            text = expires_pattern.sub(f"Expires={HAR_FAR_FUTURE_EXPIRY}", text)
+            for secret in secrets:
+                text = text.replace(secret, "SCRUBBED")
+            return text
 
+        try:
+            with open(har_path, "r") as f:
+                har = json.load(f)
+
+            for entry in har["log"]["entries"]:
+                request = entry["request"]
+                response = entry["response"]
+
+                request["url"] = scrub_text(request["url"])
+                request["cookies"] = []
+                request["headers"] = [h for h in request["headers"] if h["name"].lower() not in HAR_SECRET_HEADERS]
+                request["queryString"] = [
+                    {"name": q["name"], "value": scrub_text(f"{q['name']}={q['value']}").split("=", 1)[1]}
+                    for q in request.get("queryString", [])
+                ]
+                if "postData" in request:
+                    # Login forms: drop the body entirely rather than trying to parse it
+                    request["postData"] = {"mimeType": request["postData"].get("mimeType", ""), "text": ""}
+
+                response["cookies"] = []
+                response["headers"] = [h for h in response["headers"] if h["name"].lower() not in HAR_SECRET_HEADERS]
+                content = response.get("content", {})
+                mime_type = content.get("mimeType", "")
+                if "text" in content and any(t in mime_type for t in ("html", "json", "javascript", "text")):
+                    if content.get("encoding") == "base64":
+                        text = base64.b64decode(content["text"]).decode("utf-8", errors="replace")
+                        content["text"] = base64.b64encode(scrub_text(text).encode()).decode()
+                    else:
+                        content["text"] = scrub_text(content["text"])
+
+            with open(har_path, "w") as f:
+                json.dump(har, f)
+            print(f"Recorded session saved to {har_path} (credentials and tokens scrubbed)")
+        except Exception as e:
+            print(f"Warning: Could not scrub HAR file {har_path}: {e}")
+
+    @instrumented("restart_browser")
     def restart_browser(self) -> bool:
-        """Restart browser to free memory. Preserves login state by re-authenticating.
+        """Restart browser to free memory and log in again.
+
+        With restart_keep_session the old context's cookies and local storage
+        seed the new one instead, so the session usually survives without a
+        login. With a pre-warmed spare
+        (spare_browser setting) the new browser is attached instead of launched
+        and the network stabilization wait is skipped.
 
         Returns:
             True if restart and re-login successful, False otherwise
         """
         print("\n=== Restarting browser to free memory ===")
+        self.metrics.inc("browser_restarts_total")
+        self.browser_restarts += 1
+
+        storage_state = None
+        if self.restart_keep_session and self.context and not self.replay_har:
+            try:
+                storage_state = self.context.storage_state()
+            except Exception as e:
+                print(f"  Could not save session state: {e}")
 
-        # Stop current browser
+        # Stop current browser, keeping the spare for the swap
+        spare, self.spare = self.spare, None
         self.stop_browser()
         self.browser = None
         self.context = None
@@ -277,11 +2923,26 @@ class SGSpider:
 
         # Start fresh browser
         if self.playwright:
-            self.start_browser(self.playwright)
-
-            # Wait for network stack to stabilize after browser restart
-            print("Waiting for network to stabilize...")
-            time.sleep(5)
+            try:
+                self.start_browser(self.playwright, spare=spare, storage_state=storage_state)
+            except Exception as e:
+                if not spare:
+                    raise
+                print(f"  Spare browser unusable ({e}), launching a new one...")
+                spare.close()
+                spare = None
+                self.start_browser(self.playwright, storage_state=storage_state)
+
+            if not spare:
+                # Wait for network stack to stabilize after a cold launch
+                print("Waiting for network to stabilize...")
+                self.sleep(5 * self.delay_scale, "restart_stabilize")
+
+            if storage_state:
+                self.navigate(self.base_url)
+                if self.is_logged_in():
+                    print("Browser restarted; session carried over.")
+                    return True
 
             # Re-login
             if self.login():
@@ -310,14 +2971,13 @@ class SGSpider:
 
         try:
             # Create a fresh context WITHOUT cookies (unauthenticated)
-            fresh_context = self.browser.new_context(
-                viewport={"width": 1440, "height": 900},
-                user_agent="Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-            )
+            fresh_context = self.browser.new_context(**self.context_options())
 
             try:
                 # Download image without authentication
-                response = fresh_context.request.get(sample_image_url, timeout=self.download_timeout)
+                with self.profiler.span("request", "network", url=sample_image_url), \
+                        self.hosts.slot(sample_image_url, "image"):
+                    response = fresh_context.request.get(sample_image_url, timeout=self.download_timeout)
 
                 if response.status != 200:
                     print(f"  Failed to download: HTTP {response.status}")
@@ -339,12 +2999,39 @@ class SGSpider:
             print(f"  Error capturing placeholder hash: {e}")
             return False
 
-    def is_placeholder_image(self, data: bytes) -> bool:
+    def prepare_placeholder_detection(self, album_url: str) -> bool:
+        """
+        Capture the placeholder hash using a sample image from an album.
+
+        Args:
+            album_url: URL of an album to take the sample image from
+
+        Returns:
+            True if placeholder detection is active
+        """
+        print("\n=== Getting Sample Image for Placeholder Detection ===")
+        if self.replay_har:
+            print("Replay mode: placeholder detection disabled.")
+            return False
+
+        sample_images = self.extract_image_urls(album_url)
+
+        if sample_images:
+            # Strip query params to get unauthenticated version for placeholder hash
+            sample_url = sample_images[0].split("?")[0]
+            return self.capture_placeholder_hash(sample_url)
+
+        print("Warning: Could not get sample image for placeholder detection.")
+        print("Placeholder detection will be disabled.")
+        return False
+
+    def is_placeholder_image(self, data: bytes, digest: str = None) -> bool:
         """
         Check if the downloaded data matches the placeholder image.
 
         Args:
             data: Image data to check
+            digest: SHA-256 hex digest of data, if already computed
 
         Returns:
             True if this is a placeholder image (authentication failure)
@@ -352,9 +3039,46 @@ class SGSpider:
         if not self.placeholder_hash:
             return False
 
-        image_hash = hashlib.sha256(data).hexdigest()
-        return image_hash == self.placeholder_hash
+        if digest is None:
+            with self.profiler.span("hash", "local"):
+                digest = hashlib.sha256(data).hexdigest()
+        return digest == self.placeholder_hash
+
+    def is_image_header(self, header: bytes) -> bool:
+        """Check the first bytes of a file for valid image format magic bytes."""
+        return (
+            header[0:2] == b'\xff\xd8' or                    # JPEG
+            header[0:4] == b'\x89PNG' or                     # PNG
+            header[0:6] in (b'GIF87a', b'GIF89a') or         # GIF
+            (header[0:4] == b'RIFF' and header[8:12] == b'WEBP') or  # WebP
+            header[0:2] == b'BM'                             # BMP
+        )
+
+    @instrumented("is_valid_existing_file")
+    def is_valid_archived_file(self, archive: AlbumArchive, name: str) -> bool:
+        """
+        Check if an archived image is valid, using the side index and an mmap'd header.
+
+        Args:
+            archive: The album's archive
+            name: Member file name
+
+        Returns:
+            True if the member is valid, False if it should be re-downloaded
+        """
+        with self.profiler.span("validate_archived", "local"):
+            try:
+                entry = archive.index[name]
+                if entry["size"] < 10000:
+                    return False
+                if self.placeholder_hash and entry.get("sha256") == self.placeholder_hash:
+                    return False
+                with archive.open_member(name) as view:
+                    return self.is_image_header(bytes(view[:16]))
+            except Exception:
+                return False
 
+    @instrumented("is_valid_existing_file")
     def is_valid_existing_file(self, file_path: Path) -> bool:
         """
         Check if an existing file is valid (not corrupted or placeholder).
@@ -365,48 +3089,40 @@ class SGSpider:
         Returns:
             True if file is valid, False if it should be re-downloaded
         """
-        try:
-            if not file_path.exists():
-                return False
-
-            file_size = file_path.stat().st_size
-
-            # Check minimum file size - use 10KB to catch truly broken/empty downloads
-            # Note: Valid images can be as small as 15KB; placeholder detection handles auth failures
-            if file_size < 10000:
-                return False
+        with self.profiler.span("validate_file", "local"):
+            try:
+                if not file_path.exists():
+                    return False
 
-            # Read file header to check if it's a valid image
-            with open(file_path, "rb") as f:
-                header = f.read(16)
+                file_size = file_path.stat().st_size
 
-                if len(header) < 4:
+                # Check minimum file size - use 10KB to catch truly broken/empty downloads
+                # Note: Valid images can be as small as 15KB; placeholder detection handles auth failures
+                if file_size < 10000:
                     return False
 
-                # Check for valid image format magic bytes
-                is_valid_format = (
-                    header[0:2] == b'\xff\xd8' or                    # JPEG
-                    header[0:4] == b'\x89PNG' or                     # PNG
-                    header[0:6] in (b'GIF87a', b'GIF89a') or         # GIF
-                    (header[0:4] == b'RIFF' and header[8:12] == b'WEBP') or  # WebP
-                    header[0:2] == b'BM'                             # BMP
-                )
+                # Read file header to check if it's a valid image
+                with open(file_path, "rb") as f:
+                    header = f.read(16)
 
-                if not is_valid_format:
-                    return False
+                    if len(header) < 4:
+                        return False
 
-                # Check for placeholder by reading full file and hashing
-                if self.placeholder_hash:
-                    f.seek(0)
-                    data = f.read()
-                    file_hash = hashlib.sha256(data).hexdigest()
-                    if file_hash == self.placeholder_hash:
+                    if not self.is_image_header(header):
                         return False
 
-            return True
+                    # Check for placeholder by reading full file and hashing
+                    if self.placeholder_hash:
+                        f.seek(0)
+                        data = f.read()
+                        file_hash = hashlib.sha256(data).hexdigest()
+                        if file_hash == self.placeholder_hash:
+                            return False
 
-        except Exception:
-            return False
+                return True
+
+            except Exception:
+                return False
 
     def accept_cookies(self):
         """Accept cookie consent if present."""
@@ -450,11 +3166,11 @@ class SGSpider:
                     continue
 
             # Fallback: check page content
-            content = self.page.content().lower()
+            content = self.page_content().lower()
             if "logout" in content:
                 return True
             if self.credentials:
-                username = self.credentials["main"]["username"].lower()
+                username = self.credentials[self.account]["username"].lower()
                 if username in content:
                     return True
 
@@ -463,6 +3179,7 @@ class SGSpider:
             print(f"Error checking login status: {e}")
             return False
 
+    @instrumented("login")
     def login(self) -> bool:
         """
         Perform login to the site.
@@ -472,7 +3189,7 @@ class SGSpider:
         """
         def attempt_login():
             print("Navigating to main page...")
-            self.page.goto(self.base_url, wait_until="domcontentloaded")
+            self.navigate(self.base_url)
             self.random_delay(5, 8)
 
             # Check if we're already logged in (e.g., from previous session)
@@ -481,9 +3198,9 @@ class SGSpider:
                 return True
 
             # Simulate reading the page
-            self.page.evaluate("window.scrollTo(0, 200);")
+            self.evaluate("window.scrollTo(0, 200);")
             self.random_delay(2, 4)
-            self.page.evaluate("window.scrollTo(0, 0);")
+            self.evaluate("window.scrollTo(0, 0);")
             self.random_delay(1, 2)
 
             self.accept_cookies()
@@ -537,7 +3254,7 @@ class SGSpider:
             user_field.click()
             self.random_delay(0.3, 0.6)
             user_field.clear()
-            self.human_type(user_field, self.credentials["main"]["username"])
+            self.human_type(user_field, self.credentials[self.account]["username"])
 
             self.random_delay(0.5, 1.5)
             self.random_mouse_movement()
@@ -549,127 +3266,522 @@ class SGSpider:
             pass_field.click()
             self.random_delay(0.3, 0.6)
             pass_field.clear()
-            self.human_type(pass_field, self.credentials["main"]["password"])
+            self.human_type(pass_field, self.credentials[self.account]["password"])
+
+            self.random_delay(1, 2)
+            self.random_mouse_movement()
+
+            # Submit
+            print("Submitting login form...")
+            pass_field.press("Tab")
+            self.random_delay(0.3, 0.8)
+            pass_field.press("Enter")
+
+            # Wait for login to complete
+            self.random_delay(8, 12)
+
+            # Verify login
+            if not self.is_logged_in():
+                raise Exception("Login verification failed")
+
+            return True
+
+        print("\n=== Logging In ===")
+        if self.replay_har:
+            # The recorded login form post is scrubbed, so replay starts from the recorded pages
+            print("Replay mode: skipping login.")
+            return True
+
+        result = self.retry_operation(attempt_login, "login")
+
+        if result:
+            print("Login successful!")
+            return True
+        else:
+            print("Login failed after all retries.")
+            return False
+
+    def ensure_logged_in(self) -> bool:
+        """Check login status and re-login if necessary."""
+        if self.is_logged_in():
+            return True
+
+        print("Session expired, re-authenticating...")
+        return self.login()
+
+    @instrumented("collect_album_urls")
+    def collect_album_urls(self, known: set = None, max_pages: int = None) -> list:
+        """
+        Navigate to the photos page and collect all album URLs.
+
+        Args:
+            known: Album URLs already processed. When given, scrolling stops as soon
+                   as one of them shows up and only newer albums are returned.
+            max_pages: Scroll iteration limit (defaults to self.max_album_pages)
+
+        Returns:
+            List of album URLs
+        """
+        print("\n=== Collecting Album URLs ===")
+
+        album_list = list(self.iter_feed_albums(known=known, max_pages=max_pages))
+
+        if known:
+            print(f"Found {len(album_list)} new albums.", flush=True)
+        else:
+            print(f"Found {len(album_list)} unique albums.", flush=True)
+
+        return album_list
+
+    def iter_feed_albums(self, known: set = None, max_pages: int = None,
+                         checkpoint: bool = False, skip: set = None):
+        """
+        Walk the recent-albums feed on its own page, yielding album URLs as they load.
+
+        The feed advances one load-more/scroll step only when the consumer asks for
+        more albums, so downloads can start on the first page while the crawl
+        continues. A feed page closed underneath the crawl (e.g. by a browser
+        restart) is reopened at the last position.
+
+        With checkpoint set, each step appends its new albums and the feed
+        position (the load-more target and iteration count) to feed_file. An
+        unfinished crawl from the last day is resumed: its harvested albums are
+        yielded first, then the crawl jumps to the saved load-more target, or
+        without one scrolls from the top to the last harvested album before
+        counting iterations again.
+
+        Args:
+            known: Album URLs already processed. When given, crawling stops as soon
+                   as one of them shows up and only newer albums are yielded.
+            max_pages: Scroll iteration limit (defaults to self.max_album_pages)
+            checkpoint: Save the crawl to feed_file and resume from it
+            skip: Album URLs the caller already has, never yielded
+
+        Yields:
+            Album URLs in feed order
+        """
+        if max_pages is None:
+            max_pages = self.max_album_pages
+
+        feed_url = f"{self.base_url}/photos/sg/recent/all/"
+        saved = self.load_feed_checkpoint() if checkpoint else None
+        if checkpoint:
+            self.start_feed_checkpoint(saved)
+        harvested = list(saved["albums"]) if saved else []
+        position = saved["position"] if saved else {}
+        iterations = position.get("iterations", 0)
+        yielded = set(skip or ())
+
+        for url in harvested:
+            if url not in yielded:
+                yielded.add(url)
+                yield url
+        if saved and saved.get("complete"):
+            return
+
+        resume_url = urljoin(feed_url, position["next"]) if position.get("next") else feed_url
+        if saved:
+            print(f"\nResuming feed crawl after {len(harvested)} albums (iteration {iterations})")
+
+        if known:
+            print("Scrolling until previously seen albums appear...")
+        elif max_pages > 0:
+            print(f"Scrolling to load albums (limited to {max_pages} iterations)...")
+        else:
+            print("Scrolling to load albums (this takes a while)...")
+        print("Progress: [", end="", flush=True)
+
+        page = None
+        seek_album = None  # Last harvested album, scrolled back to without counting iterations
+        consecutive_failures = 0
+        max_failures = 5
+        outcome = ""
+        try:
+            while consecutive_failures < max_failures:
+                if page is None or page.is_closed():
+                    page = self.open_feed_page(resume_url)
+                    if page is None:
+                        outcome = " - FAILED TO LOAD"
+                        break
+                    if resume_url == feed_url and harvested:
+                        seek_album = harvested[-1]
+
+                links = self.extract_album_links(page)
+                new_albums = [url for url in links if url not in yielded and not (known and url in known)]
+                harvested.extend(new_albums)
+                yielded.update(new_albums)
+                if seek_album in links:
+                    seek_album = None
+
+                next_target = self.feed_position(page)
+                if next_target:
+                    resume_url = urljoin(feed_url, next_target)
+                if checkpoint:
+                    self.save_feed_checkpoint(new_albums, {"next": next_target, "iterations": iterations})
+
+                yield from new_albums
+
+                # Incremental crawl: stop once the feed reaches albums we already have
+                if known and any(url in known for url in links):
+                    outcome = " - CAUGHT UP"
+                    break
+
+                # Check page limit
+                if max_pages > 0 and iterations >= max_pages:
+                    outcome = " - LIMIT REACHED"
+                    break
+
+                if page.is_closed():
+                    continue  # Closed while the consumer worked; reopen at resume_url
+                if not seek_album:
+                    iterations += 1
+
+                if self.advance_feed(page):
+                    consecutive_failures = 0
+                else:
+                    consecutive_failures += 1
+
+                self.random_delay(1, 2)
+
+            print(f"] ({iterations} iterations{outcome})")
+            if checkpoint and outcome != " - FAILED TO LOAD":
+                self.save_feed_checkpoint([], {"next": "", "iterations": iterations}, complete=True)
+        finally:
+            if page is not None and not page.is_closed():
+                page.close()
+
+    def open_feed_page(self, url: str):
+        """
+        Open the feed in a new page of the current context.
+
+        Args:
+            url: Feed URL, either the top of the feed or a saved load-more target
+
+        Returns:
+            The page, or None if it could not be loaded
+        """
+        page = self.context.new_page()
+        page.set_default_timeout(self.page_load_timeout)
+
+        def load_albums_page():
+            self.navigate(url, page)
+            self.random_delay(3, 5)
+
+            if "server error" in self.page_content(page).lower():
+                raise Exception("Server error on photos page")
+
+            return True
+
+        if self.retry_operation(load_albums_page, "load photos page"):
+            return page
+        print("Failed to load photos page.")
+        page.close()
+        return None
+
+    def advance_feed(self, page) -> bool:
+        """
+        Load the next batch of feed albums with the load-more button or by scrolling.
+
+        Args:
+            page: Feed page
+
+        Returns:
+            True if more content loaded
+        """
+        try:
+            # Try load-more button first
+            load_more = page.locator("#load-more").first
+            if load_more.is_visible(timeout=1000) and load_more.is_enabled():
+                self.human_click(load_more)
+                print(".", end="", flush=True)
+                self.random_delay(2, 4)
+                return True
+        except Exception:
+            pass
+
+        try:
+            # Try infinite scroll
+            current_height = self.evaluate("document.body.scrollHeight", page)
+            self.evaluate("window.scrollTo(0, document.body.scrollHeight);", page)
+            self.random_delay(2, 3)
+            new_height = self.evaluate("document.body.scrollHeight", page)
+
+            if new_height > current_height:
+                print("s", end="", flush=True)
+                return True
+        except Exception:
+            pass
+        print("x", end="", flush=True)
+        return False
+
+    def iter_model_albums(self, models: list, max_pages: int = None, skip: set = None):
+        """
+        Crawl several models' album listings at once, yielding the merged albums.
 
-            self.random_delay(1, 2)
-            self.random_mouse_movement()
+        Up to source_pages listings are open at a time. Each round clicks
+        load-more (or scrolls) on every open listing before waiting once, so
+        their requests overlap, then yields the albums that appeared. Albums are
+        deduplicated across listings, and links to other models' albums (e.g.
+        recommendations) are ignored.
 
-            # Submit
-            print("Submitting login form...")
-            pass_field.press("Tab")
-            self.random_delay(0.3, 0.8)
-            pass_field.press("Enter")
+        Args:
+            models: Model names, as in /girls/<name>/photos/
+            max_pages: Load-more iteration limit per listing (defaults to self.max_album_pages)
+            skip: Album URLs the caller already has, never yielded
 
-            # Wait for login to complete
-            self.random_delay(8, 12)
+        Yields:
+            Album URLs, newest first within each listing
+        """
+        if max_pages is None:
+            max_pages = self.max_album_pages
 
-            # Verify login
-            if not self.is_logged_in():
-                raise Exception("Login verification failed")
+        pending = list(dict.fromkeys(models))
+        active = []
+        yielded = set(skip or ())
+        print(f"Crawling album listings of {len(pending)} models ({self.source_pages} at a time)...")
 
-            return True
+        try:
+            while pending or active:
+                while pending and len(active) < self.source_pages:
+                    model = pending.pop(0)
+                    page = self.open_feed_page(f"{self.base_url}/girls/{quote(model)}/photos/")
+                    if page is None:
+                        print(f"  Could not load albums of {model}")
+                        continue
+                    active.append({"model": model, "page": page, "links": 0, "stalls": 0, "iterations": 0})
 
-        print("\n=== Logging In ===")
-        result = self.retry_operation(attempt_login, "login")
+                # Harvest every open listing
+                new_albums = []
+                for source in active:
+                    if source["page"].is_closed():
+                        continue
+                    links = [
+                        url for url in self.extract_album_links(source["page"])
+                        if self.parse_album_url(url)[0].lower() == source["model"].lower()
+                    ]
+                    source["stalls"] = 0 if len(links) > source["links"] else source["stalls"] + 1
+                    source["links"] = len(links)
+                    for url in links:
+                        if url not in yielded:
+                            yielded.add(url)
+                            new_albums.append(url)
+
+                yield from new_albums
+
+                # Trigger the next batch on every listing that may have more
+                still_active = []
+                for source in active:
+                    page = source["page"]
+                    if page.is_closed():
+                        # Closed while the consumer worked (browser restart); start it over
+                        pending.insert(0, source["model"])
+                    elif source["stalls"] >= 2 or (max_pages > 0 and source["iterations"] >= max_pages):
+                        print(f"  {source['model']}: {source['links']} albums")
+                        page.close()
+                    else:
+                        source["iterations"] += 1
+                        self.trigger_load_more(page)
+                        still_active.append(source)
+                active = still_active
 
-        if result:
-            print("Login successful!")
-            return True
-        else:
-            print("Login failed after all retries.")
-            return False
+                if active:
+                    self.random_delay(2, 4)
+        finally:
+            for source in active:
+                if not source["page"].is_closed():
+                    source["page"].close()
 
-    def ensure_logged_in(self) -> bool:
-        """Check login status and re-login if necessary."""
-        if self.is_logged_in():
-            return True
+    def trigger_load_more(self, page):
+        """Click the load-more button, or scroll to the bottom, without waiting for the result."""
+        try:
+            load_more = page.locator("#load-more").first
+            if load_more.is_visible(timeout=1000) and load_more.is_enabled():
+                self.human_click(load_more)
+                return
+        except Exception:
+            pass
+        try:
+            self.evaluate("window.scrollTo(0, document.body.scrollHeight);", page)
+        except Exception:
+            pass
 
-        print("Session expired, re-authenticating...")
-        return self.login()
+    def followed_models(self) -> list:
+        """
+        Read the logged-in member's followed models from the following page.
 
-    def collect_album_urls(self) -> list:
+        Returns:
+            Model names in page order
         """
-        Navigate to the photos page and collect all album URLs.
+        username = self.credentials[self.account]["username"]
+        page = self.open_feed_page(self.base_url + self.following_path.format(username=quote(username)))
+        if page is None:
+            print("Could not load the following list.")
+            return []
+
+        try:
+            print("Loading followed models: [", end="", flush=True)
+            for _ in range(100):
+                if not self.advance_feed(page):
+                    break
+            print("]")
+            models = self.extract_model_names(page)
+        finally:
+            page.close()
+
+        print(f"Following {len(models)} models.")
+        return models
+
+    def extract_model_names(self, page=None) -> list:
+        """
+        Extract model names from profile links (/girls/<name>/) on a page.
+
+        Args:
+            page: Page to read (defaults to the main page)
 
         Returns:
-            List of album URLs
+            List of unique model names in page order
         """
-        print("\n=== Collecting Album URLs ===")
+        all_hrefs = self.evaluate("""
+            () => Array.from(document.querySelectorAll('a[href]')).map(a => a.href)
+        """, page)
 
-        def load_albums_page():
-            self.page.goto(f"{self.base_url}/photos/sg/recent/all/", wait_until="domcontentloaded")
-            self.random_delay(3, 5)
+        site_domain = self.site_domain()
+        names = {}  # Ordered set
+        for href in all_hrefs:
+            parsed = urlparse(href or "")
+            if site_domain not in parsed.netloc:
+                continue
+            parts = [p for p in parsed.path.split("/") if p]
+            if len(parts) in (2, 3) and parts[0] == "girls" and parts[-1] in (parts[1], "photos"):
+                names[parts[1]] = None
+        return list(names)
 
-            if "server error" in self.page.content().lower():
-                raise Exception("Server error on photos page")
+    def load_models_file(self, path: str) -> list:
+        """
+        Read model names from a file: one name or profile URL per line, # for comments.
 
-            return True
+        Args:
+            path: File to read
 
-        result = self.retry_operation(load_albums_page, "load photos page")
-        if not result:
-            print("Failed to load photos page.")
-            return []
+        Returns:
+            List of model names
+        """
+        models = []
+        with open(path, "r") as f:
+            for line in f:
+                line = line.split("#", 1)[0].strip()
+                if line:
+                    models.append(self.model_name(line))
+        return models
+
+    def model_name(self, value: str) -> str:
+        """Model name from a name or a /girls/<name>/... URL."""
+        if "/girls/" in value:
+            return value.split("/girls/")[1].split("/")[0]
+        return value.strip("/")
+
+    def feed_position(self, page) -> str:
+        """Target of the feed's load-more control (data-next or href), "" if there is none."""
+        try:
+            return self.evaluate("""
+                () => {
+                    const button = document.querySelector('#load-more');
+                    if (!button) return '';
+                    const target = button.dataset.next || button.getAttribute('href') || '';
+                    return target.startsWith('#') || target.startsWith('javascript:') ? '' : target;
+                }
+            """, page) or ""
+        except Exception:
+            return ""
 
-        # Scroll to load more content
-        if self.max_album_pages > 0:
-            print(f"Scrolling to load albums (limited to {self.max_album_pages} iterations)...")
-        else:
-            print("Scrolling to load albums (this takes a while)...")
-        print("Progress: [", end="", flush=True)
+    def load_feed_checkpoint(self) -> dict:
+        """
+        Load the feed crawl checkpoint if it exists and is less than a day old.
 
-        consecutive_failures = 0
-        max_failures = 5
-        pages_loaded = 0
+        The file holds one JSON record per crawl step; their albums are joined
+        and the last record's position, completion and timestamp win.
 
-        limit_reached = False
-        while consecutive_failures < max_failures:
-            # Check page limit
-            if self.max_album_pages > 0 and pages_loaded >= self.max_album_pages:
-                limit_reached = True
-                break
-            pages_loaded += 1
-            loaded_more = False
+        Returns:
+            Dict with albums, position, complete and timestamp, or None
+        """
+        if not self.feed_file.exists():
+            return None
+        data = {"albums": [], "position": {}, "complete": False, "timestamp": 0}
+        try:
+            with open(self.feed_file, "r") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        break  # Cut short by a kill mid-append
+                    data["albums"].extend(record.get("albums", []))
+                    data["position"] = record.get("position", data["position"])
+                    data["complete"] = record.get("complete", False)
+                    data["timestamp"] = record.get("timestamp", 0)
+        except Exception as e:
+            print(f"Warning: Could not load feed checkpoint: {e}")
+            return None
+        if time.time() - data["timestamp"] > 24 * 3600:
+            print("Found feed checkpoint but it's more than 24 hours old. Crawling from the top.")
+            return None
+        return data
 
-            try:
-                # Try load-more button first
-                load_more = self.page.locator("#load-more").first
-                if load_more.is_visible(timeout=1000) and load_more.is_enabled():
-                    self.human_click(load_more)
-                    print(".", end="", flush=True)
-                    loaded_more = True
-                    consecutive_failures = 0
-                    self.random_delay(2, 4)
-            except Exception:
-                pass
+    def start_feed_checkpoint(self, saved: dict = None):
+        """
+        Begin a crawl's checkpoint, replacing the file atomically.
 
-            if not loaded_more:
-                try:
-                    # Try infinite scroll
-                    current_height = self.page.evaluate("document.body.scrollHeight")
-                    self.page.evaluate("window.scrollTo(0, document.body.scrollHeight);")
-                    self.random_delay(2, 3)
-                    new_height = self.page.evaluate("document.body.scrollHeight")
-
-                    if new_height > current_height:
-                        print("s", end="", flush=True)
-                        consecutive_failures = 0
-                    else:
-                        print("x", end="", flush=True)
-                        consecutive_failures += 1
-                except Exception:
-                    print("x", end="", flush=True)
-                    consecutive_failures += 1
+        Args:
+            saved: Checkpoint being resumed, rewritten as a single record so
+                   later steps never append after a cut-short line
+        """
+        tmp_file = self.feed_file.with_suffix(".tmp")
+        try:
+            with open(tmp_file, "w") as f:
+                if saved:
+                    f.write(json.dumps(saved) + "\n")
+            tmp_file.replace(self.feed_file)
+        except Exception as e:
+            print(f"Warning: Could not save feed checkpoint: {e}")
 
-            self.random_delay(1, 2)
+    def save_feed_checkpoint(self, albums: list, position: dict, complete: bool = False):
+        """
+        Append one crawl step to the feed checkpoint.
 
-        if limit_reached:
-            print(f"] ({pages_loaded} iterations - LIMIT REACHED)")
-        else:
-            print(f"] ({pages_loaded} iterations)")
+        Args:
+            albums: Albums harvested in this step
+            position: Feed position after the step ("next" target, "iterations")
+            complete: True once the crawl has finished
+        """
+        record = {
+            "albums": albums,
+            "position": position,
+            "complete": complete,
+            "timestamp": time.time(),
+        }
+        try:
+            with open(self.feed_file, "a") as f:
+                f.write(json.dumps(record) + "\n")
+        except Exception as e:
+            print(f"Warning: Could not save feed checkpoint: {e}")
+
+    def clear_feed_checkpoint(self):
+        """Remove the feed checkpoint once its albums have been processed."""
+        try:
+            if self.feed_file.exists():
+                self.feed_file.unlink()
+        except Exception as e:
+            print(f"Warning: Could not remove feed checkpoint: {e}")
 
-        # Extract album URLs using JavaScript for speed (much faster than iterating locators)
-        print("Extracting album URLs...", flush=True)
+    def extract_album_links(self, page=None) -> list:
+        """
+        Extract album URLs from the links currently on the page.
+
+        Args:
+            page: Page to read (defaults to the main page)
 
+        Returns:
+            List of unique album URLs in page order
+        """
         sharing_patterns = [
             "twitter.com", "mailto:", "facebook.com", "pinterest.com",
             "reddit.com", "tumblr.com", "instagram.com", "/share?",
@@ -677,16 +3789,15 @@ class SGSpider:
         ]
 
         # Use JavaScript to extract all hrefs at once - much faster than iterating locators
-        all_hrefs = self.page.evaluate("""
+        all_hrefs = self.evaluate("""
             () => {
                 const links = document.querySelectorAll('a[href]');
                 return Array.from(links).map(a => a.href);
             }
-        """)
+        """, page)
 
-        print(f"Found {len(all_hrefs)} total links, filtering...", flush=True)
-
-        album_urls = set()
+        site_domain = self.site_domain()
+        album_urls = {}  # Ordered set
         for href in all_hrefs:
             if not href:
                 continue
@@ -699,18 +3810,16 @@ class SGSpider:
             if any(pattern in href.lower() for pattern in sharing_patterns):
                 continue
 
-            # Must be on suicidegirls.com
-            if "suicidegirls.com" not in href:
+            # Must be on the site itself
+            if site_domain not in href:
                 continue
 
             # Normalize URL
-            href = href.replace("http://", "https://")
-            album_urls.add(href)
-
-        album_list = list(album_urls)
-        print(f"Found {len(album_list)} unique albums.", flush=True)
+            if self.base_url.startswith("https://"):
+                href = href.replace("http://", "https://")
+            album_urls[href] = None
 
-        return album_list
+        return list(album_urls)
 
     def parse_album_url(self, url: str) -> tuple:
         """
@@ -742,6 +3851,79 @@ class SGSpider:
 
         return "unknown", "unknown"
 
+    def parse_url_expiry(self, url: str) -> float:
+        """
+        Parse the expiry time from a signed CDN URL.
+
+        Understands CloudFront canned (Expires=) and custom (Policy=) policies
+        and S3 presigned URLs (SigV2 Expires=, SigV4 X-Amz-Date + X-Amz-Expires).
+
+        Args:
+            url: The image URL including its query string
+
+        Returns:
+            Expiry as a Unix timestamp, or None if the URL carries no expiry
+        """
+        try:
+            query = parse_qs(urlparse(url).query)
+
+            if "Expires" in query:
+                return float(query["Expires"][0])
+
+            if "X-Amz-Date" in query and "X-Amz-Expires" in query:
+                signed_at = datetime.strptime(query["X-Amz-Date"][0], "%Y%m%dT%H%M%SZ")
+                signed_at = signed_at.replace(tzinfo=timezone.utc)
+                return signed_at.timestamp() + int(query["X-Amz-Expires"][0])
+
+            if "Policy" in query:
+                # CloudFront uses a URL-safe base64 variant: '-' for '+', '_' for '=', '~' for '/'
+                encoded = query["Policy"][0].translate(str.maketrans("-_~", "+=/"))
+                policy = json.loads(base64.b64decode(encoded))
+                epochs = [
+                    statement["Condition"]["DateLessThan"]["AWS:EpochTime"]
+                    for statement in policy.get("Statement", [])
+                    if "DateLessThan" in statement.get("Condition", {})
+                ]
+                if epochs:
+                    return float(min(epochs))
+        except Exception:
+            pass
+
+        return None
+
+    def is_url_expired(self, url: str) -> bool:
+        """Check whether a signed URL has expired or will within the safety margin."""
+        expiry = self.parse_url_expiry(url)
+        if expiry is None:
+            return False
+        return time.time() >= expiry - self.signed_url_margin
+
+    def sort_by_expiry(self, image_urls: list) -> list:
+        """Order image URLs so the soonest-expiring are downloaded first.
+
+        URLs without an expiry keep their relative order and go last.
+        """
+        def expiry_key(url):
+            expiry = self.parse_url_expiry(url)
+            return expiry if expiry is not None else float("inf")
+
+        return sorted(image_urls, key=expiry_key)
+
+    def refresh_image_urls(self, album_url: str) -> dict:
+        """
+        Re-extract an album's image links after a signed URL expired.
+
+        Args:
+            album_url: URL of the album page
+
+        Returns:
+            Dict mapping each image's URL path (without query) to its fresh signed URL
+        """
+        print("    Signed URLs expired, re-extracting album links...")
+        self.metrics.inc("signed_url_refreshes_total")
+        return {urlparse(url).path: url for url in self.extract_image_urls(album_url)}
+
+    @instrumented("extract_image_urls")
     def extract_image_urls(self, album_url: str) -> list:
         """
         Navigate to an album page and extract all image URLs.
@@ -753,7 +3935,7 @@ class SGSpider:
             List of image URLs
         """
         def load_and_extract():
-            self.page.goto(album_url, wait_until="domcontentloaded")
+            self.navigate(album_url)
             self.random_delay(2, 4)
 
             # Check for auth issues
@@ -765,19 +3947,20 @@ class SGSpider:
 
             # Method 1: Photo containers with CDN links
             # IMPORTANT: Keep full URL including query params - they may contain auth tokens
-            containers = self.page.locator(
-                "li.photo-container a[href*='cloudfront'], li.photo-container a[href*='amazonaws']"
-            ).all()
+            with self.profiler.span("photo_container_links", "browser"):
+                containers = self.page.locator(
+                    "li.photo-container a[href*='cloudfront'], li.photo-container a[href*='amazonaws']"
+                ).all()
 
-            for container in containers:
-                try:
-                    href = container.get_attribute("href", timeout=2000)
-                    if href:
-                        # Keep full URL with query params for auth tokens
-                        if href not in image_urls:
-                            image_urls.append(href)
-                except Exception:
-                    continue
+                for container in containers:
+                    try:
+                        href = container.get_attribute("href", timeout=2000)
+                        if href:
+                            # Keep full URL with query params for auth tokens
+                            if href not in image_urls:
+                                image_urls.append(href)
+                    except Exception:
+                        continue
 
             # Method 2: Fallback - any CDN links that look like images
             if not image_urls:
@@ -805,123 +3988,613 @@ class SGSpider:
         result = self.retry_operation(load_and_extract, f"extract images from {album_url}")
         return result if result else []
 
-    def download_image_via_navigation(self, url: str, save_path: Path) -> tuple:
+    def is_response_expired(self, url: str, read_body) -> bool:
+        """Check whether an error response (body returned by read_body()) was caused by an expired signature."""
+        expiry = self.parse_url_expiry(url)
+        if expiry is not None and time.time() >= expiry - self.signed_url_margin:
+            return True
+        try:
+            # S3 answers "Request has expired", CloudFront "Access denied" with an expiry hint
+            return b"expired" in read_body()[:2048].lower()
+        except Exception:
+            return False
+
+    def store_image(self, url: str, key: str, album_url: str, body: bytes, headers: dict):
+        """
+        Check a downloaded image body and hand it to storage.
+
+        Args:
+            url: URL the body was downloaded from
+            key: Storage key ("<girl>/<album>/<filename>")
+            album_url: Album the image belongs to
+            body: Response body
+            headers: Response headers (lowercase names), recorded in the image index
+
+        Returns:
+            ImageSaved, or ImageFailed if the body is the placeholder image
+
+        Raises:
+            Exception: If the body is too small to be an image (worth retrying)
+        """
+        with self.profiler.span("hash", "local"):
+            digest = hashlib.sha256(body).hexdigest()
+
+        # Check if this is the placeholder image (auth failure)
+        if self.is_placeholder_image(body, digest):
+            # Got placeholder - auth issue
+            return ImageFailed(album_url, key, "got placeholder image", placeholder=True)
+
+        if len(body) < 1000:
+            raise Exception("Response too small, likely an error page")
+
+        with self.profiler.span("write", "local", bytes=len(body)):
+            self.storage.write(key, body, digest, url)
+        if self.validator:
+            self.validator.submit(key, body)
+        if self.image_index and not self.replay_har:
+            self.image_index.record(key, album_url, url, headers, len(body), digest)
+        self.metrics.inc("bytes_downloaded_total", len(body))
+        location = self.storage.location(key)
+        self.metrics.log("image_saved", path=location, bytes=len(body), sha256=digest)
+
+        return ImageSaved(album_url, key, location, url, len(body), digest)
+
+    @instrumented("download_image_via_navigation")
+    def download_image_via_navigation(self, url: str, key: str, album_url: str = ""):
         """
         Download an image using the browser context's HTTP client.
         Uses context.request.get() to avoid "Download is starting" errors from page.goto().
 
         Args:
             url: URL of the image to download
-            save_path: Path where the image should be saved
+            key: Storage key ("<girl>/<album>/<filename>") the image is written to
+            album_url: Album the image belongs to, recorded in the returned event
 
         Returns:
-            Tuple of (success: bool, is_placeholder: bool)
+            ImageSaved on success, otherwise ImageFailed (placeholder set when the
+            CDN answered with the unauthenticated placeholder image)
+
+        Raises:
+            SignedURLExpired: If the URL's signature has expired
         """
+        filename = key.rsplit("/", 1)[-1]
+
         def do_download():
+            # Don't spend a request (and a full backoff cycle) on a dead signed URL
+            if self.is_url_expired(url):
+                raise SignedURLExpired(f"Signed URL expired for {filename}")
+
             # Use context.request.get() instead of page.goto() to avoid download triggers
             # This makes an HTTP request using the browser's cookies without navigation
-            response = self.context.request.get(url, timeout=self.download_timeout)
+            with self.profiler.span("request", "network", url=url):
+                if self.replay_har:
+                    response = SyntheticResponse(url)
+                else:
+                    with self.hosts.slot(url, "image"):
+                        response = self.context.request.get(url, timeout=self.download_timeout)
 
             try:
+                if response.status in (400, 403) and self.is_response_expired(url, response.body):
+                    raise SignedURLExpired(f"HTTP {response.status}: signed URL expired")
+
                 if response.status != 200:
                     raise Exception(f"HTTP {response.status}")
 
-                body = response.body()
-
-                # Check if this is the placeholder image (auth failure)
-                if self.is_placeholder_image(body):
-                    return (False, True)  # Got placeholder - auth issue
-
-                if len(body) < 1000:
-                    raise Exception("Response too small, likely an error page")
+                with self.profiler.span("response_body", "network"):
+                    body = response.body()
+                # Playwright delivers the whole body at once; the cap is kept on average
+                self.bandwidth.consume(len(body))
 
-                save_path.parent.mkdir(parents=True, exist_ok=True)
-                save_path.write_bytes(body)
-
-                return (True, False)  # Success
+                return self.store_image(url, key, album_url, body, response.headers)
             finally:
                 # Dispose response to free inspector cache memory
                 # This prevents "Request content was evicted from inspector cache" errors
                 response.dispose()
 
-        result = self.retry_operation(do_download, f"download {save_path.name}")
-        if result is None:
-            return (False, False)
-        return result
+        result = self.retry_operation(do_download, f"download {filename}")
+        if result is None:
+            return ImageFailed(album_url, key, "download failed")
+        return result
+
+    @instrumented("download_image_via_http")
+    def download_image_via_http(self, fetcher: HTTPFetcher, url: str, key: str, album_url: str):
+        """
+        Download an image with a plain HTTP client carrying the browser session.
+        Makes no Playwright calls, so download workers can run it on their threads.
+
+        Args:
+            fetcher: HTTP client with the session's cookies and user agent
+            url: URL of the image to download
+            key: Storage key ("<girl>/<album>/<filename>") the image is written to
+            album_url: Album the image belongs to, recorded in the returned event
+
+        Returns:
+            ImageSaved on success, otherwise ImageFailed
+
+        Raises:
+            SignedURLExpired: If the URL's signature has expired
+        """
+        filename = key.rsplit("/", 1)[-1]
+
+        def do_download():
+            if self.is_url_expired(url):
+                raise SignedURLExpired(f"Signed URL expired for {filename}")
+
+            with self.profiler.span("request", "network", url=url):
+                if self.replay_har:
+                    response = SyntheticResponse(url)
+                    status, headers, body = response.status, response.headers, response.body()
+                else:
+                    status, headers, body = fetcher.request("GET", url)
+
+            if status in (400, 403) and self.is_response_expired(url, lambda: body):
+                raise SignedURLExpired(f"HTTP {status}: signed URL expired")
+            if status != 200:
+                raise Exception(f"HTTP {status}")
+
+            return self.store_image(url, key, album_url, body, headers)
+
+        result = self.retry_operation(do_download, f"download {filename}")
+        if result is None:
+            return ImageFailed(album_url, key, "download failed")
+        return result
+
+    def process_album(self, album_url: str) -> tuple:
+        """
+        Process a single album: extract and download all images, printing progress.
+
+        Args:
+            album_url: URL of the album
+
+        Returns:
+            Tuple of (downloaded_count: int, auth_failure: bool)
+        """
+        for event in self.iter_images(album_url):
+            self.report(event)
+        return (event.downloaded, event.auth_failure)
+
+    def iter_images(self, album_url: str):
+        """
+        Download an album's images into storage, yielding an event per image.
+
+        Images already stored (or known to the content store) are skipped. After
+        two placeholder responses in a row the session is considered dead and the
+        album is abandoned. The next image is only fetched once the consumer asks
+        for the next event.
+
+        Args:
+            album_url: URL of the album
+
+        Yields:
+            ImageSaved, ImageSkipped or ImageFailed per image, then AlbumFinished
+        """
+        girl_name, album_name = self.parse_album_url(album_url)
+
+        print(f"\n  Album: {girl_name}/{album_name}")
+        self.metrics.inc("albums_processed_total")
+
+        # extract_image_urls navigates to album page, which handles auth check
+        image_urls = self.extract_image_urls(album_url)
+
+        if not image_urls:
+            print("  No images found in album.")
+            yield AlbumFinished(album_url, 0, 0, 0)
+            return
+
+        print(f"  Found {len(image_urls)} images")
+
+        # Download soonest-expiring signed URLs first
+        image_urls = self.sort_by_expiry(image_urls)
+        fresh_urls = {}  # URL path -> re-extracted signed URL, filled on expiry
+
+        downloaded = 0
+        skipped = 0
+        failed = 0
+        auth_failures = 0
+
+        self.storage.begin_album(girl_name, album_name)
+        complete = False
+        try:
+            for img_url in image_urls:
+                img_url = fresh_urls.get(urlparse(img_url).path, img_url)
+                key = self.image_key(girl_name, album_name, img_url, downloaded + 1)
+
+                stored = self.stored_image(album_url, key, img_url)
+                if stored:
+                    skipped += 1
+                    yield stored
+                    continue
+
+                try:
+                    result = self.download_image_via_navigation(img_url, key, album_url)
+                except SignedURLExpired:
+                    self.metrics.inc("signed_urls_expired_total")
+                    fresh_urls = self.refresh_image_urls(album_url)
+                    fresh_url = fresh_urls.get(urlparse(img_url).path)
+                    result = ImageFailed(album_url, key, "signed URL expired")
+                    if fresh_url:
+                        try:
+                            result = self.download_image_via_navigation(fresh_url, key, album_url)
+                        except SignedURLExpired:
+                            pass
+                    if isinstance(result, ImageFailed) and not result.placeholder:
+                        self.metrics.inc("signed_url_failures_total")
+                        result.reason = "signed URL expired"
+
+                if isinstance(result, ImageSaved):
+                    downloaded += 1
+                    self.invalid_images.discard(key)
+                    self.metrics.inc("images_downloaded_total")
+                    auth_failures = 0  # Reset on success
+                elif result.placeholder:
+                    auth_failures += 1
+                    failed += 1
+                    self.metrics.inc("placeholder_hits_total")
+                else:
+                    failed += 1
+                    self.metrics.inc("images_failed_total")
+                yield result
+
+                # If we get multiple placeholder images, session is dead
+                if auth_failures >= 2:
+                    yield AlbumFinished(album_url, downloaded, skipped, failed, auth_failure=True)
+                    return
+
+                # Small delay between downloads
+                self.random_delay(0.5, 1.5)
+
+            complete = True
+        finally:
+            lost = self.finish_stored_album(album_url, girl_name, album_name, complete)
+
+        yield from lost
+        yield AlbumFinished(album_url, downloaded - len(lost), skipped, failed + len(lost))
+
+    def session_accounts(self) -> list:
+        """Credential section of each session pool member (empty when the pool is off)."""
+        accounts = [account for account in self.sessions for _ in range(self.contexts_per_account)]
+        return accounts if len(accounts) > 1 else []
+
+    def pool_member(self, account: str) -> "SGSpider":
+        """
+        A spider for one session pool member, sharing this spider's storage,
+        validation, image index, metrics, profiler and transfer limiters.
+
+        Args:
+            account: Config section with the member's username/password
+
+        Returns:
+            SGSpider configured like this one, not yet started
+        """
+        member = SGSpider()
+        member.config_file = self.config_file
+        member.account = account
+        for shared in ("metrics", "profiler", "stop_event", "storage", "validator", "image_index",
+                       "content_store", "bandwidth", "hosts", "invalid_images"):
+            setattr(member, shared, getattr(self, shared))
+        # Settings come from this spider's parsed config rather than a reload,
+        # which would reassign fields of the shared objects while they are in use
+        for setting in ("credentials", "placeholder_hash", "base_url", "download_dir", "storage_mode",
+                        "headless", "launch_profile", "browser_path", "spare_browser",
+                        "restart_keep_session", "delay_scale", "max_retries", "retry_base_delay",
+                        "download_timeout", "page_load_timeout", "max_album_pages",
+                        "browser_restart_interval", "signed_url_margin"):
+            setattr(member, setting, getattr(self, setting))
+        return member
+
+    def download_pooled(self, albums: list, feed, start_index: int, total_downloaded: int, keep_state: bool):
+        """
+        Process albums with the session pool (sessions / contexts_per_account).
+
+        This spider's own session crawls the feed and keeps one album queued
+        per live pool member; the members download them in parallel. An
+        album abandoned because its session expired is put back at the front
+        of the queue for another session, up to once per member. Saved state
+        points at the first unfinished album, as in download_queued().
+
+        Args:
+            albums: Album URLs known so far; extended as the feed is crawled
+            feed: Generator of further album URLs, or None
+            start_index: Index of the first album to process
+            total_downloaded: Images downloaded before a resume
+            keep_state: Save resume state as albums finish
+
+        Yields:
+            AlbumDiscovered as each album is queued, then the members'
+            iter_images() events as they arrive
+        """
+        accounts = self.session_accounts()
+        names = [
+            f"{account}#{accounts[:n].count(account) + 1}" if accounts.count(account) > 1 else account
+            for n, account in enumerate(accounts)
+        ]
+        print(f"\n=== Starting {len(accounts)} pool sessions: {', '.join(names)} ===")
+        pool = SessionPool({name: self.pool_member(account) for name, account in zip(names, accounts)})
+        outstanding = {}  # album URL -> indexes of its unfinished occurrences, oldest first
+        auth_failures = {}  # album URL -> sessions it expired in
+        finished = set()
+        resume_index = start_index
+        i = start_index
+        try:
+            while True:
+                # Keep one album waiting per live session so none idles
+                while pool.backlog() < pool.active() and not self.stop_event.is_set() and \
+                        (i < len(albums) or feed is not None):
+                    if i >= len(albums):
+                        album_url = next(feed, None)
+                        if album_url is None:
+                            feed = None
+                            break
+                        albums.append(album_url)
+                    album_url = albums[i]
+                    girl, album = self.parse_album_url(album_url)
+                    yield AlbumDiscovered(album_url, girl, album, i, len(albums), crawling=feed is not None)
+                    outstanding.setdefault(album_url, []).append(i)
+                    pool.put(album_url)
+                    i += 1
+
+                if not outstanding:
+                    break
+                if not pool.active():
+                    print("No pool session is logged in. Stopping.")
+                    break
+
+                for name, event in pool.collect(0.5):
+                    yield event
+                    if not isinstance(event, AlbumFinished):
+                        continue
+                    if event.auth_failure:
+                        auth_failures[event.url] = auth_failures.get(event.url, 0) + 1
+                        if auth_failures[event.url] < len(accounts):
+                            print(f"  Session {name} expired; handing {event.url} to another session")
+                            pool.put(event.url, front=True)
+                            continue
+
+                    indexes = outstanding[event.url]
+                    finished.add(indexes.pop(0))
+                    if not indexes:
+                        del outstanding[event.url]
+                    while resume_index in finished:
+                        finished.discard(resume_index)
+                        resume_index += 1
+                    total_downloaded += event.downloaded
+                    self.collect_validation_failures()
+                    if keep_state:
+                        self.save_state(albums, resume_index, total_downloaded)
+                    self.sample_resources(event.url)
+                    self.metrics.write_textfile()
+        finally:
+            pool.close()
+
+    def session_fetcher(self) -> HTTPFetcher:
+        """Plain HTTP client carrying the browser session's cookies and user agent."""
+        return HTTPFetcher(
+            self.evaluate("navigator.userAgent"), self.context.cookies(), self.download_timeout / 1000,
+            bandwidth=self.bandwidth, hosts=self.hosts,
+        )
 
-    def process_album(self, album_url: str) -> tuple:
+    def queue_album_images(self, album_url: str, progress: dict, pool: DownloadWorkers):
         """
-        Process a single album: extract and download all images.
+        Extract an album's images and queue the ones not already stored.
 
         Args:
             album_url: URL of the album
+            progress: The album's accounting in download_queued(), updated in place
+            pool: Download workers the images are queued on
 
-        Returns:
-            Tuple of (downloaded_count: int, auth_failure: bool)
+        Yields:
+            ImageSkipped per image already stored
         """
-        girl_name, album_name = self.parse_album_url(album_url)
-        album_dir = self.download_dir / girl_name / album_name
+        girl_name, album_name = progress["girl"], progress["album"]
 
         print(f"\n  Album: {girl_name}/{album_name}")
+        self.metrics.inc("albums_processed_total")
 
-        # extract_image_urls navigates to album page, which handles auth check
         image_urls = self.extract_image_urls(album_url)
-
         if not image_urls:
             print("  No images found in album.")
-            return (0, False)
+            return
 
         print(f"  Found {len(image_urls)} images")
+        self.storage.begin_album(girl_name, album_name)
+        progress["begun"] = True
+
+        # Queue soonest-expiring signed URLs first
+        for number, img_url in enumerate(self.sort_by_expiry(image_urls), 1):
+            key = self.image_key(girl_name, album_name, img_url, number)
+            stored = self.stored_image(album_url, key, img_url)
+            if stored:
+                progress["skipped"] += 1
+                yield stored
+                continue
+            progress["pending"] += 1
+            pool.submit(ImageJob(album_url, key, img_url, album_index=progress["index"]))
+
+    def transfer_rates(self) -> str:
+        """Current transfer rate and the bandwidth cap in force, for progress lines."""
+        current = self.bandwidth.current_rate()
+        limit = self.bandwidth.limit()
+        self.metrics.set_gauge("transfer_bytes_per_second", current)
+        self.metrics.set_gauge("bandwidth_limit_bytes_per_second", limit)
+        return f"rate {format_rate(current)} (limit {format_rate(limit) if limit else 'none'})"
+
+    def sample_resources(self, album_url: str):
+        """
+        Sample memory and resource use after an album (no-op without --resources).
 
-        downloaded = 0
-        skipped = 0
-        auth_failures = 0
+        Args:
+            album_url: URL of the album just finished
+        """
+        sample = self.resources.sample(album_url, self.browser_restarts)
+        if not sample:
+            return
+        self.metrics.set_gauge("process_resident_bytes", sample["python_rss"], process="python")
+        self.metrics.set_gauge("process_resident_bytes", sample["browser_rss"], process="browser")
+        self.metrics.set_gauge("python_traced_bytes", sample["python_traced"])
+        self.metrics.set_gauge("open_file_descriptors", sample["open_fds"])
+        for name, count in sample["playwright_objects"].items():
+            self.metrics.set_gauge("playwright_objects", count, type=name)
+        self.metrics.log("resources", **sample)
+
+    def image_key(self, girl_name: str, album_name: str, img_url: str, number: int) -> str:
+        """
+        Storage key for an album image, from its URL's sanitized filename.
 
-        for img_url in image_urls:
-            # Extract filename from URL
-            filename = img_url.split("/")[-1].split("?")[0]
-            if not filename:
-                filename = f"image_{downloaded + 1}.jpg"
+        Args:
+            girl_name: Model name
+            album_name: Album name
+            img_url: Image URL
+            number: Image number, for a name when the URL has no filename
 
-            # Sanitize filename
-            filename = re.sub(r'[<>:"/\\|?*]', "_", filename)
-            save_path = album_dir / filename
+        Returns:
+            "<girl>/<album>/<filename>"
+        """
+        filename = img_url.split("/")[-1].split("?")[0]
+        if not filename:
+            filename = f"image_{number}.jpg"
+        filename = re.sub(r'[<>:"/\\|?*]', "_", filename)
+        return f"{girl_name}/{album_name}/{filename}"
 
-            # Check if file exists and is valid
-            if save_path.exists():
-                if self.is_valid_existing_file(save_path):
-                    skipped += 1
-                    continue
-                else:
-                    # File is corrupted/placeholder - delete and re-download
-                    print(f"    Replacing corrupted: {filename}")
-                    save_path.unlink()
-
-            success, is_placeholder = self.download_image_via_navigation(img_url, save_path)
-
-            if success:
-                downloaded += 1
-                print(f"    Downloaded: {filename}")
-                auth_failures = 0  # Reset on success
-            elif is_placeholder:
-                auth_failures += 1
-                print(f"    AUTH FAILURE: {filename} (got placeholder image)")
+    def finish_stored_album(self, album_url: str, girl: str, album: str, complete: bool) -> list:
+        """
+        Flush an album's storage and mark images whose storage failed for re-fetching.
 
-                # If we get multiple placeholder images, session is dead
-                if auth_failures >= 2:
-                    print("  Multiple placeholder images detected - session expired!")
-                    return (downloaded, True)
+        Args:
+            album_url: Album the images belong to
+            girl: Girl name of the album
+            album: Album name
+            complete: False if the album was abandoned
+
+        Returns:
+            ImageFailed for each image that was reported saved but not stored
+        """
+        # Waits for the album's pending uploads before state moves past it
+        lost = self.storage.finish_album(girl, album, complete)
+        for key in lost:
+            # Kept in the run state and re-fetched like an image that failed validation
+            self.invalid_images.add(key)
+            self.metrics.inc("images_failed_total")
+        return [ImageFailed(album_url, key, "upload failed") for key in lost]
+
+    def stored_image(self, album_url: str, key: str, img_url: str):
+        """
+        Check whether an image needs downloading, clearing out broken copies.
+
+        Args:
+            album_url: Album the image belongs to
+            key: Storage key of the image
+            img_url: Image URL, looked up in the content store
+
+        Returns:
+            ImageSkipped if a valid copy is stored (or was linked from the
+            content store), else None
+        """
+        filename = key.rsplit("/", 1)[-1]
+        if self.storage.exists(key):
+            if key in self.invalid_images:
+                # Failed background validation - re-download
+                print(f"    Re-fetching invalid: {filename}")
+                self.storage.delete(key)
+            elif self.storage.is_valid(key):
+                self.metrics.inc("images_skipped_total")
+                return ImageSkipped(album_url, key, "exists")
+            else:
+                # Corrupted/placeholder - delete and re-download
+                print(f"    Replacing corrupted: {filename}")
+                self.storage.delete(key)
+
+        # Content already stored under another album: link it without a fetch
+        if self.storage.link_known(key, img_url):
+            self.metrics.inc("images_deduplicated_total")
+            return ImageSkipped(album_url, key, "deduplicated")
+        return None
+
+    def report(self, event):
+        """Print the progress line for an event from download() or iter_images()."""
+        if isinstance(event, AlbumDiscovered):
+            total = f"{event.total}+" if event.crawling else event.total
+            print(f"\n[{event.index + 1}/{total}] {event.url}")
+        elif isinstance(event, ImageSaved):
+            print(f"    Downloaded: {event.key.rsplit('/', 1)[-1]}")
+        elif isinstance(event, ImageFailed):
+            filename = event.key.rsplit("/", 1)[-1]
+            if event.placeholder:
+                print(f"    AUTH FAILURE: {filename} (got placeholder image)")
+            elif event.reason == "signed URL expired":
+                print(f"    Failed (signed URL expired): {filename}")
             else:
                 print(f"    Failed: {filename}")
+        elif isinstance(event, AlbumFinished):
+            if event.auth_failure:
+                print("  Multiple placeholder images detected - session expired!")
+                return
+            if event.downloaded or event.skipped or event.failed:
+                # Albums can finish out of order with download workers, so name the album
+                girl, album = self.parse_album_url(event.url)
+                skipped = f", skipped {event.skipped} existing files" if event.skipped else ""
+                print(f"  {girl}/{album}: downloaded {event.downloaded} new images{skipped}; {self.transfer_rates()}")
+
+    def collect_validation_failures(self, wait: bool = False) -> int:
+        """
+        Mark images that failed background validation for re-fetching.
 
-            # Small delay between downloads
-            self.random_delay(0.5, 1.5)
+        Args:
+            wait: Block until all queued validations have finished
+
+        Returns:
+            Number of newly failed images
+        """
+        if not self.validator:
+            return 0
+        failures = self.validator.failures(wait=wait)
+        for key, reason in failures:
+            print(f"    Invalid image: {key} ({reason})")
+            self.invalid_images.add(key)
+            self.metrics.inc("images_invalid_total")
+            self.metrics.log("image_invalid", key=key, reason=reason)
+        return len(failures)
+
+    def refetch_invalid_images(self, albums: list):
+        """
+        Re-process albums containing images that failed validation.
+
+        Waits for outstanding validations first. Each album is processed once;
+        images still failing are left in invalid_images and reported.
 
-        if skipped:
-            print(f"  Skipped {skipped} existing files")
-        print(f"  Downloaded {downloaded} new images")
+        Args:
+            albums: Album URLs of this run, used to find the albums to revisit
+
+        Yields:
+            Events for the revisited albums, from download_queued() with
+            download_workers or else from iter_images()
+        """
+        self.collect_validation_failures(wait=True)
+        if not self.invalid_images:
+            return
+
+        invalid_albums = {key.rsplit("/", 1)[0] for key in self.invalid_images}
+        revisit = [url for url in dict.fromkeys(albums) if "/".join(self.parse_album_url(url)) in invalid_albums]
+        print(f"\n=== Re-fetching {len(self.invalid_images)} invalid images from {len(revisit)} albums ===")
+
+        if self.download_workers:
+            yield from self.download_queued(revisit, None, 0, 0, keep_state=False)
+        else:
+            for album_url in revisit:
+                if self.stop_event.is_set():
+                    break
+                try:
+                    with self.profiler.tagged(album=album_url):
+                        for event in self.iter_images(album_url):
+                            yield event
+                    if event.auth_failure and not self.login():
+                        print("  Re-login failed, leaving remaining invalid images.")
+                        break
+                except Exception as e:
+                    print(f"  Error processing album: {e}")
 
-        return (downloaded, False)
+        self.collect_validation_failures(wait=True)
+        if self.invalid_images:
+            print(f"Still invalid after re-fetch: {len(self.invalid_images)} images")
 
     def save_state(self, albums: list, current_index: int, total_downloaded: int):
         """Save current progress to state file for resume capability."""
@@ -929,6 +4602,7 @@ class SGSpider:
             "albums": albums,
             "current_index": current_index,
             "total_downloaded": total_downloaded,
+            "invalid_images": sorted(self.invalid_images),
             "timestamp": time.time(),
         }
         try:
@@ -956,26 +4630,487 @@ class SGSpider:
         except Exception as e:
             print(f"Warning: Could not remove state file: {e}")
 
-    def run(self, album_urls: list = None):
-        """Main entry point - run the spider.
+    def pack_existing(self):
+        """Migrate existing album directories into per-album archives."""
+        self.load_settings()
+        print(f"\n=== Packing album directories under {self.download_dir} ===")
+
+        if not self.download_dir.is_dir():
+            print("Download directory does not exist, nothing to pack.")
+            return
+
+        albums = packed = 0
+        for girl_dir in sorted(p for p in self.download_dir.iterdir() if p.is_dir()):
+            if girl_dir.name.startswith("."):
+                continue  # Content store, temp dirs
+            for album_dir in sorted(p for p in girl_dir.iterdir() if p.is_dir()):
+                count = AlbumArchive(album_dir).pack_directory()
+                if count:
+                    albums += 1
+                    packed += count
+                    print(f"  {girl_dir.name}/{album_dir.name}: {count} images")
+
+        print(f"Packed {packed} images from {albums} albums.")
+        if self.storage_mode != "archive":
+            print("Note: set storage_mode = archive so new downloads are packed too.")
+
+    def pending_albums(self) -> list:
+        """
+        Albums a resumed run or the next watch poll would still process.
+
+        Reads only the state, feed checkpoint and watch history files.
+
+        Returns:
+            List of (album_url, source) tuples in processing order
+        """
+        pending = {}  # Ordered set: album URL -> source
+        state = self.load_state()
+        if state:
+            for url in state.get("albums", [])[state.get("current_index", 0):]:
+                pending.setdefault(url, "resume state")
+            processed = set(state.get("albums", [])[:state.get("current_index", 0)])
+        else:
+            processed = set()
+
+        checkpoint = self.load_feed_checkpoint()
+        if checkpoint:
+            for url in checkpoint.get("albums", []):
+                if url not in processed:
+                    pending.setdefault(url, "feed checkpoint")
+
+        if self.seen_file.exists():
+            for url in self.load_seen()["pending"]:
+                pending.setdefault(url, "watch pending")
+
+        return list(pending.items())
+
+    def print_status(self):
+        """Print resume state, feed checkpoint and watch history without a browser."""
+        lock_file = Path(__file__).parent / ".sgspider.lock"
+        running = False
+        if lock_file.exists():
+            with open(lock_file, "a") as lock_fp:
+                try:
+                    fcntl.flock(lock_fp, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    fcntl.flock(lock_fp, fcntl.LOCK_UN)
+                except BlockingIOError:
+                    running = True
+        print(f"Spider:          {'running' if running else 'not running'}")
+
+        state = self.load_state()
+        if state:
+            albums = state.get("albums", [])
+            age_hours = (time.time() - state.get("timestamp", 0)) / 3600
+            print(
+                f"Resume state:    album {state.get('current_index', 0)} of {len(albums)} done, "
+                f"{state.get('total_downloaded', 0)} images downloaded, saved {age_hours:.1f}h ago"
+                + (" (expired, next run starts fresh)" if age_hours >= 24 else "")
+            )
+            if state.get("invalid_images"):
+                print(f"                 {len(state['invalid_images'])} images waiting to be re-fetched")
+        else:
+            print("Resume state:    none")
+
+        checkpoint = self.load_feed_checkpoint()
+        if checkpoint:
+            position = checkpoint.get("position", {})
+            print(
+                f"Feed checkpoint: {len(checkpoint.get('albums', []))} albums harvested, "
+                f"{'complete' if checkpoint.get('complete') else 'iteration ' + str(position.get('iterations', 0))}"
+                + (f", next {position['next']}" if position.get("next") else "")
+            )
+        else:
+            print("Feed checkpoint: none")
+
+        if self.seen_file.exists():
+            seen = self.load_seen()
+            print(f"Watch history:   {len(seen['seen'])} albums seen, {len(seen['pending'])} pending")
+        else:
+            print("Watch history:   none")
+
+    def print_plan(self, limit: int = 0):
+        """
+        List the albums the next run would process, without a browser.
+
+        Albums with files already on disk are marked "partial"; their existing
+        images will be skipped.
 
         Args:
-            album_urls: Optional list of specific album URLs to process.
-                       If not provided, collects albums from the feed.
+            limit: Show at most this many albums (0 = all)
+        """
+        config = self.load_settings()
+        pending = self.pending_albums()
+        if not pending:
+            print("Nothing pending: the next run collects albums from the feed.")
+            return
+
+        local = config.get("settings", "storage", fallback=DEFAULT_STORAGE) == "local"
+        partial = 0
+        shown = pending[:limit] if limit > 0 else pending
+        for url, source in shown:
+            girl, album = self.parse_album_url(url)
+            album_dir = self.download_dir / girl / album
+            started = local and (album_dir.exists() or album_dir.with_name(album + ".tar").exists())
+            partial += started
+            print(f"  {'partial' if started else 'new    '}  {girl}/{album}  ({source})")
+        if len(shown) < len(pending):
+            print(f"  ... and {len(pending) - len(shown)} more")
+        print(f"{len(pending)} albums pending" + (f", {partial} of those shown already started" if partial else ""))
+
+    def verify_downloads(self, quick: bool = False, workers: int = None, delete: bool = False) -> bool:
+        """
+        Audit the download tree without a browser.
+
+        Image files are checked with check_image_structure in a process pool
+        (or only by size and header with quick); archived members are checked
+        against their index SHA-256 as well.
+
+        Args:
+            quick: Only check size and magic bytes, like the pre-download check
+            workers: Checker processes (defaults to the CPU count)
+            delete: Remove invalid files so the next run downloads them again
+
+        Returns:
+            True if every image is valid
+        """
+        self.load_settings()
+        print(f"\n=== Verifying images under {self.download_dir} ===")
+        if not self.download_dir.is_dir():
+            print("Download directory does not exist, nothing to verify.")
+            return True
+
+        files = []
+        archives = []
+        for girl_dir in sorted(p for p in self.download_dir.iterdir() if p.is_dir()):
+            if girl_dir.name.startswith("."):
+                continue  # Content store, temp dirs
+            for entry in sorted(girl_dir.iterdir()):
+                if entry.is_dir():
+                    files.extend(p for p in sorted(entry.iterdir()) if p.suffix.lower() in IMAGE_EXTENSIONS)
+                elif entry.suffix == ".tar":
+                    archives.append(AlbumArchive(entry.with_suffix("")))
+
+        invalid = []  # (description, reason, path or (archive, member name))
+        if quick:
+            for path in files:
+                if not self.is_valid_existing_file(path):
+                    invalid.append((str(path.relative_to(self.download_dir)), "too small or not an image", path))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                for path, reason in zip(files, pool.map(check_image_file, files, chunksize=64)):
+                    if reason:
+                        invalid.append((str(path.relative_to(self.download_dir)), reason, path))
+
+        members = 0
+        for archive in archives:
+            for name, entry in archive.index.items():
+                members += 1
+                label = f"{archive.tar_path.relative_to(self.download_dir)}:{name}"
+                try:
+                    data = archive.read(name)
+                except Exception as e:
+                    invalid.append((label, f"unreadable: {e}", (archive, name)))
+                    continue
+                if entry.get("sha256") and hashlib.sha256(data).hexdigest() != entry["sha256"]:
+                    invalid.append((label, "SHA-256 mismatch", (archive, name)))
+                elif not quick and (reason := check_image_structure(data)):
+                    invalid.append((label, reason, (archive, name)))
+
+        for label, reason, target in invalid:
+            print(f"  INVALID {label}: {reason}")
+            if not delete:
+                continue
+            if isinstance(target, Path):
+                target.unlink()
+            else:
+                # Dropped from the index, the member reads as missing; a re-fetched
+                # copy is appended and supersedes it when the album is packed again
+                archive, name = target
+                archive.index.pop(name, None)
+                archive.save_index()
+
+        print(f"Checked {len(files)} files and {members} archived images: {len(invalid)} invalid.")
+        if invalid and delete:
+            print("Removed invalid images; the next run downloads them again.")
+        elif invalid:
+            print("Run `sgspider.py verify --delete` to remove them so they are downloaded again.")
+        return not invalid
+
+    def load_seen(self) -> dict:
+        """Load watch mode history: processed albums and albums still to retry."""
+        seen = {"seen": set(), "pending": []}
+        if not self.seen_file.exists():
+            return seen
+        try:
+            with open(self.seen_file, "r") as f:
+                data = json.load(f)
+            seen["seen"] = set(data.get("seen", []))
+            seen["pending"] = data.get("pending", [])
+        except Exception as e:
+            print(f"Warning: Could not load watch history: {e}")
+        return seen
+
+    def save_seen(self, seen: dict):
+        """Persist watch mode history atomically so a kill never truncates it."""
+        data = {
+            "seen": sorted(seen["seen"]),
+            "pending": seen["pending"],
+            "timestamp": time.time(),
+        }
+        tmp_file = self.seen_file.with_suffix(".tmp")
+        try:
+            with open(tmp_file, "w") as f:
+                json.dump(data, f)
+            tmp_file.replace(self.seen_file)
+        except Exception as e:
+            print(f"Warning: Could not save watch history: {e}")
+
+    def install_signal_handlers(self):
+        """Stop gracefully after the current album on SIGTERM/SIGINT.
+
+        A second signal exits immediately.
+        """
+        def handle_signal(signum, frame):
+            if self.stop_event.is_set():
+                raise SystemExit(128 + signum)
+            print(f"\nReceived {signal.Signals(signum).name}, finishing current album and stopping...")
+            self.stop_event.set()
+
+        signal.signal(signal.SIGTERM, handle_signal)
+        signal.signal(signal.SIGINT, handle_signal)
+
+    def next_poll_delay(self) -> float:
+        """Poll interval with random jitter so polls don't land on a fixed schedule."""
+        jitter = random.uniform(-self.watch_jitter, self.watch_jitter)
+        return max(0.0, self.watch_interval * (1 + jitter))
+
+    @contextmanager
+    def session(self):
+        """
+        Load the configuration, start the browser and log in.
+
+        Everything is shut down on exit: the browser, storage uploads, background
+        validation, metrics files and the profile trace.
+
+        Raises:
+            LoginFailed: If the spider could not log in
+        """
+        self.load_credentials()
+        for account in dict.fromkeys([self.account, *self.session_accounts()]):
+            if not self.credentials.has_section(account):
+                raise ValueError(f"No [{account}] section with username/password in {self.config_file}")
+
+        if self.record_har and self.browser_restart_interval:
+            # A restart would start a new context and overwrite the recording
+            print("Browser restarts disabled while recording a HAR.")
+            self.browser_restart_interval = 0
+
+        try:
+            with self.browser_session():
+                yield self
+        finally:
+            if self.storage:
+                self.storage.close()
+            if self.validator:
+                self.validator.close()
+            if self.image_index:
+                self.image_index.close()
+                self.image_index = None
+            self.metrics.close()
+            if self.profile_path:
+                self.profiler.export(self.profile_path)
+            if self.resources_path:
+                self.resources.export(self.resources_path, self.browser_restart_interval)
+
+    @contextmanager
+    def browser_session(self):
+        """
+        Start Playwright and the browser and log in; the browser is stopped on exit.
+
+        Raises:
+            LoginFailed: If the spider could not log in
+        """
+        # Imported here so browser-free commands start without loading Playwright
+        from playwright.sync_api import sync_playwright
+
+        with sync_playwright() as playwright:
+            try:
+                self.start_browser(playwright)
+
+                if not self.login():
+                    raise LoginFailed("Failed to log in")
+
+                yield self
+            finally:
+                self.stop_browser()
+
+    def iter_albums(self, known: set = None, max_pages: int = None, models: list = None):
+        """
+        Crawl the feed, yielding albums as they are found. Requires session().
+
+        Args:
+            known: Album URLs already processed; the feed crawl stops at the first one
+            max_pages: Scroll iteration limit (defaults to self.max_album_pages)
+            models: Crawl these models' album listings instead of the feed
+
+        Yields:
+            AlbumDiscovered per album, in crawl order
+        """
+        if models:
+            source = (url for url in self.iter_model_albums(models, max_pages=max_pages) if url not in (known or ()))
+        else:
+            source = self.iter_feed_albums(known=known, max_pages=max_pages)
+        for index, album_url in enumerate(source):
+            girl, album = self.parse_album_url(album_url)
+            yield AlbumDiscovered(album_url, girl, album, index, index + 1, crawling=True)
+
+    def watch(self):
+        """Keep the browser and session warm and poll the feed for new albums.
+
+        Each poll scrolls the feed only until previously seen albums appear and
+        processes just the new ones. Runs until SIGTERM/SIGINT.
         """
         print("=" * 60)
-        print("SGSpider - Starting")
+        print("SGSpider - Watch mode")
         print("=" * 60)
 
-        self.load_credentials()
+        self.install_signal_handlers()
+        seen = self.load_seen()
+        total_downloaded = 0
+        albums_since_restart = 0
+
+        try:
+            with self.session():
+                while not self.stop_event.is_set():
+                    if self.ensure_logged_in():
+                        # The first poll with no history walks the whole feed
+                        new_albums = self.collect_album_urls(
+                            known=seen["seen"] or None,
+                            max_pages=self.watch_max_pages if seen["seen"] else None,
+                        )
+                        albums = seen["pending"] + [url for url in new_albums if url not in seen["pending"]]
+                        seen["pending"] = albums
+                        self.save_seen(seen)
+
+                        if albums and not self.placeholder_hash:
+                            self.prepare_placeholder_detection(albums[0])
+
+                        poll_albums = list(albums)  # albums is seen["pending"] and shrinks below
+                        if self.download_workers:
+                            # Albums finish out of order; those abandoned on a lost session stay pending
+                            restarts = self.browser_restarts
+                            for event in self.download_queued(poll_albums, None, 0, 0, keep_state=False):
+                                self.report(event)
+                                if self.browser_restarts != restarts:
+                                    # download_queued() restarted the browser within the poll
+                                    restarts = self.browser_restarts
+                                    albums_since_restart = 0
+                                albums_since_restart += isinstance(event, AlbumDiscovered)
+                                if not isinstance(event, AlbumFinished):
+                                    continue
+                                total_downloaded += event.downloaded
+                                if not event.auth_failure:
+                                    seen["seen"].add(event.url)
+                                    seen["pending"].remove(event.url)
+                                self.save_seen(seen)
+
+                            # The restart policy counts albums across polls, which are often small
+                            if self.browser_restart_interval > 0 and albums_since_restart >= self.browser_restart_interval:
+                                albums_since_restart = 0
+                                if not self.restart_browser():
+                                    print("Browser restart failed, will retry login next poll.")
+                        else:
+                            for i, album_url in enumerate(poll_albums):
+                                if self.stop_event.is_set():
+                                    break
+                                print(f"\n[{i + 1}/{len(albums)}] {album_url}")
+
+                                try:
+                                    with self.profiler.tagged(album=album_url):
+                                        count, auth_failure = self.process_album(album_url)
+                                    total_downloaded += count
+
+                                    if auth_failure:
+                                        # Leave the album pending and retry it next poll
+                                        print("  Auth failure detected, attempting re-login...")
+                                        if not self.login():
+                                            print("  Re-login failed, waiting for next poll.")
+                                            break
+                                    else:
+                                        seen["seen"].add(album_url)
+                                        seen["pending"].remove(album_url)
+                                except Exception as e:
+                                    print(f"  Error processing album: {e}")
+
+                                self.collect_validation_failures()
+                                self.save_seen(seen)
+                                self.sample_resources(album_url)
+                                self.metrics.write_textfile()
+
+                                # Rotate the browser by the usual restart policy
+                                albums_since_restart += 1
+                                if self.browser_restart_interval > 0 and albums_since_restart >= self.browser_restart_interval:
+                                    albums_since_restart = 0
+                                    if not self.restart_browser():
+                                        print("Browser restart failed, will retry login next poll.")
+                                        break
+
+                        for event in self.refetch_invalid_images(poll_albums):
+                            self.report(event)
+                            total_downloaded += isinstance(event, ImageSaved)
+                        print(f"\nPoll complete. Downloaded {total_downloaded} images since start.")
+                    else:
+                        print("Not logged in, will retry next poll.")
+
+                    delay = self.next_poll_delay()
+                    if not self.stop_event.is_set():
+                        print(f"Next poll in {delay / 60:.1f} minutes.")
+                    self.stop_event.wait(delay)
 
-        # Check for saved state to resume from
-        saved_state = self.load_state()
+        except LoginFailed:
+            print("Failed to log in. Exiting.")
+        finally:
+            self.save_seen(seen)
+            print(f"Watch mode stopped. Downloaded {total_downloaded} images total.")
+            self.metrics.print_summary()
+
+    def download(self, album_urls: list = None):
+        """
+        Run the spider, yielding events as albums and images are processed.
+
+        Owns the whole session: the browser is started on the first next() and
+        shut down when the generator finishes or is closed. Work only advances
+        as the consumer pulls events, so a slow consumer throttles the crawl
+        instead of buffering results. Progress is saved for resume exactly as
+        in run().
+
+        Args:
+            album_urls: Optional list of specific album URLs to process.
+                       If not provided, albums are crawled from the listings of
+                       self.models / the followed models, or else from the feed.
+
+        Yields:
+            AlbumDiscovered, image events and AlbumFinished per album. With
+            download_workers the images of consecutive albums are downloaded
+            concurrently, so their events interleave (see download_queued());
+            otherwise each album's iter_images() events follow its AlbumDiscovered.
+
+        Raises:
+            LoginFailed: If the spider could not log in
+        """
+        # Targeted crawls are short and keep no resume state, so they never
+        # clobber the state of an unfinished feed run
+        targeted = bool(self.models or self.following)
+        keep_state = not album_urls and not targeted and not self.replay_har
+
+        # Check for saved state to resume from (replays never touch it)
+        saved_state = self.load_state() if keep_state else None
         start_index = 0
         total_downloaded = 0
         albums = None
+        crawl_unfinished = False
 
-        if saved_state and not album_urls:
+        if saved_state:
             # Only resume if not given explicit album URLs
             state_age = time.time() - saved_state.get("timestamp", 0)
             state_age_hours = state_age / 3600
@@ -984,8 +5119,12 @@ class SGSpider:
                 albums = saved_state.get("albums", [])
                 start_index = saved_state.get("current_index", 0)
                 total_downloaded = saved_state.get("total_downloaded", 0)
+                self.invalid_images = set(saved_state.get("invalid_images", []))
 
-                if albums and start_index < len(albums):
+                feed_checkpoint = self.load_feed_checkpoint()
+                crawl_unfinished = bool(feed_checkpoint and not feed_checkpoint.get("complete"))
+
+                if albums and (start_index < len(albums) or self.invalid_images or crawl_unfinished):
                     print(f"\n=== Resuming from saved state ===")
                     print(f"  State saved {state_age_hours:.1f} hours ago")
                     print(f"  Resuming at album {start_index + 1} of {len(albums)}")
@@ -1000,55 +5139,69 @@ class SGSpider:
                 print(f"\nFound saved state but it's {state_age_hours:.1f} hours old (>24h). Starting fresh.")
                 self.clear_state()
 
-        with sync_playwright() as playwright:
-            try:
-                self.start_browser(playwright)
-
-                if not self.login():
-                    print("Failed to log in. Exiting.")
-                    return
-
-                # Determine album list if not resuming
-                if albums is None:
-                    if album_urls:
-                        albums = album_urls
-                        print(f"\n=== Processing {len(albums)} Specified Album(s) ===")
-                    else:
-                        albums = self.collect_album_urls()
-
-                if not albums:
-                    print("No albums found. Exiting.")
-                    return
-
-                # Get a sample image URL to capture the placeholder hash
-                print("\n=== Getting Sample Image for Placeholder Detection ===")
-                first_album = albums[0]
-                sample_images = self.extract_image_urls(first_album)
-
-                if sample_images:
-                    # Strip query params to get unauthenticated version for placeholder hash
-                    sample_url = sample_images[0].split("?")[0]
-                    self.capture_placeholder_hash(sample_url)
-                else:
-                    print("Warning: Could not get sample image for placeholder detection.")
-                    print("Placeholder detection will be disabled.")
-
-                if start_index > 0:
-                    print(f"\n=== Resuming: Processing albums {start_index + 1} to {len(albums)} ===")
-                else:
-                    print(f"\n=== Processing {len(albums)} Albums ===")
+        with self.session():
+            # Determine album list if not resuming. Feed albums are crawled on
+            # their own page as processing goes; a resumed run continues an
+            # unfinished crawl from its checkpoint.
+            feed = None
+            if album_urls and albums is None:
+                albums = album_urls
+                print(f"\n=== Processing {len(albums)} Specified Album(s) ===")
+            elif targeted:
+                print("\n=== Collecting Albums of Selected Models ===")
+                models = list(self.models)
+                if self.following:
+                    models += self.followed_models()
+                feed = self.iter_model_albums(models)
+            elif not album_urls and (albums is None or crawl_unfinished):
+                print("\n=== Collecting Album URLs ===")
+                feed = self.iter_feed_albums(checkpoint=not self.replay_har, skip=set(albums or ()))
+            albums = list(albums or [])
+
+            if not albums and feed:
+                first_album = next(feed, None)
+                if first_album:
+                    albums.append(first_album)
+
+            if not albums:
+                print("No albums found. Exiting.")
+                return
+
+            # Get a sample image URL to capture the placeholder hash
+            self.prepare_placeholder_detection(albums[0])
+
+            if start_index > 0:
+                print(f"\n=== Resuming: Processing albums {start_index + 1} to {len(albums)} ===")
+            else:
+                print(f"\n=== Processing {len(albums)} Albums ===")
 
+            if self.session_accounts() and not (self.record_har or self.replay_har):
+                yield from self.download_pooled(albums, feed, start_index, total_downloaded, keep_state)
+            elif self.download_workers:
+                yield from self.download_queued(albums, feed, start_index, total_downloaded, keep_state)
+            else:
                 failed_albums = 0
 
-                for i in range(start_index, len(albums)):
+                i = start_index
+                while True:
+                    if i >= len(albums):
+                        # Out of harvested albums: advance the feed crawl
+                        album_url = next(feed, None) if feed else None
+                        if album_url is None:
+                            feed = None
+                            break
+                        albums.append(album_url)
                     album_url = albums[i]
-                    print(f"\n[{i + 1}/{len(albums)}] {album_url}")
+                    girl, album = self.parse_album_url(album_url)
+                    yield AlbumDiscovered(album_url, girl, album, i, len(albums), crawling=feed is not None)
 
                     try:
-                        count, auth_failure = self.process_album(album_url)
-                        total_downloaded += count
+                        with self.profiler.tagged(album=album_url):
+                            for event in self.iter_images(album_url):
+                                yield event
+                        total_downloaded += event.downloaded
 
-                        if auth_failure:
+                        if event.auth_failure:
                             print("  Auth failure detected, attempting re-login...")
                             if self.login():
                                 print("  Re-login successful, continuing...")
@@ -1063,9 +5216,13 @@ class SGSpider:
                         print(f"  Error processing album: {e}")
                         failed_albums += 1
 
-                    # Save progress after each album (only for non-explicit URLs)
-                    if not album_urls:
+                    self.collect_validation_failures()
+
+                    # Save progress after each album (only for feed runs)
+                    if keep_state:
                         self.save_state(albums, i + 1, total_downloaded)
+                    self.sample_resources(album_url)
+                    self.metrics.write_textfile()
 
                     # If too many consecutive failures, try to recover
                     if failed_albums >= 3:
@@ -1076,26 +5233,409 @@ class SGSpider:
                         failed_albums = 0
 
                     # Periodic browser restart to manage memory
-                    if self.browser_restart_interval > 0 and (i + 1) % self.browser_restart_interval == 0 and i + 1 < len(albums):
+                    if self.browser_restart_interval > 0 and (i + 1) % self.browser_restart_interval == 0 and (i + 1 < len(albums) or feed):
                         if not self.restart_browser():
                             print("Browser restart failed, attempting to continue...")
                             if not self.login():
                                 print("Could not recover session. Stopping.")
                                 break
 
-                # Clear state on successful completion
+                    i += 1
+
+            yield from self.refetch_invalid_images(albums)
+
+            # Clear state on successful completion
+            if keep_state:
                 self.clear_state()
+                self.clear_feed_checkpoint()
 
-                print("\n" + "=" * 60)
-                print(f"Finished! Downloaded {total_downloaded} images total.")
-                print("=" * 60)
+    def download_queued(self, albums: list, feed, start_index: int, total_downloaded: int, keep_state: bool):
+        """
+        Process albums through one shared image queue (download_workers > 0).
 
-            finally:
-                self.stop_browser()
+        The browser loads album pages one after another on this thread and
+        queues their images for the download workers, staying a couple of
+        images per worker ahead so downloads continue across album boundaries.
+        An album finishes when its last image lands; saved state points at the
+        first unfinished album, so a resumed run redoes only albums that were
+        in flight. Placeholder responses are held back: two in a row pause the
+        queue for a re-login, after which the held images are retried once.
+
+        Args:
+            albums: Album URLs known so far; extended as the feed is crawled
+            feed: Generator of further album URLs, or None
+            start_index: Index of the first album to process
+            total_downloaded: Images downloaded before a resume
+            keep_state: Save resume state as albums finish
+
+        Yields:
+            AlbumDiscovered as each album is extracted, image events as they
+            land, and AlbumFinished per album in completion order
+        """
+        pool = DownloadWorkers(self, self.session_fetcher(), self.download_workers)
+        open_albums = {}  # album index -> accounting dict, until its last image lands
+        finished = set()  # Indexes of finished albums past resume_index
+        resume_index = start_index  # First album not yet finished
+        held = []  # Jobs that got the placeholder, waiting for a retry
+        placeholder_streak = 0
+        failed_albums = 0
+        extracted = 0
+        i = start_index
+
+        def finish(progress: dict) -> list:
+            nonlocal resume_index, total_downloaded
+            url = progress["url"]
+            del open_albums[progress["index"]]
+            lost = []
+            if progress["begun"]:
+                lost = self.finish_stored_album(url, progress["girl"], progress["album"],
+                                                not progress["auth_failure"])
+                progress["downloaded"] -= len(lost)
+                progress["failed"] += len(lost)
+            total_downloaded += progress["downloaded"]
+            finished.add(progress["index"])
+            while resume_index in finished:
+                finished.discard(resume_index)
+                resume_index += 1
+
+            self.collect_validation_failures()
+            if keep_state:
+                self.save_state(albums, resume_index, total_downloaded)
+            self.sample_resources(url)
+            self.metrics.write_textfile()
+            return lost + [AlbumFinished(url, progress["downloaded"], progress["skipped"], progress["failed"],
+                                         auth_failure=progress["auth_failure"])]
+
+        try:
+            while True:
+                more_albums = not self.stop_event.is_set() and (i < len(albums) or feed is not None)
+                stocked = pool.queued() >= self.download_workers * 2
+                if not more_albums and not open_albums:
+                    break
+
+                # Only block on results when there is no extraction to do meanwhile
+                for job, result in pool.collect(0.5 if open_albums and (stocked or not more_albums) else 0):
+                    progress = open_albums[job.album_index]
+                    if isinstance(result, SignedURLExpired):
+                        self.metrics.inc("signed_urls_expired_total")
+                        path = urlparse(job.url).path
+                        fresh_url = progress["fresh_urls"].get(path)
+                        # Re-extract the album unless a usable fresh URL is at hand. A refreshed
+                        # URL is only refreshed again once it has itself expired, so an image the
+                        # CDN rejects with a valid signature fails instead of looping.
+                        retry = job.url_refreshes < MAX_IMAGE_URL_REFRESHES and \
+                            (not job.url_refreshes or self.is_url_expired(job.url))
+                        if retry and (not fresh_url or fresh_url == job.url or self.is_url_expired(fresh_url)):
+                            progress["fresh_urls"] = self.refresh_image_urls(job.album_url)
+                            fresh_url = progress["fresh_urls"].get(path)
+                        if retry and fresh_url and fresh_url != job.url:
+                            # Ahead of the queue, so the new signature is used before it runs out too
+                            pool.submit(replace(job, url=fresh_url, url_refreshes=job.url_refreshes + 1), front=True)
+                            continue
+                        self.metrics.inc("signed_url_failures_total")
+                        result = ImageFailed(job.album_url, job.key, "signed URL expired")
+
+                    if isinstance(result, ImageSaved):
+                        placeholder_streak = 0
+                        progress["downloaded"] += 1
+                        self.invalid_images.discard(job.key)
+                        self.metrics.inc("images_downloaded_total")
+                    elif result.placeholder:
+                        self.metrics.inc("placeholder_hits_total")
+                        if not job.auth_retried:
+                            placeholder_streak += 1
+                            held.append(job)
+                            continue
+                        # Still the placeholder after a retry: a fresh login won't help this image
+                        progress["failed"] += 1
+                    else:
+                        progress["failed"] += 1
+                        self.metrics.inc("images_failed_total")
+
+                    progress["pending"] -= 1
+                    yield result
+                    if progress["queued_all"] and not progress["pending"]:
+                        yield from finish(progress)
+
+                if placeholder_streak >= 2:
+                    # Session is dead: stop handing out work until logged in again
+                    placeholder_streak = 0
+                    waiting = pool.withdraw()
+                    print("  Multiple placeholder images detected - session expired!")
+                    print("  Auth failure detected, attempting re-login...")
+                    if self.login():
+                        print("  Re-login successful, continuing...")
+                        pool.fetcher.cookies = self.context.cookies()
+                        for job in waiting:
+                            pool.submit(job)
+                    else:
+                        print("Session lost and could not recover. Stopping.")
+                        for job in held + waiting:
+                            progress = open_albums[job.album_index]
+                            progress["failed"] += 1
+                            progress["pending"] -= 1
+                            progress["auth_failure"] = True
+                            yield ImageFailed(job.album_url, job.key, "session lost", placeholder=job in held)
+                        break
+
+                # Retry held images once the session is known to be good again
+                # (or nothing else is left to tell)
+                if held and (placeholder_streak == 0 or not pool.in_flight):
+                    for job in held:
+                        pool.submit(replace(job, auth_retried=True))
+                    held = []
 
+                if not more_albums or stocked:
+                    continue
+
+                if i >= len(albums):
+                    # Out of harvested albums: advance the feed crawl
+                    album_url = next(feed, None)
+                    if album_url is None:
+                        feed = None
+                        continue
+                    albums.append(album_url)
+                album_url = albums[i]
+                girl, album = self.parse_album_url(album_url)
+                yield AlbumDiscovered(album_url, girl, album, i, len(albums), crawling=feed is not None)
+
+                progress = open_albums[i] = {
+                    "url": album_url, "index": i, "girl": girl, "album": album,
+                    "pending": 0, "downloaded": 0, "skipped": 0, "failed": 0,
+                    "begun": False, "queued_all": False, "auth_failure": False, "fresh_urls": {},
+                }
+                try:
+                    with self.profiler.tagged(album=album_url):
+                        yield from self.queue_album_images(album_url, progress, pool)
+                    failed_albums = 0
+                except Exception as e:
+                    print(f"  Error processing album: {e}")
+                    failed_albums += 1
+                progress["queued_all"] = True
+                if not progress["pending"]:
+                    yield from finish(progress)
+
+                i += 1
+                extracted += 1
+
+                # If too many consecutive failures, try to recover
+                if failed_albums >= 3:
+                    print("\nToo many consecutive failures, attempting recovery...")
+                    if not self.login():
+                        print("Session lost and could not recover. Stopping.")
+                        break
+                    failed_albums = 0
+                    pool.fetcher.cookies = self.context.cookies()
+
+                # Periodic browser restart to manage memory; queued downloads don't use the browser
+                if self.browser_restart_interval > 0 and extracted % self.browser_restart_interval == 0 and (i < len(albums) or feed):
+                    if not self.restart_browser():
+                        print("Browser restart failed, attempting to continue...")
+                        if not self.login():
+                            print("Could not recover session. Stopping.")
+                            break
+                    pool.fetcher.cookies = self.context.cookies()
+        finally:
+            pool.close()
+            for progress in open_albums.values():
+                if progress["begun"]:
+                    self.finish_stored_album(progress["url"], progress["girl"], progress["album"], False)
+
+    def refresh(self):
+        """
+        Revalidate previously downloaded images and re-download the changed ones.
+
+        Albums whose images were last checked more than refresh_min_age hours
+        ago are revisited, least recently checked first. Every image gets a
+        conditional GET (If-None-Match / If-Modified-Since with the validators
+        recorded at download time) from a pool of refresh_concurrency threads,
+        so an unchanged image costs one bodiless 304 and a changed one arrives
+        in the same request. Stored signed URLs are reused while valid; an
+        album page is only loaded when they have expired, and that navigation
+        overlaps the previous album's requests.
+        """
+        print("=" * 60)
+        print("SGSpider - Refreshing downloaded images")
+        print("=" * 60)
+
+        totals = {}
+        try:
+            with self.session():
+                if self.replay_har:
+                    print("Refresh needs the live site; not available with --replay-har.")
+                    return
+
+                albums = self.image_index.albums_due(time.time() - self.refresh_min_age * 3600)
+                print(f"{len(albums)} albums due for revalidation ({self.image_index.count()} images indexed)")
+                if not albums:
+                    return
+
+                fetcher = self.session_fetcher()
+                with ThreadPoolExecutor(max_workers=self.refresh_concurrency, thread_name_prefix="refresh") as pool:
+                    in_flight = []  # (girl, album, futures) in submission order
+                    for index, album_url in enumerate(albums, 1):
+                        if self.stop_event.is_set() or totals.get("placeholder", 0) >= 2:
+                            break
+                        rows = self.image_index.album_images(album_url)
+                        if index == 1 and not self.placeholder_hash:
+                            # The stored URL without its signature fetches the placeholder
+                            self.capture_placeholder_hash(rows[0]["url"].split("?")[0])
+
+                        urls = {row["key"]: row["url"] for row in rows}
+                        if any(self.is_url_expired(url) for url in urls.values()):
+                            fresh = self.refresh_image_urls(album_url)
+                            urls = {key: fresh.get(urlparse(url).path) for key, url in urls.items()}
+
+                        girl, album = self.parse_album_url(album_url)
+                        print(f"[{index}/{len(albums)}] {girl}/{album}: checking {len(rows)} images")
+                        self.storage.begin_album(girl, album)
+                        futures = [pool.submit(self.revalidate_image, fetcher, row, urls[row["key"]]) for row in rows]
+                        in_flight.append((girl, album, futures))
+                        in_flight = self.finish_refreshed_albums(in_flight, totals)
+
+                    self.finish_refreshed_albums(in_flight, totals, wait=True)
+        except LoginFailed:
+            print("Failed to log in. Exiting.")
+            return
+
+        print("\n" + "=" * 60)
+        if totals.get("placeholder", 0) >= 2:
+            print("Stopped early: the CDN is answering with the placeholder image (session expired?).")
+        print("Refresh finished: " + ", ".join(f"{count} {result}" for result, count in sorted(totals.items())))
+        self.metrics.print_summary()
+        print("=" * 60)
+
+    def revalidate_image(self, fetcher: HTTPFetcher, row: dict, url: str) -> str:
+        """
+        Conditionally re-request one indexed image and replace it if it changed.
+        Runs on a refresh pool thread.
+
+        Args:
+            fetcher: HTTP client carrying the browser session
+            row: The image's ImageIndex row
+            url: Signed URL to request (None if the album no longer lists the image)
+
+        Returns:
+            "unchanged", "changed", "missing", "placeholder" or "failed"
+        """
+        if not url:
+            return "missing"
+
+        headers = {}
+        if row["etag"]:
+            headers["If-None-Match"] = row["etag"]
+        if row["last_modified"]:
+            headers["If-Modified-Since"] = row["last_modified"]
+
+        try:
+            with self.profiler.span("revalidate", "network", url=url):
+                status, response_headers, body = fetcher.request("GET", url, headers)
+        except (OSError, HTTPException) as e:
+            print(f"    {row['key']}: {e}")
+            return "failed"
+
+        if status == 304:
+            self.image_index.mark_checked(row["key"], url)
+            return "unchanged"
+        if status != 200:
+            print(f"    {row['key']}: HTTP {status}")
+            return "failed"
+
+        digest = hashlib.sha256(body).hexdigest()
+        if self.is_placeholder_image(body, digest):
+            return "placeholder"
+        if digest == row["sha256"]:
+            # Server ignored the validators but the content is the same
+            self.image_index.record(row["key"], row["album_url"], url, response_headers, len(body), digest)
+            return "unchanged"
+
+        problem = check_image_structure(body)
+        if problem:
+            print(f"    {row['key']}: new version rejected ({problem})")
+            return "failed"
 
-def main():
-    # Acquire exclusive lock to prevent multiple instances
+        try:
+            self.storage.write(row["key"], body, digest, url)
+        except Exception as e:
+            print(f"    {row['key']}: could not store new version: {e}")
+            return "failed"
+        self.image_index.record(row["key"], row["album_url"], url, response_headers, len(body), digest)
+        self.metrics.inc("bytes_downloaded_total", len(body))
+        self.metrics.log("image_refreshed", path=self.storage.location(row["key"]), bytes=len(body), sha256=digest)
+        return "changed"
+
+    def finish_refreshed_albums(self, in_flight: list, totals: dict, wait: bool = False) -> list:
+        """
+        Close out refreshed albums whose requests have all completed, in order.
+
+        Args:
+            in_flight: (girl, album, futures) entries in submission order
+            totals: Result counts, updated in place
+            wait: Block until every album is done
+
+        Returns:
+            The entries still in flight
+        """
+        while in_flight and (wait or all(future.done() for future in in_flight[0][2])):
+            girl, album, futures = in_flight.pop(0)
+            counts = {}
+            for future in futures:
+                result = future.result()
+                counts[result] = counts.get(result, 0) + 1
+                totals[result] = totals.get(result, 0) + 1
+                self.metrics.inc("images_revalidated_total", result=result)
+            lost = self.storage.finish_album(girl, album, complete=not counts.get("failed"))
+            for key in lost:
+                # Only changed images are written, so each lost one was counted as changed
+                self.image_index.invalidate(key)
+                for tally in (counts, totals):
+                    tally["changed"] -= 1
+                    tally["upload failed"] = tally.get("upload failed", 0) + 1
+            summary = ", ".join(f"{count} {result}" for result, count in sorted(counts.items()))
+            print(f"  {girl}/{album}: {summary}; {self.transfer_rates()}")
+        return in_flight
+
+    def run(self, album_urls: list = None):
+        """Main entry point - run the spider, printing progress as events arrive.
+
+        Args:
+            album_urls: Optional list of specific album URLs to process.
+                       If not provided, collects albums from the feed.
+        """
+        print("=" * 60)
+        print("SGSpider - Starting")
+        print("=" * 60)
+
+        total_downloaded = 0
+        try:
+            for event in self.download(album_urls):
+                self.report(event)
+                total_downloaded += isinstance(event, ImageSaved)
+        except LoginFailed:
+            print("Failed to log in. Exiting.")
+            return
+
+        print("\n" + "=" * 60)
+        print(f"Finished! Downloaded {total_downloaded} images total.")
+        expired_urls = self.metrics.get("signed_urls_expired_total")
+        if expired_urls:
+            print(
+                f"Signed URLs expired: {expired_urls} "
+                f"(album refreshes: {self.metrics.get('signed_url_refreshes_total')}, "
+                f"unrecovered: {self.metrics.get('signed_url_failures_total')})"
+            )
+        deduplicated = self.metrics.get("images_deduplicated_total")
+        if deduplicated or self.metrics.get("bytes_deduplicated_total"):
+            print(
+                f"Content store: {deduplicated} images linked without download, "
+                f"{self.metrics.get('bytes_deduplicated_total') / 1024 / 1024:.1f} MB of duplicates not stored"
+            )
+        self.metrics.print_summary()
+        print("=" * 60)
+
+
+def acquire_lock():
+    """Take the single-instance lock for the rest of the process, or exit."""
     lock_file = Path(__file__).parent / ".sgspider.lock"
     lock_fp = open(lock_file, "w")
     try:
@@ -1116,10 +5656,154 @@ def main():
 
     atexit.register(release_lock)
 
+
+COMMANDS = ("run", "status", "verify", "plan")
+
+
+def main(argv: list = None):
+    argv = sys.argv[1:] if argv is None else argv
+    # Bare album URLs and run options keep working without the "run" subcommand
+    if not argv or (argv[0] not in COMMANDS and argv[0] not in ("-h", "--help")):
+        argv = ["run"] + argv
+
+    parser = argparse.ArgumentParser(description="Download SuicideGirls albums.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser(
+        "run", help="Log in and download albums (the default command)",
+        description="Log in and download albums from the feed, model listings or given URLs.",
+    )
+    run_parser.add_argument(
+        "album_urls", nargs="*",
+        help="Specific album URLs to process (default: collect albums from the feed)",
+    )
+    source_group = run_parser.add_argument_group("targeted crawl (instead of the site feed)")
+    source_group.add_argument(
+        "--model", action="append", default=[], metavar="NAME",
+        help="Crawl this model's album listing (repeatable; a profile URL also works)",
+    )
+    source_group.add_argument(
+        "--models-file", metavar="PATH",
+        help="Crawl the album listings of the models in PATH (one name or URL per line)",
+    )
+    source_group.add_argument(
+        "--following", action="store_true",
+        help="Crawl the album listings of the models the account follows",
+    )
+    run_parser.add_argument(
+        "--watch", action="store_true",
+        help="Keep running, polling the feed for new albums with a warm browser",
+    )
+    har_group = run_parser.add_mutually_exclusive_group()
+    har_group.add_argument(
+        "--record-har", metavar="PATH",
+        help="Record feed and album navigations to a scrubbed HAR file",
+    )
+    har_group.add_argument(
+        "--replay-har", metavar="PATH",
+        help="Serve navigations from a recorded HAR (offline; images are synthetic)",
+    )
+    run_parser.add_argument(
+        "--refresh", action="store_true",
+        help="Revalidate downloaded images with conditional requests and re-download changed ones",
+    )
+    run_parser.add_argument(
+        "--pack-existing", action="store_true",
+        help="Pack existing album directories into per-album archives and exit",
+    )
+    run_parser.add_argument(
+        "--profile", metavar="TRACE.json",
+        help="Record a timeline of navigations, requests, sleeps and file operations "
+             "as Chrome trace-event JSON (open in Perfetto)",
+    )
+    run_parser.add_argument(
+        "--profile-cprofile", metavar="PATH",
+        help="Also dump cProfile statistics of the Python side to PATH",
+    )
+    run_parser.add_argument(
+        "--resources", metavar="REPORT.json",
+        help="Sample memory, file descriptors and Playwright objects after every album "
+             "and report steady growth (slows the run: Python allocations are traced)",
+    )
+
+    subparsers.add_parser(
+        "status", help="Show resume state, feed checkpoint and watch history",
+    )
+
+    verify_parser = subparsers.add_parser(
+        "verify", help="Check downloaded images for truncation and corruption",
+    )
+    verify_parser.add_argument(
+        "--quick", action="store_true",
+        help="Only check file size and image magic bytes",
+    )
+    verify_parser.add_argument(
+        "--workers", type=int, metavar="N",
+        help="Checker processes (default: CPU count)",
+    )
+    verify_parser.add_argument(
+        "--delete", action="store_true",
+        help="Remove invalid images so the next run downloads them again",
+    )
+
+    plan_parser = subparsers.add_parser(
+        "plan", help="List the albums the next run would process",
+    )
+    plan_parser.add_argument(
+        "--limit", type=int, default=50,
+        help="Show at most this many albums (0 = all, default 50)",
+    )
+    args = parser.parse_args(argv)
+
     spider = SGSpider()
-    # If album URLs provided as arguments, use them; otherwise collect from feed
-    album_urls = sys.argv[1:] if len(sys.argv) > 1 else None
-    spider.run(album_urls)
+
+    if args.command == "status":
+        spider.print_status()
+        return
+    if args.command == "plan":
+        spider.print_plan(args.limit)
+        return
+    if args.command == "verify":
+        if args.delete:
+            acquire_lock()
+        sys.exit(0 if spider.verify_downloads(args.quick, args.workers, args.delete) else 1)
+
+    acquire_lock()
+
+    spider.models = [spider.model_name(name) for name in args.model]
+    if args.models_file:
+        spider.models += spider.load_models_file(args.models_file)
+    spider.following = args.following
+    spider.record_har = args.record_har
+    spider.replay_har = args.replay_har
+    if args.profile:
+        spider.profile_path = args.profile
+        spider.profiler.enable()
+    if args.resources:
+        spider.resources_path = args.resources
+        spider.resources.enable()
+
+    python_profile = None
+    if args.profile_cprofile:
+        import cProfile
+        python_profile = cProfile.Profile()
+        python_profile.enable()
+
+    try:
+        if args.pack_existing:
+            spider.pack_existing()
+        elif args.refresh:
+            spider.refresh()
+        elif args.watch:
+            spider.watch()
+        else:
+            # If album URLs provided as arguments, use them; otherwise collect from feed
+            spider.run(args.album_urls or None)
+    finally:
+        if python_profile:
+            python_profile.disable()
+            python_profile.dump_stats(args.profile_cprofile)
+            print(f"cProfile statistics written to {args.profile_cprofile}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,68 @@
+import hashlib
+
+from sgspider import AlbumArchive, fake_jpeg
+
+
+def make_album(tmp_path, names, extra=()):
+    album_dir = tmp_path / "girl" / "album"
+    album_dir.mkdir(parents=True)
+    bodies = {}
+    for name in names:
+        bodies[name] = fake_jpeg(name, 15000)
+        (album_dir / name).write_bytes(bodies[name])
+    for name in extra:
+        (album_dir / name).write_text("not an image")
+    return album_dir, bodies
+
+
+def test_pack_directory_indexes_and_removes_images(tmp_path):
+    album_dir, bodies = make_album(tmp_path, ["1.jpg", "2.jpg"], extra=["notes.txt"])
+
+    archive = AlbumArchive(album_dir)
+    assert archive.pack_directory() == 2
+
+    assert archive.tar_path == tmp_path / "girl" / "album.tar"
+    assert not (album_dir / "1.jpg").exists()
+    assert (album_dir / "notes.txt").exists()  # Non-images stay, so does the directory
+    for name, body in bodies.items():
+        assert archive.has(name)
+        assert archive.read(name) == body
+        assert archive.index[name]["size"] == len(body)
+        assert archive.index[name]["sha256"] == hashlib.sha256(body).hexdigest()
+        with archive.open_member(name) as view:
+            assert view[:2] == b"\xff\xd8"
+
+
+def test_index_is_persisted(tmp_path):
+    album_dir, bodies = make_album(tmp_path, ["1.jpg"])
+    AlbumArchive(album_dir).pack_directory()
+
+    reopened = AlbumArchive(album_dir)
+    assert reopened.read("1.jpg") == bodies["1.jpg"]
+    assert not album_dir.exists()  # Emptied directory is removed
+
+
+def test_repacked_member_supersedes_earlier_copy(tmp_path):
+    album_dir, bodies = make_album(tmp_path, ["1.jpg", "2.jpg"])
+    archive = AlbumArchive(album_dir)
+    archive.pack_directory()
+    first_sha = archive.index["2.jpg"]["sha256"]
+
+    album_dir.mkdir()
+    refetched = fake_jpeg("refetched", 16000)
+    (album_dir / "1.jpg").write_bytes(refetched)
+    assert archive.pack_directory() == 1
+
+    reopened = AlbumArchive(album_dir)
+    assert reopened.read("1.jpg") == refetched
+    assert reopened.index["1.jpg"]["sha256"] == hashlib.sha256(refetched).hexdigest()
+    assert reopened.read("2.jpg") == bodies["2.jpg"]
+    assert reopened.index["2.jpg"]["sha256"] == first_sha
+
+
+def test_pack_directory_without_images(tmp_path):
+    assert AlbumArchive(tmp_path / "girl" / "missing").pack_directory() == 0
+    album_dir, _ = make_album(tmp_path, [], extra=["notes.txt"])
+    archive = AlbumArchive(album_dir)
+    assert archive.pack_directory() == 0
+    assert not archive.tar_path.exists()
@@ -0,0 +1,51 @@
+import pytest
+
+from sgspider import (BROWSER_ARGS, PLAYWRIGHT_CHROMIUM_ARGS, PLAYWRIGHT_HEADLESS_ARGS, SpareBrowser,
+                      find_headless_shell)
+
+
+def launch_command(executable, args, headless, user_data_dir):
+    # What chromium.launch(headless=headless, args=args) runs for a new browser
+    return [executable, *PLAYWRIGHT_CHROMIUM_ARGS, *(PLAYWRIGHT_HEADLESS_ARGS if headless else []),
+            "--no-sandbox", *args, f"--user-data-dir={user_data_dir}",
+            "--remote-debugging-pipe", "--no-startup-window"]
+
+
+@pytest.mark.parametrize("headless", [True, False])
+def test_spare_browser_matches_launch_except_transport(headless):
+    command = SpareBrowser.command("/opt/chrome", BROWSER_ARGS, headless, "/tmp/profile")
+    launched = launch_command("/opt/chrome", BROWSER_ARGS, headless, "/tmp/profile")
+
+    assert command[:-2] == launched[:-2]
+    assert command[-2:] == ["--remote-debugging-port=0", "about:blank"]
+    assert ("--headless" in command) == headless
+
+
+def install(root, relative):
+    path = root / relative
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.touch()
+    return path
+
+
+def test_find_headless_shell_next_to_chromium(tmp_path):
+    chromium = install(tmp_path, "chromium-1140/chrome-linux/chrome")
+    install(tmp_path, "chromium_headless_shell-1139/chrome-linux/headless_shell")
+    newest = install(tmp_path, "chromium_headless_shell-1140/chrome-linux/headless_shell")
+    install(tmp_path, "firefox-1466/firefox/firefox")
+
+    assert find_headless_shell(str(chromium)) == str(newest)
+
+
+def test_find_headless_shell_new_binary_name(tmp_path):
+    chromium = install(tmp_path, "chromium-1181/chrome-linux/chrome")
+    shell = install(tmp_path, "chromium_headless_shell-1181/chrome-linux/chrome-headless-shell")
+
+    assert find_headless_shell(str(chromium)) == str(shell)
+
+
+def test_find_headless_shell_not_installed(tmp_path):
+    chromium = install(tmp_path, "chromium-1140/chrome-linux/chrome")
+    assert find_headless_shell(str(chromium)) is None
+    # A binary outside Playwright's browser cache has no sibling builds to look in
+    assert find_headless_shell(str(install(tmp_path, "opt/google/chrome/chrome"))) is None
@@ -0,0 +1,104 @@
+import errno
+import hashlib
+import os
+
+import pytest
+
+import sgspider
+from sgspider import ContentStore, LocalStorage, SGSpider, fake_jpeg
+
+BODY = fake_jpeg("content-store", 20000)
+DIGEST = hashlib.sha256(BODY).hexdigest()
+URL = "https://d1.cloudfront.net/photos/a.jpg?Expires=1700000000&Signature=one"
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ContentStore(tmp_path / "blobs")
+    yield store
+    store.close()
+
+
+def test_lookup_ignores_signed_query_and_needs_the_blob(store):
+    assert store.lookup(URL) is None
+    assert store.put(BODY, DIGEST, URL)
+
+    assert store.lookup("https://d1.cloudfront.net/photos/a.jpg?Expires=1800000000&Signature=two") == DIGEST
+    assert store.lookup("https://d1.cloudfront.net/photos/b.jpg") is None
+
+    store.blob_path(DIGEST).unlink()
+    assert store.lookup(URL) is None
+
+
+def test_put_stores_identical_content_once(store):
+    assert store.put(BODY, DIGEST, URL)
+    assert not store.put(BODY, DIGEST, "https://d1.cloudfront.net/photos/copy.jpg")
+
+    assert store.blob_path(DIGEST).read_bytes() == BODY
+    assert store.lookup("https://d1.cloudfront.net/photos/copy.jpg") == DIGEST
+    assert [path.name for path in store.root.rglob("*.tmp")] == []
+
+
+def test_link_hardlinks_and_replaces_existing_files(store, tmp_path):
+    store.put(BODY, DIGEST, URL)
+    dest = tmp_path / "girl" / "album" / "1.jpg"
+    dest.parent.mkdir(parents=True)
+    dest.write_bytes(b"stale")
+
+    store.link(DIGEST, dest)
+
+    assert dest.read_bytes() == BODY
+    assert os.path.samefile(dest, store.blob_path(DIGEST))
+    assert list(dest.parent.iterdir()) == [dest]
+
+
+@pytest.mark.parametrize("link_errno", [errno.EXDEV, errno.EMLINK])
+def test_link_falls_back_to_a_copy(tmp_path, monkeypatch, link_errno):
+    def refuse(*args):
+        raise OSError(link_errno, os.strerror(link_errno))
+
+    monkeypatch.setattr(sgspider.os, "link", refuse)
+    monkeypatch.setattr(sgspider.fcntl, "ioctl", refuse)
+    store = ContentStore(tmp_path / "blobs")
+    try:
+        store.put(BODY, DIGEST, URL)
+        dest = tmp_path / "album" / "1.jpg"
+        store.link(DIGEST, dest)
+    finally:
+        store.close()
+
+    assert dest.read_bytes() == BODY
+    assert not os.path.samefile(dest, store.blob_path(DIGEST))
+
+
+def test_link_raises_unexpected_errors(tmp_path, monkeypatch):
+    def refuse(*args):
+        raise OSError(errno.EIO, os.strerror(errno.EIO))
+
+    monkeypatch.setattr(sgspider.os, "link", refuse)
+    store = ContentStore(tmp_path / "blobs")
+    try:
+        store.put(BODY, DIGEST, URL)
+        with pytest.raises(OSError):
+            store.link(DIGEST, tmp_path / "album" / "1.jpg")
+    finally:
+        store.close()
+    assert not (tmp_path / "album" / ".1.jpg.tmp").exists()
+
+
+def test_local_storage_links_known_content_across_albums(store, tmp_path):
+    spider = SGSpider()
+    spider.download_dir = tmp_path / "downloads"
+    spider.content_store = store
+    storage = LocalStorage(spider)
+
+    storage.write("girl/first/1.jpg", BODY, DIGEST, URL)
+    assert storage.link_known("girl/second/1.jpg", "https://d1.cloudfront.net/photos/a.jpg?Signature=new")
+    assert not storage.link_known("girl/second/2.jpg", "https://d1.cloudfront.net/photos/unknown.jpg")
+
+    first, second = storage.path("girl/first/1.jpg"), storage.path("girl/second/1.jpg")
+    assert os.path.samefile(first, second)
+    assert spider.metrics.get("bytes_deduplicated_total") == 0
+
+    storage.write("girl/third/1.jpg", BODY, DIGEST, "https://d1.cloudfront.net/photos/again.jpg")
+    assert spider.metrics.get("bytes_deduplicated_total") == len(BODY)
@@ -0,0 +1,112 @@
+import json
+import time
+
+import pytest
+
+from sgspider import SGSpider
+
+FEED = [f"https://example.com/girls/model{n}/album/{n}/a{n}/" for n in range(12)]
+
+
+class FakeFeedPage:
+    """Feed that shows three more albums per load-more step and has no data-next target."""
+
+    def __init__(self):
+        self.shown = 3
+        self.closed = False
+
+    def is_closed(self):
+        return self.closed
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def spider(tmp_path, monkeypatch):
+    spider = SGSpider()
+    spider.feed_file = tmp_path / "feed.json"
+    spider.opened = []
+    spider.advances = 0
+
+    def open_feed_page(url):
+        spider.opened.append(url)
+        return FakeFeedPage()
+
+    def advance_feed(page):
+        spider.advances += 1
+        page.shown += 3
+        return page.shown <= len(FEED)
+
+    monkeypatch.setattr(spider, "open_feed_page", open_feed_page)
+    monkeypatch.setattr(spider, "advance_feed", advance_feed)
+    monkeypatch.setattr(spider, "extract_album_links", lambda page: FEED[:page.shown])
+    monkeypatch.setattr(spider, "feed_position", lambda page: "")
+    monkeypatch.setattr(spider, "random_delay", lambda *args: None)
+    return spider
+
+
+def test_save_appends_and_load_joins_steps(spider):
+    spider.start_feed_checkpoint()
+    spider.save_feed_checkpoint(FEED[:3], {"next": "/feed?page=2", "iterations": 0})
+    spider.save_feed_checkpoint(FEED[3:5], {"next": "/feed?page=3", "iterations": 1})
+
+    assert len(spider.feed_file.read_text().splitlines()) == 2
+    saved = spider.load_feed_checkpoint()
+    assert saved["albums"] == FEED[:5]
+    assert saved["position"] == {"next": "/feed?page=3", "iterations": 1}
+    assert not saved["complete"]
+
+
+def test_load_ignores_a_cut_short_record(spider):
+    spider.start_feed_checkpoint()
+    spider.save_feed_checkpoint(FEED[:3], {"next": "", "iterations": 0})
+    with open(spider.feed_file, "a") as f:
+        f.write('{"albums": ["https://exa')
+
+    assert spider.load_feed_checkpoint()["albums"] == FEED[:3]
+
+    spider.start_feed_checkpoint(spider.load_feed_checkpoint())
+    spider.save_feed_checkpoint(FEED[3:4], {"next": "", "iterations": 1})
+    assert spider.load_feed_checkpoint()["albums"] == FEED[:4]
+
+
+def test_load_reads_a_single_object_checkpoint(spider):
+    spider.feed_file.write_text(json.dumps({
+        "albums": FEED[:2], "position": {"next": "", "iterations": 1}, "complete": True, "timestamp": time.time(),
+    }))
+    saved = spider.load_feed_checkpoint()
+    assert saved["albums"] == FEED[:2] and saved["complete"]
+
+
+def test_stale_checkpoint_is_ignored(spider):
+    spider.feed_file.write_text(json.dumps({"albums": FEED[:2], "timestamp": time.time() - 25 * 3600}) + "\n")
+    assert spider.load_feed_checkpoint() is None
+
+
+def test_crawl_resumes_by_seeking_to_the_last_album(spider):
+    assert list(spider.iter_feed_albums(max_pages=10, checkpoint=True)) == FEED
+    uninterrupted = spider.load_feed_checkpoint()["position"]["iterations"], spider.advances
+    spider.clear_feed_checkpoint()
+
+    spider.advances = 0
+    crawl = spider.iter_feed_albums(max_pages=10, checkpoint=True)
+    first = [next(crawl) for _ in range(6)]
+    crawl.close()  # Killed after the first load-more
+    assert first == FEED[:6] and spider.advances == 1
+
+    resumed = list(spider.iter_feed_albums(max_pages=10, checkpoint=True))
+
+    assert resumed == FEED
+    saved = spider.load_feed_checkpoint()
+    assert saved["complete"] and saved["albums"] == FEED
+    # Scrolling back to the sixth album repeats the first load-more without counting it
+    assert (saved["position"]["iterations"], spider.advances) == (uninterrupted[0], uninterrupted[1] + 1)
+
+
+def test_completed_checkpoint_is_replayed_without_a_crawl(spider):
+    list(spider.iter_feed_albums(max_pages=10, checkpoint=True))
+    spider.opened.clear()
+
+    assert list(spider.iter_feed_albums(max_pages=10, checkpoint=True)) == FEED
+    assert spider.opened == []
@@ -0,0 +1,112 @@
+import base64
+import configparser
+import json
+
+import pytest
+
+from sgspider import HAR_FAR_FUTURE_EXPIRY, SGSpider
+
+SIGNED_URL = "https://d1.cloudfront.net/a.jpg?Expires=1700000000&Signature=sig123&Key-Pair-Id=KP1"
+
+
+@pytest.fixture
+def spider():
+    spider = SGSpider()
+    spider.credentials = configparser.ConfigParser()
+    spider.credentials["main"] = {"username": "alice_model", "password": "hunter22"}
+    return spider
+
+
+def header(name, value):
+    return {"name": name, "value": value}
+
+
+def write_har(path, entries):
+    path.write_text(json.dumps({"log": {"entries": entries}}))
+
+
+def test_scrub_har_removes_credentials_and_signatures(spider, tmp_path):
+    page = f'<p>Welcome alice_model</p><img src="{SIGNED_URL}">'
+    har_path = tmp_path / "session.har"
+    write_har(har_path, [
+        {
+            "request": {
+                "url": "https://www.example.com/login/",
+                "cookies": [{"name": "sessionid", "value": "s3cr3t"}],
+                "headers": [header("Cookie", "sessionid=s3cr3t"), header("Accept", "text/html")],
+                "postData": {"mimeType": "application/x-www-form-urlencoded",
+                             "text": "username=alice_model&password=hunter22"},
+            },
+            "response": {
+                "cookies": [{"name": "sessionid", "value": "s3cr3t"}],
+                "headers": [header("Set-Cookie", "sessionid=s3cr3t"), header("Content-Type", "text/html")],
+                "content": {"mimeType": "text/html", "text": page},
+            },
+        },
+        {
+            "request": {
+                "url": SIGNED_URL,
+                "cookies": [],
+                "headers": [header("Authorization", "Bearer token")],
+                "queryString": [{"name": "Expires", "value": "1700000000"},
+                                {"name": "Signature", "value": "sig123"},
+                                {"name": "Key-Pair-Id", "value": "KP1"}],
+            },
+            "response": {
+                "cookies": [],
+                "headers": [],
+                "content": {"mimeType": "application/json", "encoding": "base64",
+                            "text": base64.b64encode(json.dumps({"next": SIGNED_URL}).encode()).decode()},
+            },
+        },
+    ])
+
+    spider.scrub_har(har_path)
+
+    text = har_path.read_text()
+    for secret in ("alice_model", "hunter22", "s3cr3t", "sig123", "KP1", "Bearer", "1700000000"):
+        assert secret not in text
+
+    login, image = json.loads(text)["log"]["entries"]
+    assert login["request"]["cookies"] == [] and login["response"]["cookies"] == []
+    assert login["request"]["headers"] == [header("Accept", "text/html")]
+    assert login["response"]["headers"] == [header("Content-Type", "text/html")]
+    assert login["request"]["postData"] == {"mimeType": "application/x-www-form-urlencoded", "text": ""}
+
+    # The same replacement in the page body and the request keeps replayed pages matching
+    scrubbed_url = (f"https://d1.cloudfront.net/a.jpg?Expires={HAR_FAR_FUTURE_EXPIRY}"
+                    "&Signature=SCRUBBED&Key-Pair-Id=SCRUBBED")
+    assert image["request"]["url"] == scrubbed_url
+    assert scrubbed_url in login["response"]["content"]["text"]
+    assert image["request"]["queryString"] == [
+        {"name": "Expires", "value": HAR_FAR_FUTURE_EXPIRY},
+        {"name": "Signature", "value": "SCRUBBED"},
+        {"name": "Key-Pair-Id", "value": "SCRUBBED"},
+    ]
+    body = json.loads(base64.b64decode(image["response"]["content"]["text"]))
+    assert body == {"next": scrubbed_url}
+
+
+def test_scrub_har_leaves_short_credentials_alone(spider, tmp_path):
+    spider.credentials["main"] = {"username": "al", "password": "pw1"}
+    har_path = tmp_path / "session.har"
+    write_har(har_path, [{
+        "request": {"url": "https://www.example.com/all/", "cookies": [], "headers": []},
+        "response": {"cookies": [], "headers": [], "content": {"mimeType": "text/html", "text": "all albums"}},
+    }])
+
+    spider.scrub_har(har_path)
+
+    entry = json.loads(har_path.read_text())["log"]["entries"][0]
+    assert entry["request"]["url"] == "https://www.example.com/all/"
+    assert entry["response"]["content"]["text"] == "all albums"
+
+
+def test_scrub_har_keeps_an_unreadable_file(spider, tmp_path, capsys):
+    har_path = tmp_path / "session.har"
+    har_path.write_text("not json")
+
+    spider.scrub_har(har_path)
+
+    assert har_path.read_text() == "not json"
+    assert "Could not scrub" in capsys.readouterr().out
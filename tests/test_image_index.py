@@ -0,0 +1,125 @@
+import hashlib
+import time
+from urllib.parse import urlparse
+
+import pytest
+
+from sgsim import SiteSimulator
+from sgspider import HTTPFetcher, ImageIndex, LocalStorage, SGSpider
+
+ALBUM = "https://www.example.com/girls/ruby/album/1/first/"
+HEADERS = {"etag": '"v1"', "last-modified": "Mon, 01 Jan 2024 00:00:00 GMT", "content-length": "100"}
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = ImageIndex(tmp_path / "images.sqlite3")
+    yield index
+    index.close()
+
+
+def test_record_and_mark_checked(index):
+    index.record("ruby/first/1.jpg", ALBUM, "https://cdn/1.jpg?Signature=a", HEADERS, 90, "d1")
+    row, = index.album_images(ALBUM)
+    assert row["etag"] == '"v1"' and row["last_modified"] == HEADERS["last-modified"]
+    assert row["content_length"] == 100 and row["sha256"] == "d1"
+    assert row["fetched_at"] == row["checked_at"]
+
+    index.mark_checked("ruby/first/1.jpg", "https://cdn/1.jpg?Signature=b")
+    checked, = index.album_images(ALBUM)
+    assert checked["url"] == "https://cdn/1.jpg?Signature=b"
+    assert checked["checked_at"] >= row["checked_at"] and checked["fetched_at"] == row["fetched_at"]
+
+    # A re-download replaces the row; the body size stands in for a missing Content-Length
+    index.record("ruby/first/1.jpg", ALBUM, "https://cdn/1.jpg?Signature=c", {}, 120, "d2")
+    replaced, = index.album_images(ALBUM)
+    assert (replaced["etag"], replaced["content_length"], replaced["sha256"]) == (None, 120, "d2")
+    assert index.count() == 1
+
+
+def test_albums_due_orders_by_least_recently_checked(index):
+    other = "https://www.example.com/girls/jade/album/2/second/"
+    index.record("ruby/first/1.jpg", ALBUM, "u1", HEADERS, 100, "d1")
+    index.record("ruby/first/2.jpg", ALBUM, "u2", HEADERS, 100, "d2")
+    time.sleep(0.01)
+    index.record("jade/second/1.jpg", other, "u3", HEADERS, 100, "d3")
+    now = time.time() + 1
+
+    assert index.albums_due(now) == [ALBUM, other]
+    assert index.albums_due(0) == []
+
+    # One unchecked image keeps its album due, and it stays first
+    time.sleep(0.01)
+    before_checks = time.time()
+    index.mark_checked("ruby/first/1.jpg", "u1")
+    assert index.albums_due(now) == [ALBUM, other]
+    index.mark_checked("ruby/first/2.jpg", "u2")
+    assert index.albums_due(now) == [other, ALBUM]
+    assert index.albums_due(before_checks) == [other]
+
+
+def test_invalidate_forces_a_full_download(index):
+    index.record("ruby/first/1.jpg", ALBUM, "u1", HEADERS, 100, "d1")
+    index.invalidate("ruby/first/1.jpg")
+
+    row, = index.album_images(ALBUM)
+    assert (row["etag"], row["last_modified"], row["sha256"], row["checked_at"]) == (None, None, "", 0)
+    assert index.albums_due(1) == [ALBUM]
+
+
+@pytest.fixture
+def sim():
+    sim = SiteSimulator(albums=1, images_per_album=2).start()
+    yield sim
+    sim.stop()
+
+
+@pytest.fixture
+def spider(tmp_path, index):
+    spider = SGSpider()
+    spider.download_dir = tmp_path / "downloads"
+    spider.storage = LocalStorage(spider)
+    spider.image_index = index
+    return spider
+
+
+def download(spider, fetcher, key, url):
+    status, headers, body = fetcher.request("GET", url)
+    assert status == 200
+    digest = hashlib.sha256(body).hexdigest()
+    spider.storage.write(key, body, digest, url)
+    spider.image_index.record(key, ALBUM, url, headers, len(body), digest)
+    row, = [row for row in spider.image_index.album_images(ALBUM) if row["key"] == key]
+    return row
+
+
+def test_revalidate_image_against_the_simulator(spider, sim):
+    fetcher = HTTPFetcher("test", [], 10, bandwidth=spider.bandwidth, hosts=spider.hosts)
+    key = "model1/set-1/image001.jpg"
+    row = download(spider, fetcher, key, sim.image_url(1, 1))
+    assert row["etag"] and row["last_modified"]
+
+    # Unchanged: a bodiless 304 that only moves the check time and URL forward
+    fresh_url = sim.image_url(1, 1)
+    assert spider.revalidate_image(fetcher, row, fresh_url) == "unchanged"
+    assert sim.stats["not_modified"] == 1 and sim.stats["image"] == 1
+    checked, = spider.image_index.album_images(ALBUM)
+    assert checked["url"] == fresh_url and checked["checked_at"] >= row["checked_at"]
+
+    # Changed: a new ETag, so the body is downloaded and stored again
+    sim.replace_image(urlparse(fresh_url).path)
+    assert spider.revalidate_image(fetcher, checked, sim.image_url(1, 1)) == "changed"
+    assert sim.stats["image"] == 2
+    changed, = spider.image_index.album_images(ALBUM)
+    assert changed["etag"] != row["etag"] and changed["sha256"] != row["sha256"]
+    stored = spider.storage.path(key).read_bytes()
+    assert hashlib.sha256(stored).hexdigest() == changed["sha256"]
+    assert spider.metrics.get("bytes_downloaded_total") == len(stored)
+
+    # An invalidated row has no validators or digest left, so the next check stores it again
+    spider.image_index.invalidate(key)
+    invalidated, = spider.image_index.album_images(ALBUM)
+    assert spider.revalidate_image(fetcher, invalidated, sim.image_url(1, 1)) == "changed"
+    assert sim.stats["image"] == 3 and sim.stats["not_modified"] == 1
+
+    assert spider.revalidate_image(fetcher, changed, None) == "missing"
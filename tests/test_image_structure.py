@@ -0,0 +1,52 @@
+import struct
+import zlib
+
+import pytest
+
+from sgspider import check_image_structure, fake_jpeg
+
+
+def png_chunk(kind: bytes, data: bytes) -> bytes:
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+
+def make_png() -> bytes:
+    header = struct.pack(">IIBBBBB", 1, 1, 8, 0, 0, 0, 0)
+    return (b"\x89PNG\r\n\x1a\n" + png_chunk(b"IHDR", header)
+            + png_chunk(b"IDAT", zlib.compress(b"\x00\x00")) + png_chunk(b"IEND", b""))
+
+
+def make_jpeg_with_scan() -> bytes:
+    sos = b"\xff\xda\x00\x08\x01\x01\x00\x00\x3f\x00"
+    return fake_jpeg("scan", 200)[:-2] + sos + b"\x12\x34\xff\x00\x56" + b"\xff\xd9"
+
+
+@pytest.mark.parametrize("data", [
+    fake_jpeg("intact", 20000),
+    fake_jpeg("intact", 200000),  # Several 64 KB comment segments
+    make_jpeg_with_scan(),
+    make_jpeg_with_scan() + b"\r\n",  # Trailing padding after EOI
+    make_png(),
+    b"RIFF" + struct.pack("<I", 12) + b"WEBPVP8 " + b"\x00" * 8,
+    b"GIF89a" + b"\x00" * 20 + b"\x3b",
+    b"BM" + struct.pack("<I", 30) + b"\x00" * 24,
+])
+def test_intact_images_pass(data):
+    assert check_image_structure(data) == ""
+
+
+@pytest.mark.parametrize("data, reason", [
+    (fake_jpeg("cut", 20000)[:-2], "JPEG"),
+    (fake_jpeg("cut", 20000)[:5000], "truncated"),
+    (b"\xff\xd8\x00\x00", "bad marker"),
+    (make_jpeg_with_scan()[:-2], "EOI"),
+    (make_png()[:-12], "IEND"),
+    (make_png()[:-6], "truncated"),
+    (make_png().replace(b"IDAT", b"IDAX"), "CRC mismatch"),
+    (b"RIFF" + struct.pack("<I", 100) + b"WEBPVP8 " + b"\x00" * 8, "WebP truncated"),
+    (b"GIF89a" + b"\x00" * 20, "GIF missing trailer"),
+    (b"BM" + struct.pack("<I", 1000) + b"\x00" * 24, "BMP truncated"),
+    (b"<html>Access denied</html>", "unrecognized"),
+])
+def test_broken_images_are_reported(data, reason):
+    assert reason in check_image_structure(data)
@@ -0,0 +1,84 @@
+from datetime import datetime
+
+import pytest
+
+from sgspider import BandwidthLimiter, HostLimiter, format_rate, parse_rate
+
+
+@pytest.mark.parametrize("text, rate", [
+    ("0", 0),
+    ("100", 100),
+    ("512K", 512 * 1024),
+    ("2.5M", int(2.5 * 1024 ** 2)),
+    ("1G", 1024 ** 3),
+    ("4MB/s", 4 * 1024 ** 2),
+    (" 1m/s ", 1024 ** 2),
+    ("256kb", 256 * 1024),
+])
+def test_parse_rate(text, rate):
+    assert parse_rate(text) == rate
+
+
+@pytest.mark.parametrize("text", ["fast", "M", "1.2.3K"])
+def test_parse_rate_rejects_garbage(text):
+    with pytest.raises(ValueError):
+        parse_rate(text)
+
+
+def test_format_rate():
+    assert format_rate(512 * 1024) == "512 KB/s"
+    assert format_rate(3.5 * 1024 ** 2) == "3.5 MB/s"
+
+
+def test_parse_schedule():
+    schedule = BandwidthLimiter.parse_schedule("08:00-18:00 1M, 23:00-6:30 4M")
+    assert schedule == [(8 * 60, 18 * 60, 1024 ** 2), (23 * 60, 6 * 60 + 30, 4 * 1024 ** 2)]
+    assert BandwidthLimiter.parse_schedule("") == []
+
+
+@pytest.mark.parametrize("text", ["08:00 1M", "8-18 1M", "08:00-18:00", "08:00-18:00 lots"])
+def test_parse_schedule_rejects_bad_entries(text):
+    with pytest.raises(ValueError):
+        BandwidthLimiter.parse_schedule(text)
+
+
+@pytest.mark.parametrize("hour, minute, rate", [
+    (9, 0, 1024 ** 2),
+    (17, 59, 1024 ** 2),
+    (18, 0, 100),  # Windows end exclusively
+    (23, 30, 4 * 1024 ** 2),
+    (3, 0, 4 * 1024 ** 2),  # Window wrapping past midnight
+    (6, 30, 100),
+])
+def test_bandwidth_limit_follows_schedule(hour, minute, rate):
+    limiter = BandwidthLimiter(100, BandwidthLimiter.parse_schedule("08:00-18:00 1M, 23:00-06:30 4M"))
+    assert limiter.limit(datetime(2024, 1, 1, hour, minute)) == rate
+
+
+def test_parse_overrides():
+    assert HostLimiter.parse_overrides("WWW.Example.com=1, *.cloudfront.net = 8") == {
+        "www.example.com": 1, "*.cloudfront.net": 8,
+    }
+    assert HostLimiter.parse_overrides("") == {}
+
+
+@pytest.mark.parametrize("text", ["www.example.com", "www.example.com=x", "*.cdn.net=-1"])
+def test_parse_overrides_rejects_bad_entries(text):
+    with pytest.raises(ValueError):
+        HostLimiter.parse_overrides(text)
+
+
+def test_host_limit_precedence():
+    hosts = HostLimiter(1, 4, HostLimiter.parse_overrides("img.example.com=2, *.cloudfront.net=8"))
+    assert hosts.limit("img.example.com", "image") == 2
+    assert hosts.limit("d1.cloudfront.net", "image") == 8
+    assert hosts.limit("cloudfront.net", "page") == 8
+    assert hosts.limit("notcloudfront.net", "image") == 4
+    assert hosts.limit("www.example.com", "page") == 1
+
+
+def test_host_slot_without_limit_never_blocks():
+    hosts = HostLimiter(0, 0)
+    with hosts.slot("https://a.example.com/x", "page"), hosts.slot("https://a.example.com/y", "page"):
+        pass
+    assert hosts.semaphores == {}
@@ -0,0 +1,51 @@
+import pytest
+
+from sgspider import SGSpider
+
+
+@pytest.fixture
+def spider(monkeypatch):
+    spider = SGSpider()
+    spider.base_url = "https://www.example.com"
+    spider.hrefs = []
+    monkeypatch.setattr(spider, "evaluate", lambda script, page=None: spider.hrefs)
+    return spider
+
+
+def test_extract_model_names_keeps_profile_links_in_page_order(spider):
+    spider.hrefs = [
+        "https://www.example.com/girls/ruby/",
+        "https://www.example.com/girls/ruby/album/123/first/",  # Album, not a profile
+        "https://www.example.com/girls/jade/photos/",
+        "https://example.com/girls/amber/",
+        "https://www.example.com/girls/ruby/photos/",
+        "https://www.example.com/girls/jade/followers/",
+        "https://www.example.com/members/ruby/",
+        "https://other.net/girls/onyx/",
+        "",
+        None,
+    ]
+    assert spider.extract_model_names() == ["ruby", "jade", "amber"]
+
+
+def test_extract_model_names_without_profiles(spider):
+    spider.hrefs = ["https://www.example.com/photos/sg/recent/all/"]
+    assert spider.extract_model_names() == []
+
+
+def test_load_models_file(spider, tmp_path):
+    path = tmp_path / "models.txt"
+    path.write_text(
+        "# Models to mirror\n"
+        "ruby\n"
+        "\n"
+        "  https://www.example.com/girls/jade/photos/  # profile URL\n"
+        "/amber/\n"
+        "https://www.example.com/girls/onyx/album/42/title/\n"
+    )
+    assert spider.load_models_file(str(path)) == ["ruby", "jade", "amber", "onyx"]
+
+
+def test_load_models_file_missing(spider, tmp_path):
+    with pytest.raises(OSError):
+        spider.load_models_file(str(tmp_path / "missing.txt"))
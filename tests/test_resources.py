@@ -0,0 +1,103 @@
+import json
+import tracemalloc
+
+import pytest
+
+from sgspider import DEFAULT_RESOURCE_MIN_SAMPLES, LEAK_MIN_BYTES, ResourceMonitor
+
+MB = 1024 * 1024
+
+
+def monitor_with(rows):
+    """A monitor holding synthetic samples: (generation, python_rss, browser_rss, playwright_objects)."""
+    monitor = ResourceMonitor()
+    monitor.enabled = True
+    monitor.samples = [
+        {"ts": 0, "album": f"album{n}", "generation": generation, "python_rss": python_rss,
+         "python_traced": 10 * MB, "browser_rss": browser_rss, "open_fds": 20,
+         "playwright_objects": objects, "allocators": {}}
+        for n, (generation, python_rss, browser_rss, objects) in enumerate(rows)
+    ]
+    return monitor
+
+
+def leak_names(monitor):
+    return {(leak["stage"], leak["name"]) for leak in monitor.leaks()}
+
+
+@pytest.mark.parametrize("values, unit, expected", [
+    ([100 * MB + n * MB for n in range(6)], "bytes", True),
+    ([100 * MB] * 6, "bytes", False),
+    ([100 * MB + n * 100_000 for n in range(6)], "bytes", False),  # Below LEAK_MIN_BYTES in total
+    ([100 * MB, 103 * MB, 102 * MB, 105 * MB, 104 * MB, 107 * MB], "bytes", True),  # Dips within 2%
+    ([100 * MB, 103 * MB, 90 * MB, 105 * MB, 107 * MB, 109 * MB], "bytes", False),  # Freed memory
+    ([1, 2, 3, 4, 5, 6], "objects", True),
+    ([1, 2, 3, 2, 4, 5], "objects", False),  # Objects must never drop
+    ([100 * MB + n * MB for n in range(DEFAULT_RESOURCE_MIN_SAMPLES - 1)], "bytes", False),  # Too few albums
+])
+def test_grows(values, unit, expected):
+    assert ResourceMonitor.grows(values, unit) == expected
+
+
+def test_steady_python_growth_is_reported():
+    monitor = monitor_with([(0, 100 * MB + n * 2 * MB, 300 * MB, {}) for n in range(8)])
+
+    leak, = monitor.leaks()
+    assert (leak["stage"], leak["name"], leak["segments"], leak["albums"]) == ("python", "RSS", "1/1", 8)
+    assert leak["per_album"] == pytest.approx(2 * MB)
+
+
+def test_browser_growth_is_judged_per_generation():
+    # Browser RSS climbs within each generation and falls back on every restart
+    sawtooth = [(n // 6, 100 * MB, 300 * MB + (n % 6) * 4 * MB, {"Response": (n % 6) * 10}) for n in range(18)]
+    monitor = monitor_with(sawtooth)
+
+    leaks = {(leak["stage"], leak["name"]): leak for leak in monitor.leaks()}
+    assert set(leaks) == {("browser", "RSS"), ("playwright", "Response objects")}
+    assert leaks[("browser", "RSS")]["segments"] == "3/3"
+    assert leaks[("browser", "RSS")]["per_album"] == pytest.approx(4 * MB)
+
+    # The same values all counted as one generation fall back, so nothing grows
+    assert leak_names(monitor_with([(0, *row[1:]) for row in sawtooth])) == set()
+
+
+def test_growth_must_hold_in_most_generations():
+    growing = [(0, 100 * MB, 300 * MB + n * 4 * MB, {}) for n in range(6)]
+    flat = [(generation, 100 * MB, 300 * MB, {}) for generation in (1, 2) for _ in range(6)]
+    short = [(3, 100 * MB, 300 * MB + n * 4 * MB, {}) for n in range(2)]  # Too short to judge
+
+    assert leak_names(monitor_with(growing + flat + short)) == set()
+    assert leak_names(monitor_with(growing + flat[:6] + short)) == set()  # Half is not a majority
+
+    regrowing = [(3, *row[1:]) for row in growing]
+    leak, = monitor_with(growing + flat[:6] + regrowing).leaks()
+    assert (leak["stage"], leak["name"], leak["segments"]) == ("browser", "RSS", "2/3")
+
+
+def test_disabled_monitor_does_not_sample(tmp_path):
+    monitor = ResourceMonitor()
+    assert monitor.sample("album", 0) == {}
+    monitor.export(str(tmp_path / "resources.json"))
+    assert not (tmp_path / "resources.json").exists()
+
+
+def test_sample_and_export(tmp_path, capsys):
+    monitor = ResourceMonitor()
+    monitor.enable()
+    hoard = []
+    try:
+        for n in range(DEFAULT_RESOURCE_MIN_SAMPLES + 1):
+            hoard.append(bytearray(LEAK_MIN_BYTES // 2))
+            sample = monitor.sample(f"album{n}", 0)
+    finally:
+        tracemalloc.stop()
+    assert sample["album"] == f"album{DEFAULT_RESOURCE_MIN_SAMPLES}" and sample["generation"] == 0
+    assert sample["python_rss"] > 0 and sample["open_fds"] > 0
+
+    path = tmp_path / "resources.json"
+    monitor.export(str(path), restart_interval=50)
+
+    report = json.loads(path.read_text())
+    assert len(report["samples"]) == DEFAULT_RESOURCE_MIN_SAMPLES + 1
+    assert ("python", "traced heap") in {(leak["stage"], leak["name"]) for leak in report["leaks"]}
+    assert "Steady growth" in capsys.readouterr().out
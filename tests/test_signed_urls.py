@@ -0,0 +1,63 @@
+import base64
+import json
+import time
+
+import pytest
+
+from sgspider import SGSpider
+
+
+def cloudfront_policy(*epochs):
+    policy = {"Statement": [
+        {"Resource": "https://cdn.example.com/*", "Condition": {"DateLessThan": {"AWS:EpochTime": epoch}}}
+        for epoch in epochs
+    ]}
+    encoded = base64.b64encode(json.dumps(policy).encode()).decode()
+    return encoded.translate(str.maketrans("+=/", "-_~"))
+
+
+@pytest.fixture
+def spider():
+    spider = SGSpider()
+    spider.signed_url_margin = 60
+    return spider
+
+
+@pytest.mark.parametrize("url, expiry", [
+    ("https://d1.cloudfront.net/a.jpg?Expires=1700000000&Signature=abc&Key-Pair-Id=K1", 1700000000),
+    ("https://bucket.s3.amazonaws.com/a.jpg?Expires=1700000123&AWSAccessKeyId=AK&Signature=abc", 1700000123),
+    ("https://bucket.s3.amazonaws.com/a.jpg?X-Amz-Date=20240101T000000Z&X-Amz-Expires=3600&X-Amz-Signature=abc",
+     1704067200 + 3600),
+    (f"https://d1.cloudfront.net/a.jpg?Policy={cloudfront_policy(1700000500, 1700000400)}&Signature=abc",
+     1700000400),
+])
+def test_parse_url_expiry(spider, url, expiry):
+    assert spider.parse_url_expiry(url) == expiry
+
+
+@pytest.mark.parametrize("url", [
+    "https://d1.cloudfront.net/a.jpg",
+    "https://d1.cloudfront.net/a.jpg?Policy=not-base64!&Signature=abc",
+    "https://d1.cloudfront.net/a.jpg?Expires=soon",
+    "https://bucket.s3.amazonaws.com/a.jpg?X-Amz-Date=yesterday&X-Amz-Expires=3600",
+])
+def test_parse_url_expiry_without_usable_expiry(spider, url):
+    assert spider.parse_url_expiry(url) is None
+
+
+def test_is_url_expired_applies_margin(spider):
+    now = int(time.time())
+    assert spider.is_url_expired(f"https://cdn/a.jpg?Expires={now - 10}")
+    assert spider.is_url_expired(f"https://cdn/a.jpg?Expires={now + 30}")  # Inside the 60 s margin
+    assert not spider.is_url_expired(f"https://cdn/a.jpg?Expires={now + 120}")
+    assert not spider.is_url_expired("https://cdn/a.jpg")
+
+
+def test_sort_by_expiry_puts_unsigned_urls_last(spider):
+    urls = [
+        "https://cdn/plain1.jpg",
+        "https://cdn/late.jpg?Expires=1700000300",
+        "https://cdn/plain2.jpg",
+        "https://cdn/early.jpg?Expires=1700000100",
+    ]
+    assert spider.sort_by_expiry(urls) == [urls[3], urls[1], urls[0], urls[2]]